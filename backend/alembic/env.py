@@ -14,11 +14,13 @@ from app.models.auth_model import RefreshToken
 from app.models.products_model import Product, ProductImage, Flower
 from app.models.carts_model import Cart, CartItem
 from app.models.orders_model import Order, OrderItem, Delivery
-from app.models.categories_model import Category
+from app.models.categories_model import Category, CategoryClosure
 from app.models.favourites_model import Favourite
-from app.models.pickups_model import PickupPoint
+from app.models.pickups_model import PickupPoint, PickupPointStock
 from app.models.discounts_model import Discount
 from app.models.banners_model import Banner
+from app.models.analytics_model import SalesDailyCategory, SalesDailyPickupPoint, SalesDailyProduct
+from app.models.product_cards_model import ProductCard
 
 config = context.config
 
@@ -0,0 +1,59 @@
+"""add sales daily rollups
+
+Revision ID: 6a1c9e2d4b70
+Revises: 281c3ac3d0d5
+Create Date: 2026-10-19 10:12:31.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a1c9e2d4b70'
+down_revision: Union[str, Sequence[str], None] = '281c3ac3d0d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sales_daily_product',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('units', sa.Integer(), nullable=False),
+    sa.Column('orders_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'product_id')
+    )
+    op.create_index(op.f('ix_sales_daily_product_product_id'), 'sales_daily_product', ['product_id'], unique=False)
+    op.create_table('sales_daily_category',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('units', sa.Integer(), nullable=False),
+    sa.Column('orders_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'category_id')
+    )
+    op.create_index(op.f('ix_sales_daily_category_category_id'), 'sales_daily_category', ['category_id'], unique=False)
+    op.create_table('sales_daily_pickup_point',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('pickup_point_id', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('units', sa.Integer(), nullable=False),
+    sa.Column('orders_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'pickup_point_id')
+    )
+    op.create_index(op.f('ix_sales_daily_pickup_point_pickup_point_id'), 'sales_daily_pickup_point', ['pickup_point_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_sales_daily_pickup_point_pickup_point_id'), table_name='sales_daily_pickup_point')
+    op.drop_table('sales_daily_pickup_point')
+    op.drop_index(op.f('ix_sales_daily_category_category_id'), table_name='sales_daily_category')
+    op.drop_table('sales_daily_category')
+    op.drop_index(op.f('ix_sales_daily_product_product_id'), table_name='sales_daily_product')
+    op.drop_table('sales_daily_product')
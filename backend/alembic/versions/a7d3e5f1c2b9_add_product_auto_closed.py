@@ -0,0 +1,28 @@
+"""add product auto closed
+
+Revision ID: a7d3e5f1c2b9
+Revises: f2c9a4e7b1d3
+Create Date: 2026-10-19 23:02:11.408315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e5f1c2b9'
+down_revision: Union[str, Sequence[str], None] = 'f2c9a4e7b1d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('product', sa.Column('auto_closed', sa.Boolean(), server_default='false', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('product', 'auto_closed')
@@ -0,0 +1,28 @@
+"""add product_category category index
+
+Revision ID: b7e2c5a91f04
+Revises: 8d4f1b7c2e93
+Create Date: 2026-10-19 16:02:48.530917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c5a91f04'
+down_revision: Union[str, Sequence[str], None] = '8d4f1b7c2e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_product_category_category_id_product_id', 'product_category', ['category_id', 'product_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_category_category_id_product_id', table_name='product_category')
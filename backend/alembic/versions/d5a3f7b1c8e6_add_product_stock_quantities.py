@@ -0,0 +1,45 @@
+"""add product stock quantities
+
+Revision ID: d5a3f7b1c8e6
+Revises: c41d8e6f0a25
+Create Date: 2026-10-19 18:44:36.275190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a3f7b1c8e6'
+down_revision: Union[str, Sequence[str], None] = 'c41d8e6f0a25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('product', sa.Column('stock_quantity', sa.Integer(), nullable=True))
+    op.create_check_constraint(
+        'ck_product_stock_quantity_non_negative', 'product', 'stock_quantity IS NULL OR stock_quantity >= 0'
+    )
+    op.create_table('pickup_point_stock',
+    sa.Column('pickup_point_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.CheckConstraint('quantity >= 0', name='ck_pickup_point_stock_quantity_non_negative'),
+    sa.ForeignKeyConstraint(['pickup_point_id'], ['pickup_point.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['product_id'], ['product.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('pickup_point_id', 'product_id')
+    )
+    op.create_index(op.f('ix_pickup_point_stock_product_id'), 'pickup_point_stock', ['product_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_pickup_point_stock_product_id'), table_name='pickup_point_stock')
+    op.drop_table('pickup_point_stock')
+    op.drop_constraint('ck_product_stock_quantity_non_negative', 'product', type_='check')
+    op.drop_column('product', 'stock_quantity')
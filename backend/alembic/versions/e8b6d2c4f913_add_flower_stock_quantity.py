@@ -0,0 +1,36 @@
+"""add flower stock quantity
+
+Revision ID: e8b6d2c4f913
+Revises: d5a3f7b1c8e6
+Create Date: 2026-10-19 20:05:52.813406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b6d2c4f913'
+down_revision: Union[str, Sequence[str], None] = 'd5a3f7b1c8e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('flower', sa.Column('stock_quantity', sa.Integer(), nullable=True))
+    op.create_check_constraint(
+        'ck_flower_stock_quantity_non_negative', 'flower', 'stock_quantity IS NULL OR stock_quantity >= 0'
+    )
+    op.create_index(
+        'ix_bouquet_composition_flower_id_product_id', 'bouquet_composition', ['flower_id', 'product_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bouquet_composition_flower_id_product_id', table_name='bouquet_composition')
+    op.drop_constraint('ck_flower_stock_quantity_non_negative', 'flower', type_='check')
+    op.drop_column('flower', 'stock_quantity')
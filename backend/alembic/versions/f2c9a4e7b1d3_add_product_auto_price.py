@@ -0,0 +1,28 @@
+"""add product auto price
+
+Revision ID: f2c9a4e7b1d3
+Revises: e8b6d2c4f913
+Create Date: 2026-10-19 21:14:37.260915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c9a4e7b1d3'
+down_revision: Union[str, Sequence[str], None] = 'e8b6d2c4f913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('product', sa.Column('auto_price', sa.Boolean(), server_default='false', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('product', 'auto_price')
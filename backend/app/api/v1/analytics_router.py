@@ -0,0 +1,86 @@
+from collections.abc import Sequence
+from datetime import date
+
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.deps import require_admin
+from app.db.session import get_db
+from app.models.users_model import User
+from app.schemas.analytics_schema import (
+    CategorySalesResponse,
+    PickupPointSalesResponse,
+    ProductSalesResponse,
+)
+from app.service import analytics_service
+
+analytics_router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+@analytics_router.get(
+    "/sales/products",
+    response_model=Sequence[ProductSalesResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Дневные продажи по товарам",
+)
+async def get_product_sales(
+    date_from: date,
+    date_to: date,
+    product_id: int | None = None,
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_admin),
+) -> Sequence[ProductSalesResponse]:
+    """
+    Получить выручку, количество единиц и заказов по товарам за каждый день периода.
+
+    Требует прав администратора.
+    """
+    return await analytics_service.get_product_sales(
+        session=session, date_from=date_from, date_to=date_to, product_id=product_id
+    )
+
+
+@analytics_router.get(
+    "/sales/categories",
+    response_model=Sequence[CategorySalesResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Дневные продажи по категориям",
+)
+async def get_category_sales(
+    date_from: date,
+    date_to: date,
+    category_id: int | None = None,
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_admin),
+) -> Sequence[CategorySalesResponse]:
+    """
+    Получить выручку, количество единиц и заказов по категориям за каждый день периода.
+
+    Требует прав администратора.
+    """
+    return await analytics_service.get_category_sales(
+        session=session, date_from=date_from, date_to=date_to, category_id=category_id
+    )
+
+
+@analytics_router.get(
+    "/sales/pickup-points",
+    response_model=Sequence[PickupPointSalesResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Дневные продажи по точкам самовывоза",
+)
+async def get_pickup_point_sales(
+    date_from: date,
+    date_to: date,
+    pickup_point_id: int | None = None,
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_admin),
+) -> Sequence[PickupPointSalesResponse]:
+    """
+    Получить выручку, количество единиц и заказов по точкам самовывоза за каждый день периода.
+
+    Требует прав администратора.
+    """
+    return await analytics_service.get_pickup_point_sales(
+        session=session, date_from=date_from, date_to=date_to, pickup_point_id=pickup_point_id
+    )
@@ -1,4 +1,5 @@
 import asyncio
+import json
 
 from fastapi import (
     APIRouter,
@@ -16,6 +17,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
 from app.core.deps import get_current_user, verify_bot_api_key
 from app.core.limiter import limiter
+from app.core.pubsub import pubsub_dispatcher
 from app.core.redis import get_redis
 from app.core.security import oauth2_scheme
 from app.db.session import get_db
@@ -72,13 +74,13 @@ async def login(
     return AccessToken(access_token=tokens.access_token)
 
 
-@limiter.limit("10/minute")
 @auth_router.post(
     "/logout",
     response_model=dict[str, str],
     status_code=status.HTTP_200_OK,
     summary="Выйти из системы",
 )
+@limiter.limit("10/minute")
 async def logout(
     request: Request,
     response: Response,
@@ -147,13 +149,13 @@ async def complete_register(
     return {"message": "Успешная регистрация"}
 
 
-@limiter.limit("5/minute")
 @auth_router.post(
     "/change-password",
     response_model=AccessToken,
     status_code=status.HTTP_200_OK,
     summary="Смена пароля",
 )
+@limiter.limit("5/minute")
 async def change_password(
     request: Request,
     response: Response,
@@ -234,42 +236,33 @@ async def reset_websocket(
         await websocket.close(code=1008, reason="Origin not allowed")
         return
 
-    redis_data = await redis.get(f"r:{reset_token}")
-    if redis_data is None:
+    with pubsub_dispatcher.listen(f"reset:{reset_token}") as verified:
+        # Состояние читается после регистрации ожидания, чтобы не пропустить публикацию между ними
+        redis_data = await redis.get(f"r:{reset_token}")
+        ttl = await redis.ttl(f"r:{reset_token}")
         await websocket.accept()
-        await websocket.close(code=1008, reason="Invalid token")
-        return
-
-    ttl = await redis.ttl(f"r:{reset_token}")
-    await websocket.accept()
+        if redis_data is None or ttl <= 0:
+            await websocket.close(code=1008, reason="Invalid token")
+            return
 
-    pubsub = redis.pubsub()
-    await pubsub.subscribe(f"reset:{reset_token}")
-    try:
-        deadline = asyncio.get_running_loop().time() + ttl
-        while asyncio.get_running_loop().time() < deadline:
-            message = await pubsub.get_message(
-                ignore_subscribe_messages=True, timeout=1.0
-            )
-            if message and message["type"] == "message":
-                await websocket.send_json({"verified": True})
-                await websocket.close()
-                return
-        await websocket.close(code=1000, reason="Timeout")
-    except WebSocketDisconnect:
-        pass
-    finally:
-        await pubsub.unsubscribe(f"reset:{reset_token}")
-        await pubsub.aclose()
+        try:
+            if not json.loads(redis_data).get("verified"):
+                await asyncio.wait_for(verified, timeout=ttl)
+            await websocket.send_json({"verified": True})
+            await websocket.close()
+        except TimeoutError:
+            await websocket.close(code=1000, reason="Timeout")
+        except WebSocketDisconnect:
+            pass
 
 
-@limiter.limit("3/minute")
 @auth_router.post(
     "/set-new-password",
     response_model=AccessToken,
     status_code=status.HTTP_200_OK,
     summary="Установка нового пароля",
 )
+@limiter.limit("3/minute")
 async def set_new_password(
     request: Request,
     data: AuthSetNewPassword,
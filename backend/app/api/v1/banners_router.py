@@ -4,8 +4,10 @@ from fastapi import APIRouter, Depends, Form, Request, UploadFile, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import require_admin
+from app.core.http_cache import catalog_cache
 from app.core.limiter import limiter
-from app.db.session import get_db
+from app.core.responses import ModelResponse
+from app.db.session import get_db, get_read_db
 from app.models.users_model import User
 from app.schemas.banners_schema import BannerCreate, BannerResponse, BannerUpdate
 from app.service import banners_service
@@ -51,17 +53,19 @@ async def create_banner(
     response_model=Sequence[BannerResponse],
     status_code=status.HTTP_200_OK,
     summary="Получить список активных баннеров",
+    dependencies=[Depends(catalog_cache("banners"))],
 )
 @limiter.limit("60/minute")
 async def get_banners(
     request: Request,
     only_active: bool = True,
-    session: AsyncSession = Depends(get_db),
-) -> Sequence[BannerResponse]:
+    session: AsyncSession = Depends(get_read_db),
+) -> ModelResponse:
     """
     Получить список активных баннеров.
     """
-    return await banners_service.get_banners(session=session, only_active=only_active)
+    banners = await banners_service.get_banners(session=session, only_active=only_active)
+    return ModelResponse(banners)
 
 
 @banner_router.get(
@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Body, Depends, status
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import require_admin, require_client
+from app.core.redis import get_redis
 from app.db.session import get_db
 from app.models.users_model import User
-from app.schemas.carts_schema import CartItemResponse, CartResponse
+from app.schemas.carts_schema import CartBatchRequest, CartDetailResponse, CartItemResponse, CartResponse
 from app.service import carts_service
 
 cart_router = APIRouter(prefix="/carts", tags=["carts"])
@@ -28,6 +30,24 @@ async def get_current_user_cart(
     return cart
 
 
+@cart_router.get(
+    "/details",
+    response_model=CartDetailResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Получить корзину текущего пользователя с актуальными ценами",
+)
+async def get_current_user_cart_details(
+    user: User = Depends(require_client), session: AsyncSession = Depends(get_db)
+) -> CartDetailResponse:
+    """
+    Получить корзину текущего пользователя с данными товаров, ценами со скидкой и итоговой суммой.
+
+    Требует авторизации.
+    """
+    cart = await carts_service.get_current_user_cart_details(session=session, user_id=user.id)
+    return cart
+
+
 @cart_router.delete(
     "/{cart_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Удалить корзину"
 )
@@ -56,6 +76,7 @@ async def create_cart_item(
     current_user: User = Depends(require_client),
     target_user_id: int | None = Body(default=None),
     session: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
 ) -> CartItemResponse:
     """
     Добавить товар в корзину.
@@ -64,6 +85,7 @@ async def create_cart_item(
     """
     cart_item = await carts_service.create_cart_item(
         session=session,
+        redis=redis,
         current_user=current_user,
         target_user_id=target_user_id,
         product_id=product_id,
@@ -72,6 +94,33 @@ async def create_cart_item(
     return cart_item
 
 
+@cart_router.post(
+    "/batch",
+    response_model=CartResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Пакетно изменить товары в корзине",
+)
+async def batch_update_cart(
+    data: CartBatchRequest,
+    current_user: User = Depends(require_client),
+    session: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+) -> CartResponse:
+    """
+    Добавить, изменить количество или удалить несколько товаров корзины одним запросом.
+
+    Требует авторизации.
+    """
+    cart = await carts_service.batch_update_cart(
+        session=session,
+        redis=redis,
+        current_user=current_user,
+        target_user_id=data.target_user_id,
+        items=data.items,
+    )
+    return cart
+
+
 @cart_router.patch(
     "/cart_item/{cart_item_id}",
     response_model=CartItemResponse,
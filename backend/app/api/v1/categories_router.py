@@ -1,12 +1,18 @@
 from collections.abc import Sequence
 
 from fastapi import APIRouter, Depends, Request, UploadFile, status
+from fastapi_filter import FilterDepends
 from fastapi_pagination import Page
+from fastapi_pagination.cursor import CursorPage
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import require_admin
+from app.core.http_cache import catalog_cache
 from app.core.limiter import limiter
-from app.db.session import get_db
+from app.core.redis import get_redis
+from app.core.responses import ModelResponse
+from app.db.session import get_db, get_read_db
 from app.models.users_model import User
 from app.schemas.categories_schema import (
     CategoryCreate,
@@ -14,7 +20,9 @@ from app.schemas.categories_schema import (
     CategoryUpdate,
     CategoryWithChildren,
 )
+from app.schemas.products_schema import ProductResponse
 from app.service import categories_service
+from app.utils.filters.products import ProductFilter
 
 category_router = APIRouter(prefix="/category", tags=["category"])
 
@@ -46,17 +54,18 @@ async def create_category(
     response_model=Sequence[CategoryResponse],
     status_code=status.HTTP_200_OK,
     summary="Получить список всех активных категорий",
+    dependencies=[Depends(catalog_cache("categories"))],
 )
 @limiter.limit("60/minute")
 async def get_all_active_categories(
     request: Request,
-    session: AsyncSession = Depends(get_db),
-) -> Sequence[CategoryResponse]:
+    session: AsyncSession = Depends(get_read_db),
+) -> ModelResponse:
     """
     Получить список всех активных.
     """
     categories = await categories_service.get_all_active_categories(session=session)
-    return categories
+    return ModelResponse(categories)
 
 
 @category_router.get(
@@ -83,19 +92,19 @@ async def get_all_categories_admin(
     response_model=list[CategoryWithChildren],
     status_code=status.HTTP_200_OK,
     summary="Получить дерево категорий",
+    dependencies=[Depends(catalog_cache("categories"))],
 )
 @limiter.limit("60/minute")
 async def get_category_tree(
     request: Request,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     only_active: bool = True,
-) -> list[CategoryWithChildren]:
+) -> ModelResponse:
     """
     Получить дерево категорий.
     """
-    return await categories_service.get_category_tree(
-        session=session, only_active=only_active
-    )
+    tree = await categories_service.get_category_tree(session=session, only_active=only_active)
+    return ModelResponse(tree)
 
 
 @category_router.get(
@@ -103,17 +112,17 @@ async def get_category_tree(
     response_model=CategoryResponse,
     status_code=status.HTTP_200_OK,
     summary="Получить категорию по ID",
+    dependencies=[Depends(catalog_cache("categories"))],
 )
 @limiter.limit("60/minute")
 async def get_category_by_id(
-    request: Request, category_id: int, session: AsyncSession = Depends(get_db)
-) -> CategoryResponse:
+    request: Request, category_id: int, session: AsyncSession = Depends(get_read_db)
+) -> ModelResponse:
     """
     Получить категорию по ID.
     """
-    return await categories_service.get_category_by_id(
-        session=session, category_id=category_id
-    )
+    category = await categories_service.get_category_by_id(session=session, category_id=category_id)
+    return ModelResponse(category)
 
 
 @category_router.patch(
@@ -146,6 +155,7 @@ async def update_category(
 async def delete_category_by_id(
     category_id: int,
     session: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
     current_user: User = Depends(require_admin),
 ) -> None:
     """
@@ -154,7 +164,7 @@ async def delete_category_by_id(
     Требует прав администратора.
     """
     await categories_service.delete_category_by_id(
-        session=session, category_id=category_id
+        session=session, redis=redis, category_id=category_id
     )
 
 
@@ -207,13 +217,62 @@ async def delete_category_image(
     response_model=CategoryResponse,
     status_code=status.HTTP_200_OK,
     summary="Получить категорию по slug",
+    dependencies=[Depends(catalog_cache("categories"))],
 )
 @limiter.limit("60/minute")
 async def get_category_by_slug(
-    request: Request, slug: str, session: AsyncSession = Depends(get_db)
-) -> CategoryResponse:
+    request: Request, slug: str, session: AsyncSession = Depends(get_read_db)
+) -> ModelResponse:
     """
     Получить категорию по slug.
     """
     category = await categories_service.get_category_by_slug(session=session, slug=slug)
-    return category
+    return ModelResponse(category)
+
+
+@category_router.get(
+    "/{slug}/products",
+    response_model=Page[ProductResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Получить товары категории и ее подкатегорий",
+    dependencies=[Depends(catalog_cache("products"))],
+)
+@limiter.limit("30/minute")
+async def get_category_products(
+    request: Request,
+    slug: str,
+    session: AsyncSession = Depends(get_read_db),
+    product_filter: ProductFilter = FilterDepends(ProductFilter),
+) -> ModelResponse:
+    """
+    Получить товары категории вместе с товарами ее подкатегорий.
+    """
+    products = await categories_service.get_category_products(
+        session=session, slug=slug, product_filter=product_filter
+    )
+    return ModelResponse(products)
+
+
+@category_router.get(
+    "/{slug}/products/cursor",
+    response_model=CursorPage[ProductResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Получить товары категории и ее подкатегорий (курсорная пагинация)",
+    dependencies=[Depends(catalog_cache("products"))],
+)
+@limiter.limit("30/minute")
+async def get_category_products_cursor(
+    request: Request,
+    slug: str,
+    session: AsyncSession = Depends(get_read_db),
+    product_filter: ProductFilter = FilterDepends(ProductFilter),
+) -> ModelResponse:
+    """
+    Получить товары категории вместе с товарами ее подкатегорий постранично по курсору.
+
+    Для следующей страницы передается курсор из поля next_page.
+    """
+    products = await categories_service.get_category_products(
+        session=session, slug=slug, product_filter=product_filter
+    )
+    return ModelResponse(products)
@@ -1,9 +1,11 @@
 from collections.abc import Sequence
 
 from fastapi import APIRouter, Depends, status
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import require_client
+from app.core.redis import get_redis
 from app.db.session import get_db
 from app.models.users_model import User
 from app.schemas.favourites_schema import FavouriteResponse
@@ -21,6 +23,7 @@ favourite_router = APIRouter(prefix="/favourite", tags=["favourite"])
 async def add_to_favourite(
     product_id: int,
     session: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
     current_user: User = Depends(require_client),
 ) -> FavouriteResponse:
     """
@@ -29,7 +32,7 @@ async def add_to_favourite(
     Требует авторизации.
     """
     favourite = await favourites_service.add_to_favourite(
-        session=session, product_id=product_id, user_id=current_user.id
+        session=session, redis=redis, product_id=product_id, user_id=current_user.id
     )
     return favourite
 
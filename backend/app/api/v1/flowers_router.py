@@ -1,10 +1,12 @@
 from collections.abc import Sequence
 
 from fastapi import APIRouter, Depends, status
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import require_admin
-from app.db.session import get_db
+from app.core.redis import get_redis
+from app.db.session import get_db, get_read_db
 from app.models.users_model import User
 from app.schemas.flowers_schema import FlowerCreate, FlowerResponse, FlowerUpdate
 from app.service import flowers_service
@@ -38,7 +40,7 @@ async def create_flower(
     summary="Получить список цветов",
 )
 async def get_flowers(
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_admin),
 ) -> Sequence[FlowerResponse]:
     """
@@ -57,7 +59,7 @@ async def get_flowers(
 )
 async def get_flower(
     flower_id: int,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_admin),
 ) -> FlowerResponse:
     """
@@ -78,15 +80,18 @@ async def update_flower(
     flower_id: int,
     flower_data: FlowerUpdate,
     session: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
     current_user: User = Depends(require_admin),
 ) -> FlowerResponse:
     """
     Изменить данные цветка.
 
+    При изменении цены пересчитываются цены букетов с автоматической ценой.
+
     Требует прав администратора.
     """
     return await flowers_service.update_flower(
-        session=session, flower_id=flower_id, flower_data=flower_data
+        session=session, redis=redis, flower_id=flower_id, flower_data=flower_data
     )
 
 
@@ -96,6 +101,7 @@ async def update_flower(
 async def delete_flower(
     flower_id: int,
     session: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
     current_user: User = Depends(require_admin),
 ) -> None:
     """
@@ -103,4 +109,4 @@ async def delete_flower(
 
     Требует прав администратора.
     """
-    await flowers_service.delete_flower(session=session, flower_id=flower_id)
+    await flowers_service.delete_flower(session=session, redis=redis, flower_id=flower_id)
@@ -0,0 +1,118 @@
+from fastapi import APIRouter, Depends, status
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.deps import require_admin
+from app.core.redis import get_redis
+from app.db.session import get_db
+from app.models.users_model import User
+from app.schemas.inventory_schema import (
+    BouquetAvailability,
+    FlowerStockAdjustRequest,
+    FlowerStockSetRequest,
+    FlowerStockUpdateResponse,
+    StockAdjustRequest,
+    StockSetRequest,
+    StockUpdateResponse,
+)
+from app.service import inventory_service
+
+inventory_router = APIRouter(prefix="/inventory", tags=["inventory"])
+
+
+@inventory_router.put(
+    "/stock",
+    response_model=StockUpdateResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Установить остатки товаров",
+)
+async def set_stock(
+    data: StockSetRequest,
+    session: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+    current_user: User = Depends(require_admin),
+) -> StockUpdateResponse:
+    """
+    Установить остатки списка товаров, общие или на точке самовывоза.
+
+    Требует прав администратора.
+    """
+    return await inventory_service.set_stock(session=session, redis=redis, data=data)
+
+
+@inventory_router.post(
+    "/stock/adjust",
+    response_model=StockUpdateResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Изменить остатки товаров",
+)
+async def adjust_stock(
+    data: StockAdjustRequest,
+    session: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+    current_user: User = Depends(require_admin),
+) -> StockUpdateResponse:
+    """
+    Изменить остатки списка товаров на заданные величины, общие или на точке самовывоза.
+
+    Требует прав администратора.
+    """
+    return await inventory_service.adjust_stock(session=session, redis=redis, data=data)
+
+
+@inventory_router.put(
+    "/flowers/stock",
+    response_model=FlowerStockUpdateResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Установить остатки цветов",
+)
+async def set_flower_stock(
+    data: FlowerStockSetRequest,
+    session: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+    current_user: User = Depends(require_admin),
+) -> FlowerStockUpdateResponse:
+    """
+    Установить остатки списка цветов и пересчитать наличие букетов с ними.
+
+    Требует прав администратора.
+    """
+    return await inventory_service.set_flower_stock(session=session, redis=redis, data=data)
+
+
+@inventory_router.post(
+    "/flowers/stock/adjust",
+    response_model=FlowerStockUpdateResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Изменить остатки цветов",
+)
+async def adjust_flower_stock(
+    data: FlowerStockAdjustRequest,
+    session: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+    current_user: User = Depends(require_admin),
+) -> FlowerStockUpdateResponse:
+    """
+    Изменить остатки списка цветов на заданные величины и пересчитать наличие букетов с ними.
+
+    Требует прав администратора.
+    """
+    return await inventory_service.adjust_flower_stock(session=session, redis=redis, data=data)
+
+
+@inventory_router.get(
+    "/bouquets",
+    response_model=list[BouquetAvailability],
+    status_code=status.HTTP_200_OK,
+    summary="Сколько букетов можно собрать",
+)
+async def get_bouquet_availability(
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_admin),
+) -> list[BouquetAvailability]:
+    """
+    Получить количество букетов, которое можно собрать из текущих остатков цветов.
+
+    Требует прав администратора.
+    """
+    return await inventory_service.get_bouquet_availability(session=session)
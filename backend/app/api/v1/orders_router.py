@@ -1,23 +1,28 @@
 import uuid
 from datetime import UTC, datetime, timedelta
 
-from fastapi import APIRouter, Depends, Request, status
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
 from fastapi_pagination import Page
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.deps import require_admin, require_client, verify_yookassa_request
+from app.core.deps import require_admin, require_client, require_client_stream, verify_yookassa_request
 from app.core.limiter import limiter
-from app.db.session import get_db
+from app.core.redis import get_redis
+from app.db.session import get_db, get_read_db
 from app.models.orders_model import Status
 from app.models.users_model import User
 from app.schemas.orders_schema import (
     CreateOrderRequest,
+    OrderExportFormat,
     OrderResponse,
     OrderResponseWithPayment,
     WebhookPayload,
+    WebhookQueueMetrics,
 )
-from app.service import orders_service
+from app.service import orders_service, webhooks_service
 
 order_router = APIRouter(prefix="/orders", tags=["orders"])
 
@@ -34,6 +39,7 @@ async def create_order(
     data: CreateOrderRequest,
     user: User = Depends(require_client),
     session: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
 ) -> OrderResponseWithPayment:
     """
     Создать заказ.
@@ -42,6 +48,7 @@ async def create_order(
     """
     return await orders_service.create_order(
         session=session,
+        redis=redis,
         user_id=user.id,
         data=data,
         idempotency_key=uuid.uuid4(),
@@ -54,13 +61,33 @@ async def create_order(
 async def yookassa_webhook(
     request: Request,
     payload: WebhookPayload,
-    session: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
     security: None = Depends(verify_yookassa_request),
 ) -> None:
     """
     Получить ответ от юkassa со статусом оплаты.
+
+    Уведомление сохраняется в очередь и обрабатывается асинхронно.
     """
-    await orders_service.process_webhook(session=session, payload=payload)
+    await webhooks_service.enqueue_webhook(redis=redis, payload=payload)
+
+
+@order_router.get(
+    "/webhook/metrics",
+    response_model=WebhookQueueMetrics,
+    status_code=status.HTTP_200_OK,
+    summary="Состояние очереди уведомлений YooKassa",
+)
+async def get_webhook_queue_metrics(
+    redis: Redis = Depends(get_redis),
+    current_user: User = Depends(require_admin),
+) -> WebhookQueueMetrics:
+    """
+    Получить длину очереди уведомлений, отставание обработчиков и количество сообщений в dead-letter.
+
+    Требует прав администратора.
+    """
+    return await webhooks_service.get_queue_metrics(redis=redis)
 
 
 @order_router.get(
@@ -71,7 +98,7 @@ async def yookassa_webhook(
 )
 async def get_orders(
     current_user: User = Depends(require_client),
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
 ) -> Page[OrderResponse]:
     """
     Получить список заказов.
@@ -114,6 +141,36 @@ async def get_all_orders(session: AsyncSession = Depends(get_db), current_user:
     return orders
 
 
+@order_router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Выгрузить заказы за период",
+)
+async def export_orders(
+    date_from: datetime,
+    date_to: datetime,
+    statuses: list[Status] | None = Query(default=None, alias="status"),
+    export_format: OrderExportFormat = Query(default=OrderExportFormat.CSV, alias="format"),
+    current_user: User = Depends(require_admin),
+) -> StreamingResponse:
+    """
+    Выгрузить заказы за период в CSV или NDJSON потоком.
+
+    Требует прав администратора.
+    """
+    orders_service.validate_export_range(date_from=date_from, date_to=date_to)
+    media_type = "text/csv" if export_format == OrderExportFormat.CSV else "application/x-ndjson"
+    filename = f"orders_{date_from:%Y%m%d}_{date_to:%Y%m%d}.{export_format}"
+    return StreamingResponse(
+        orders_service.stream_orders_export(
+            date_from=date_from, date_to=date_to, statuses=statuses, export_format=export_format
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @order_router.get(
     "/{order_id}",
     response_model=OrderResponse,
@@ -134,6 +191,34 @@ async def get_order_by_id(
     return order
 
 
+@order_router.get(
+    "/{order_id}/events",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Поток изменений статуса заказа (SSE)",
+)
+async def order_events(
+    order_id: int,
+    # Сессии обработчика и авторизации закрываются по выходе из обработчика, а не по окончании долгого потока
+    session: AsyncSession = Depends(get_db, scope="function"),
+    redis: Redis = Depends(get_redis),
+    current_user: User = Depends(require_client_stream),
+) -> StreamingResponse:
+    """
+    Получить статус заказа и его изменение после оплаты через server-sent events.
+
+    Заменяет опрос GET /orders/{order_id} после оформления заказа. Требует авторизации.
+    """
+    order_status = await orders_service.get_order_status_for_events(
+        session=session, order_id=order_id, current_user=current_user
+    )
+    return StreamingResponse(
+        orders_service.stream_order_events(redis=redis, order_id=order_id, status=order_status),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @order_router.patch(
     "/status/{order_id}",
     response_model=OrderResponse,
@@ -144,6 +229,7 @@ async def update_order_status(
     order_id: int,
     status: Status,
     session: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
     current_user: User = Depends(require_admin),
 ) -> OrderResponse:
     """
@@ -151,7 +237,9 @@ async def update_order_status(
 
     Требует прав администратора.
     """
-    order = await orders_service.update_order_status(session=session, order_id=order_id, status=status)
+    order = await orders_service.update_order_status(
+        session=session, redis=redis, order_id=order_id, status=status
+    )
     return order
 
 
@@ -164,6 +252,7 @@ async def update_order_status(
 async def cancel_order(
     order_id: int,
     session: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
     current_user: User = Depends(require_client),
 ) -> OrderResponse:
     """
@@ -171,5 +260,7 @@ async def cancel_order(
 
     Требует авторизации.
     """
-    order = await orders_service.cancel_order(session=session, order_id=order_id, user_id=current_user.id)
+    order = await orders_service.cancel_order(
+        session=session, redis=redis, order_id=order_id, user_id=current_user.id
+    )
     return order
@@ -1,12 +1,12 @@
-from collections.abc import Sequence
-
 from fastapi import APIRouter, Depends, Request, status
 from fastapi_pagination import Page
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import require_admin
+from app.core.http_cache import catalog_cache
 from app.core.limiter import limiter
-from app.db.session import get_db
+from app.core.responses import ModelResponse
+from app.db.session import get_db, get_read_db
 from app.models.users_model import User
 from app.schemas.pickups_schema import (
     PickupPointCreate,
@@ -42,16 +42,18 @@ async def create_pickup_point(
     response_model=list[PickupPointResponse],
     status_code=status.HTTP_200_OK,
     summary="Получить все активные точки самовывоза",
+    dependencies=[Depends(catalog_cache("pickup_points"))],
 )
 @limiter.limit("30/minute")
 async def get_active_pickup_points(
     request: Request,
-    session: AsyncSession = Depends(get_db),
-) -> Sequence[PickupPointResponse]:
+    session: AsyncSession = Depends(get_read_db),
+) -> ModelResponse:
     """
     Получить все активные точки самовывоза.
     """
-    return await pickups_service.get_all_active_pickup_points(session)
+    pickup_points = await pickups_service.get_all_active_pickup_points(session)
+    return ModelResponse(pickup_points)
 
 
 @pickup_point_router.get(
@@ -75,17 +77,19 @@ async def get_all_pickup_points(
     response_model=PickupPointResponse,
     status_code=status.HTTP_200_OK,
     summary="Получить точку самовывоза по ID",
+    dependencies=[Depends(catalog_cache("pickup_points"))],
 )
 @limiter.limit("60/minute")
 async def get_pickup_point(
     request: Request,
     pickup_point_id: int,
-    session: AsyncSession = Depends(get_db),
-) -> PickupPointResponse:
+    session: AsyncSession = Depends(get_read_db),
+) -> ModelResponse:
     """
     Получить точку самовывоза по ID.
     """
-    return await pickups_service.get_pickup_point_by_id(session, pickup_point_id)
+    pickup_point = await pickups_service.get_pickup_point_by_id(session, pickup_point_id)
+    return ModelResponse(pickup_point)
 
 
 @pickup_point_router.patch(
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, status
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.deps import require_admin
+from app.core.redis import get_redis
+from app.db.session import get_db
+from app.models.users_model import User
+from app.schemas.pricing_schema import RepriceReport, RepriceRequest
+from app.service import pricing_service
+
+pricing_router = APIRouter(prefix="/pricing", tags=["pricing"])
+
+
+@pricing_router.post(
+    "/reprice",
+    response_model=RepriceReport,
+    status_code=status.HTTP_200_OK,
+    summary="Пересчитать цены букетов по составу",
+)
+async def reprice_products(
+    data: RepriceRequest,
+    session: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+    current_user: User = Depends(require_admin),
+) -> RepriceReport:
+    """
+    Пересчитать цены букетов с автоматической ценой по стоимости состава.
+
+    С dry_run (по умолчанию) только возвращает, как изменятся цены.
+
+    Требует прав администратора.
+    """
+    return await pricing_service.reprice_products(
+        session=session,
+        redis=redis,
+        flower_ids=data.flower_ids,
+        product_ids=data.product_ids,
+        dry_run=data.dry_run,
+    )
@@ -4,15 +4,20 @@ from decimal import Decimal
 from fastapi import APIRouter, Depends, Form, Request, UploadFile, status
 from fastapi_filter import FilterDepends
 from fastapi_pagination import Page
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import require_admin
+from app.core.http_cache import catalog_cache
 from app.core.limiter import limiter
-from app.db.session import get_db
+from app.core.redis import get_redis
+from app.core.responses import ModelResponse
+from app.db.session import get_db, get_read_db
 from app.models.users_model import User
 from app.schemas.flowers_schema import SetCompositionRequest
 from app.schemas.products_schema import (
     ProductCreate,
+    ProductFacets,
     ProductImageResponse,
     ProductResponse,
     ProductUpdate,
@@ -67,18 +72,40 @@ async def create_product(
     response_model=Page[ProductResponse],
     status_code=status.HTTP_200_OK,
     summary="Получить список товаров",
+    dependencies=[Depends(catalog_cache("products"))],
 )
 @limiter.limit("30/minute")
 async def get_products(
     request: Request,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     product_filter: ProductFilter = FilterDepends(ProductFilter),
-) -> Page[ProductResponse]:
+) -> ModelResponse:
     """Получить список товаров"""
     products = await products_service.get_products(
         session=session, product_filter=product_filter
     )
-    return products
+    return ModelResponse(products)
+
+
+@product_router.get(
+    "/facets",
+    response_model=ProductFacets,
+    status_code=status.HTTP_200_OK,
+    summary="Получить количество товаров по значениям фильтров",
+    dependencies=[Depends(catalog_cache("products"))],
+)
+@limiter.limit("30/minute")
+async def get_product_facets(
+    request: Request,
+    session: AsyncSession = Depends(get_read_db),
+    redis: Redis = Depends(get_redis),
+    product_filter: ProductFilter = FilterDepends(ProductFilter),
+) -> ModelResponse:
+    """Получить количество товаров по цветам, категориям, наличию и ценовым диапазонам для текущего фильтра."""
+    facets = await products_service.get_product_facets(
+        session=session, redis=redis, product_filter=product_filter
+    )
+    return ModelResponse(facets)
 
 
 @product_router.get(
@@ -86,14 +113,15 @@ async def get_products(
     response_model=ProductResponse,
     status_code=status.HTTP_200_OK,
     summary="Получить один товар",
+    dependencies=[Depends(catalog_cache("products"))],
 )
 @limiter.limit("60/minute")
 async def get_product_by_id(
-    request: Request, product_id: int, session: AsyncSession = Depends(get_db)
-):
+    request: Request, product_id: int, session: AsyncSession = Depends(get_read_db)
+) -> ModelResponse:
     """Получить товар по ID."""
     product = await products_service.get_product(session=session, product_id=product_id)
-    return product
+    return ModelResponse(product)
 
 
 @product_router.patch(
@@ -106,6 +134,7 @@ async def update_product(
     product_id: int,
     product_data: ProductUpdate,
     session: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
     current_user: User = Depends(require_admin),
 ) -> ProductResponse:
     """
@@ -114,7 +143,7 @@ async def update_product(
     Требует прав администратора.
     """
     product = await products_service.update_product(
-        session=session, product_id=product_id, product_data=product_data
+        session=session, redis=redis, product_id=product_id, product_data=product_data
     )
     return product
 
@@ -125,6 +154,7 @@ async def update_product(
 async def delete_product(
     product_id: int,
     session: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
     current_user: User = Depends(require_admin),
 ):
     """
@@ -132,7 +162,9 @@ async def delete_product(
 
     Требует прав администратора.
     """
-    await products_service.delete_product(session=session, product_id=product_id)
+    await products_service.delete_product(
+        session=session, redis=redis, product_id=product_id
+    )
 
 
 @product_router.post(
@@ -166,7 +198,7 @@ async def upload_image(
     summary="Получить изображения товара",
 )
 async def get_products_images(
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
 ) -> Sequence[ProductImageResponse]:
     """Получить изображений товара."""
     images = await products_service.get_product_images(session=session)
@@ -195,10 +227,11 @@ async def set_product_composition(
     product_id: int,
     request: SetCompositionRequest,
     session: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
     current_user: User = Depends(require_admin),
 ) -> None:
     await flowers_service.set_product_composition(
-        session=session, product_id=product_id, items=request.items
+        session=session, redis=redis, product_id=product_id, items=request.items
     )
 
 
@@ -207,10 +240,11 @@ async def set_product_composition(
 )
 async def close_all_products(
     session: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
     current_user: User = Depends(require_admin),
 ) -> dict[str, int]:
     count = await products_service.set_all_products_in_stock(
-        session=session, in_stock=False
+        session=session, redis=redis, in_stock=False
     )
     return {"updated": count}
 
@@ -220,9 +254,10 @@ async def close_all_products(
 )
 async def open_all_products(
     session: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
     current_user: User = Depends(require_admin),
 ) -> dict[str, int]:
     count = await products_service.set_all_products_in_stock(
-        session=session, in_stock=True
+        session=session, redis=redis, in_stock=True
     )
     return {"updated": count}
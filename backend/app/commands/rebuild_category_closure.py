@@ -0,0 +1,56 @@
+"""
+Пересборка и проверка таблицы category_closure по parent_id категорий.
+
+Замыкание поддерживается при создании, переносе и удалении категорий;
+команда нужна для исправления расхождений, например после ручных правок parent_id.
+С --check только сравнивает таблицу с деревом и завершается с кодом 1 при расхождениях.
+
+Запуск из каталога backend:
+    python -m app.commands.rebuild_category_closure
+    python -m app.commands.rebuild_category_closure --check
+"""
+
+import argparse
+import asyncio
+import sys
+
+from app.core.logger import get_logger, setup_logging
+from app.db.session import AsyncSessionLocal, engine
+from app.repository import categories_repository
+
+logger = get_logger(__name__)
+
+
+async def rebuild() -> None:
+    async with AsyncSessionLocal() as session, session.begin():
+        rows = await categories_repository.rebuild_closure(session=session)
+    await engine.dispose()
+    logger.info("category_closure_rebuilt", rows=rows)
+
+
+async def check() -> bool:
+    async with AsyncSessionLocal() as session:
+        missing, extra = await categories_repository.count_closure_mismatches(session=session)
+    await engine.dispose()
+    if missing or extra:
+        logger.warning("category_closure_inconsistent", missing=missing, extra=extra)
+        return False
+    logger.info("category_closure_consistent")
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="только проверить, не изменяя таблицу")
+    args = parser.parse_args()
+
+    setup_logging()
+    if args.check:
+        if not asyncio.run(check()):
+            sys.exit(1)
+    else:
+        asyncio.run(rebuild())
+
+
+if __name__ == "__main__":
+    main()
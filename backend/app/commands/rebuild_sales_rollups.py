@@ -0,0 +1,40 @@
+"""
+Пересчет дневных агрегатов продаж по уже оплаченным заказам.
+
+Нужен для первоначального заполнения таблиц аналитики и для исправления
+расхождений. Период пересчитывается в одной транзакции.
+
+Запуск из каталога backend:
+    python -m app.commands.rebuild_sales_rollups --from 2025-01-01 --to 2025-12-31
+"""
+
+import argparse
+import asyncio
+from datetime import date
+
+from app.core.logger import get_logger, setup_logging
+from app.db.session import AsyncSessionLocal, engine
+from app.service import analytics_service
+
+logger = get_logger(__name__)
+
+
+async def rebuild(date_from: date, date_to: date) -> None:
+    async with AsyncSessionLocal() as session, session.begin():
+        await analytics_service.rebuild_sales_rollups(session=session, date_from=date_from, date_to=date_to)
+    await engine.dispose()
+    logger.info("sales_rollups_rebuilt", date_from=str(date_from), date_to=str(date_to))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, required=True)
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, default=date.today())
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(rebuild(args.date_from, args.date_to))
+
+
+if __name__ == "__main__":
+    main()
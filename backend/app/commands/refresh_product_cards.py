@@ -0,0 +1,40 @@
+"""
+Пересборка карточек товаров (таблица product_card).
+
+Карточки обновляются в транзакциях изменения товаров, скидок, цветов и категорий;
+команда нужна для первоначального заполнения перед включением PRODUCT_CARDS_ENABLED
+и для исправления расхождений. Все карточки пересобираются в одной транзакции.
+
+Запуск из каталога backend:
+    python -m app.commands.refresh_product_cards
+    python -m app.commands.refresh_product_cards --product-id 12 --product-id 15
+"""
+
+import argparse
+import asyncio
+
+from app.core.logger import get_logger, setup_logging
+from app.db.session import AsyncSessionLocal, engine
+from app.service import product_cards_service
+
+logger = get_logger(__name__)
+
+
+async def refresh(product_ids: list[int] | None) -> None:
+    async with AsyncSessionLocal() as session, session.begin():
+        refreshed = await product_cards_service.refresh_product_cards(session=session, product_ids=product_ids)
+    await engine.dispose()
+    logger.info("product_cards_refreshed", refreshed=refreshed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--product-id", dest="product_ids", type=int, action="append")
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(refresh(args.product_ids))
+
+
+if __name__ == "__main__":
+    main()
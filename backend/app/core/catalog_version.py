@@ -0,0 +1,117 @@
+import asyncio
+import time
+from dataclasses import dataclass
+
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+
+from .logger import get_logger
+from .redis import get_redis
+
+logger = get_logger(__name__)
+
+CATALOG_VERSION_KEY = "catalog:version"
+
+# Таблицы, изменение которых меняет ответы публичных эндпоинтов каталога
+CATALOG_TABLES = frozenset(
+    {
+        "product",
+        "product_image",
+        "product_category",
+        "bouquet_composition",
+        "flower",
+        "category",
+        "discount",
+        "banner",
+        "pickup_point",
+    }
+)
+
+_SESSION_FLAG = "catalog_changed"
+_background_tasks: set[asyncio.Task] = set()
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogVersion:
+    """Версия каталога и время ее последнего изменения (unix time, секунды)."""
+
+    version: int
+    modified_at: int
+
+
+async def get_catalog_version() -> CatalogVersion:
+    """
+    Возвращает текущую версию каталога, создавая ее при первом обращении.
+
+    Начальная версия — текущее время в миллисекундах, поэтому после очистки Redis
+    версии не повторяют выданные ранее ETag.
+    """
+    redis = get_redis()
+    version, modified_at = await redis.hmget(CATALOG_VERSION_KEY, ["version", "modified_at"])  # type: ignore[misc]
+    if version is None or modified_at is None:
+        now = time.time()
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hsetnx(CATALOG_VERSION_KEY, "version", int(now * 1000))
+            pipe.hsetnx(CATALOG_VERSION_KEY, "modified_at", int(now))
+            pipe.hmget(CATALOG_VERSION_KEY, ["version", "modified_at"])
+            *_, (version, modified_at) = await pipe.execute()
+    return CatalogVersion(version=int(version), modified_at=int(modified_at))
+
+
+async def bump_catalog_version() -> None:
+    """Увеличивает версию каталога; ошибки Redis логируются и не прерывают запрос."""
+    try:
+        async with get_redis().pipeline(transaction=True) as pipe:
+            pipe.hincrby(CATALOG_VERSION_KEY, "version", 1)
+            pipe.hset(CATALOG_VERSION_KEY, "modified_at", int(time.time()))
+            await pipe.execute()
+    except (RedisError, RuntimeError) as exc:
+        logger.warning("catalog_version_bump_failed", exc_info=exc)
+
+
+def register_catalog_listeners() -> None:
+    """
+    Подключает отслеживание изменений каталога к сессиям SQLAlchemy.
+
+    Сессия помечается при flush объектов каталога и при UPDATE/DELETE/INSERT-запросах
+    к его таблицам; версия увеличивается после фиксации транзакции, чтобы ETag новой
+    версии никогда не выдавался вместе с незафиксированными данными.
+    """
+    if event.contains(Session, "after_commit", _after_commit):
+        return
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "do_orm_execute", _do_orm_execute)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+
+
+def _after_flush(session: Session, _flush_context: UOWTransaction) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if getattr(obj, "__tablename__", None) in CATALOG_TABLES:
+            session.info[_SESSION_FLAG] = True
+            return
+
+
+def _do_orm_execute(state: ORMExecuteState) -> None:
+    if not (state.is_update or state.is_delete or state.is_insert):
+        return
+    table = getattr(state.statement, "table", None)
+    if getattr(table, "name", None) in CATALOG_TABLES:
+        state.session.info[_SESSION_FLAG] = True
+
+
+def _after_commit(session: Session) -> None:
+    if not session.info.pop(_SESSION_FLAG, False):
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(bump_catalog_version())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_SESSION_FLAG, None)
@@ -0,0 +1,222 @@
+import gzip
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+
+try:
+    import brotli
+except ImportError:  # brotli не обязателен: без него отдается только gzip
+    brotli = None
+
+# Ключ в ASGI scope, под которым зависимость кэша каталога оставляет ключ ответа для сохранения
+RESPONSE_CACHE_SCOPE_KEY = "response_cache_key"
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+# Поток событий нельзя буферизовать или сжимать: клиент ждет каждое сообщение сразу
+NON_COMPRESSIBLE_TYPES = ("text/event-stream",)
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """
+    Выбирает кодировку ответа по заголовку Accept-Encoding: br, если доступен, иначе gzip.
+
+    Args:
+        accept_encoding: значение заголовка Accept-Encoding
+
+    Returns:
+        "br", "gzip" или None, если клиент не принимает ни одну из них
+    """
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    def quality_of(encoding: str) -> float:
+        return accepted.get(encoding, accepted.get("*", 0.0))
+
+    if brotli is not None and quality_of("br") > 0 and quality_of("br") >= quality_of("gzip"):
+        return "br"
+    if quality_of("gzip") > 0:
+        return "gzip"
+    return None
+
+
+@dataclass(frozen=True, slots=True)
+class CachedBody:
+    """Готовое к отправке тело ответа с заголовками (уже сжатое, если клиент это принимает)."""
+
+    body: bytes
+    headers: tuple[tuple[bytes, bytes], ...]
+
+
+class ResponseCache:
+    """LRU-кэш готовых тел ответов в памяти процесса с ограничением по числу записей и объему."""
+
+    def __init__(self, *, max_entries: int, max_bytes: int) -> None:
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._size = 0
+        self._entries: OrderedDict[tuple[str, ...], CachedBody] = OrderedDict()
+
+    def get(self, key: tuple[str, ...]) -> CachedBody | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: tuple[str, ...], entry: CachedBody) -> None:
+        if len(entry.body) > self._max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous.body)
+        self._entries[key] = entry
+        self._size += len(entry.body)
+        while len(self._entries) > self._max_entries or self._size > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted.body)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES, max_bytes=settings.RESPONSE_CACHE_MAX_BYTES
+)
+
+
+class CompressionMiddleware:
+    """
+    Сжатие ответов gzip/brotli в виде чистого ASGI-middleware.
+
+    Ответы меньше COMPRESSION_MINIMUM_SIZE, уже сжатые и несжимаемых типов проходят
+    без изменений. Потоковые ответы сжимаются по частям со сбросом буфера после каждой
+    части. Если зависимость кэша каталога оставила в scope ключ ответа, готовое тело
+    сохраняется в response_cache и при следующем запросе с тем же ETag отдается без
+    сериализации и сжатия.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        responder = _CompressionResponder(scope=scope, send=send, encoding=encoding)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, *, scope: Scope, send: Send, encoding: str | None) -> None:
+        self._scope = scope
+        self._send = send
+        self._encoding = encoding
+        self._start: Message | None = None
+        self._passthrough = False
+        self._compressor: Any = None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        if self._start is not None:
+            start, self._start = self._start, None
+            await self._send_first(start, message)
+            return
+        if self._passthrough:
+            await self._send(message)
+            return
+        more_body = message.get("more_body", False)
+        chunk = self._compress_chunk(message.get("body", b""), final=not more_body)
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _send_first(self, start: Message, message: Message) -> None:
+        headers = MutableHeaders(raw=list(start["headers"]))
+        start["headers"] = headers.raw
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+        compressible = _is_compressible(start["status"], headers)
+        if compressible:
+            headers.add_vary_header("Accept-Encoding")
+
+        too_small = not more_body and len(body) < settings.COMPRESSION_MINIMUM_SIZE
+        if not compressible or self._encoding is None or too_small:
+            self._passthrough = True
+            if not more_body:
+                self._remember(start["status"], headers, body)
+            await self._send(start)
+            await self._send(message)
+            return
+
+        headers["Content-Encoding"] = self._encoding
+        if more_body:
+            del headers["Content-Length"]
+            self._compressor = _new_compressor(self._encoding)
+            await self._send(start)
+            await self._send(
+                {"type": "http.response.body", "body": self._compress_chunk(body, final=False), "more_body": True}
+            )
+            return
+
+        body = _compress(self._encoding, body)
+        headers["Content-Length"] = str(len(body))
+        self._remember(start["status"], headers, body)
+        await self._send(start)
+        await self._send({"type": "http.response.body", "body": body, "more_body": False})
+
+    def _compress_chunk(self, data: bytes, *, final: bool) -> bytes:
+        if self._compressor is None:
+            raise RuntimeError("Response body received after the final chunk")
+        if self._encoding == "gzip":
+            mode = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+            return self._compressor.compress(data) + self._compressor.flush(mode)
+        return self._compressor.process(data) + (self._compressor.finish() if final else self._compressor.flush())
+
+    def _remember(self, status: int, headers: MutableHeaders, body: bytes) -> None:
+        cache_key = self._scope.get(RESPONSE_CACHE_SCOPE_KEY)
+        if cache_key is None or status != 200:
+            return
+        raw = tuple((name, value) for name, value in headers.raw if name.lower() != b"set-cookie")
+        response_cache.put((*cache_key, self._encoding or "identity"), CachedBody(body=body, headers=raw))
+
+
+def _is_compressible(status: int, headers: MutableHeaders) -> bool:
+    if status < 200 or status in (204, 304) or "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "")
+    if content_type.startswith(NON_COMPRESSIBLE_TYPES):
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def _new_compressor(encoding: str) -> Any:
+    if encoding == "br":
+        return brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+    # wbits=31 — формат gzip с заголовком
+    return zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+
+def _compress(encoding: str, body: bytes) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
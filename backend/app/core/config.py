@@ -1,3 +1,4 @@
+from decimal import Decimal
 from pathlib import Path
 from typing import Annotated, Any, Literal
 
@@ -46,7 +47,9 @@ class Settings(BaseSettings):
     BACKEND_CORS_ORIGINS: Annotated[
         list[AnyUrl] | str, BeforeValidator(parse_cors)
     ] = []
-    TRUSTED_PROXIES: list[str] = []
+    # Адреса или подсети прокси, которым доверяется X-Forwarded-For. По умолчанию — nginx на том же хосте;
+    # за прокси в другом контейнере нужна его подсеть, иначе проверка адресов ЮKassa отклонит уведомления
+    TRUSTED_PROXIES: list[str] = ["127.0.0.1", "::1"]
 
     # SECURITY.PY
     REFRESH_TOKEN_BYTES: int = 64
@@ -100,13 +103,84 @@ class Settings(BaseSettings):
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str = ""
     POSTGRES_DB: str = ""
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500  # подготовленных запросов asyncpg на соединение
+    DB_QUERY_CACHE_SIZE: int = 1200  # скомпилированных запросов SQLAlchemy на движок
+    DB_PGBOUNCER: bool = False  # подключение через pgbouncer в режиме transaction
+    POSTGRES_REPLICA_SERVER: str | None = None  # реплика для чтения; без нее все запросы идут на основной сервер
+    POSTGRES_REPLICA_PORT: int = 5432
+    REPLICA_MAX_LAG_SECONDS: float = 5.0  # при большем отставании чтение переключается на основной сервер
+    REPLICA_LAG_CHECK_INTERVAL: float = 5.0  # seconds
+    READ_YOUR_WRITES_WINDOW: int = 10  # seconds, сколько после изменения клиент читает с основного сервера
+    DB_CONNECTION_HOLD_WARN_MS: float = 1000.0  # удержание соединения дольше этого логируется
 
     # REDIS DATABASE
     REDIS_URL: str
+    REDIS_MAX_CONNECTIONS: int = 50  # на один процесс приложения
+    REDIS_POOL_TIMEOUT: float = 5.0  # seconds, ожидание свободного соединения
+    REDIS_SOCKET_TIMEOUT: float = 5.0  # seconds
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30  # seconds
+
+    # RATE LIMIT
+    RATE_LIMIT_FAIL_OPEN: bool = True  # пропускать запросы, если Redis недоступен
+    RATE_LIMIT_LOCAL_FRACTION: float = 0.5  # до какой доли лимита запросы пропускаются без обращения к Redis
+    RATE_LIMIT_SYNC_INTERVAL: float = 1.0  # seconds
+    RATE_LIMIT_LOCAL_MAX_KEYS: int = 10_000
+
+    # CACHE
+    PRODUCT_SUMMARY_CACHE_TTL: int = 300  # seconds
+    PRODUCT_CARDS_ENABLED: bool = False  # отдавать список товаров из product_card (заполнить командой refresh_product_cards)
+    PRODUCT_FACETS_CACHE_TTL: int = 600  # seconds, ключ включает версию каталога
+    PRODUCT_FACET_PRICE_BOUNDS: list[Decimal] = [  # границы ценовых диапазонов фасета цены
+        Decimal(2000),
+        Decimal(3500),
+        Decimal(5000),
+        Decimal(8000),
+    ]
+    RESPONSE_CACHE_MAX_ENTRIES: int = 512  # готовых (сжатых) ответов каталога в памяти процесса
+    RESPONSE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # bytes, меньшие ответы не сжимаются
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    HTTP_CACHE_DEFAULT_POLICY: str = "public, max-age=0, must-revalidate"
+    HTTP_CACHE_POLICIES: dict[str, str] = {  # Cache-Control публичных эндпоинтов каталога по имени группы
+        "products": "public, max-age=30, stale-while-revalidate=60",
+        "categories": "public, max-age=300, stale-while-revalidate=600",
+        "banners": "public, max-age=300, stale-while-revalidate=600",
+        "pickup_points": "public, max-age=600, stale-while-revalidate=3600",
+    }
+
+    # PRICING
+    PRICING_MARKUP: Decimal = Field(default=Decimal("2.5"), gt=0)  # цена букета = стоимость состава * наценка
+    PRICING_ROUNDING_STEP: Decimal = Field(default=Decimal(10), gt=0)  # цена округляется до кратного шагу
+    PRICING_ROUNDING: Literal["up", "down", "nearest"] = "up"
+
+    # ANALYTICS
+    ANALYTICS_TIMEZONE: str = "Asia/Yekaterinburg"  # часовой пояс, по которому продажи делятся на дни
+
     # ЮKASSA
     YOOKASSA_SHOP_ID: str
     YOOKASSA_SECRET_KEY: str
+    YOOKASSA_TRUSTED_IPS: list[str] = [
+        "185.71.76.0/27",
+        "185.71.77.0/27",
+        "77.75.153.0/25",
+        "77.75.156.11",
+        "77.75.156.35",
+        "77.75.154.128/25",
+        "2a02:5180::/32",
+    ]
     ORDER_EXPIRATION_MINUTES: int = 30
+    WEBHOOK_STREAM: str = "webhooks:yookassa"
+    WEBHOOK_DEAD_LETTER_STREAM: str = "webhooks:yookassa:dead"
+    WEBHOOK_CONSUMER_GROUP: str = "webhook_workers"
+    WEBHOOK_CONSUMERS: int = 1  # обработчиков очереди на один процесс приложения
+    WEBHOOK_STREAM_MAXLEN: int = 100_000
+    WEBHOOK_MAX_ATTEMPTS: int = 5
+    WEBHOOK_CLAIM_IDLE_MS: int = 60_000  # через сколько зависшее сообщение забирает другой обработчик
+    WEBHOOK_DEDUP_TTL: int = 7 * 24 * 3600  # seconds
+    ORDER_EVENTS_TIMEOUT: int = 900  # seconds, сколько SSE-соединение ждет смены статуса заказа
+    ORDER_EVENTS_KEEPALIVE: int = 15  # seconds, интервал комментариев-пингов в SSE-потоке
+    ORDER_STATUS_TTL: int = 3600  # seconds, хранение последнего статуса заказа в Redis
     CAPTURE: bool = (
         True  # True - автосписание, False - после подтверждения. Обговорить с Сашей
     )
@@ -147,6 +221,20 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    @computed_field
+    @property
+    def SQLALCHEMY_REPLICA_URI(self) -> PostgresDsn | None:
+        if not self.POSTGRES_REPLICA_SERVER:
+            return None
+        return PostgresDsn.build(
+            scheme="postgresql+asyncpg",
+            username=self.POSTGRES_USER,
+            password=self.POSTGRES_PASSWORD,
+            host=self.POSTGRES_REPLICA_SERVER,
+            port=self.POSTGRES_REPLICA_PORT,
+            path=self.POSTGRES_DB,
+        )
+
     @model_validator(mode="after")
     def validate_production_secrets(self) -> "Settings":
         """Validate that production secrets are not default values."""
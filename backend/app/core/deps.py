@@ -4,26 +4,19 @@ import jwt
 from fastapi import Depends, HTTPException, Request, status
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
-from yookassa.domain.common import SecurityHelper
 
 from app.db.session import get_db
 from app.models.users_model import Role, User
 from app.repository import users_repository
 
+from . import ip_ranges
 from .config import settings
 from .exceptions import InsufficientPermissionError, InvalidTokenError
 from .redis import get_redis
 from .security import is_blacklisted, oauth2_scheme
 
 
-async def get_current_user(
-    session: AsyncSession = Depends(get_db),
-    redis: Redis = Depends(get_redis),
-    header_token: str | None = Depends(oauth2_scheme),
-):
-    """Получение активного пользователя из токена."""
-    token = header_token
-
+async def _authenticate(*, session: AsyncSession, redis: Redis, token: str | None) -> User:
     if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -48,6 +41,25 @@ async def get_current_user(
     return user
 
 
+async def get_current_user(
+    session: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+    header_token: str | None = Depends(oauth2_scheme),
+):
+    """Получение активного пользователя из токена."""
+    return await _authenticate(session=session, redis=redis, token=header_token)
+
+
+async def get_current_user_for_stream(
+    # Сессия закрывается по выходе из обработчика, а не по окончании потокового ответа
+    session: AsyncSession = Depends(get_db, scope="function"),
+    redis: Redis = Depends(get_redis),
+    header_token: str | None = Depends(oauth2_scheme),
+) -> User:
+    """Получение активного пользователя из токена для долгих потоковых ответов (SSE)."""
+    return await _authenticate(session=session, redis=redis, token=header_token)
+
+
 class RoleChecker:
     """RBAC класс, для работы с ролями."""
 
@@ -61,8 +73,16 @@ class RoleChecker:
         raise InsufficientPermissionError()
 
 
+class StreamRoleChecker(RoleChecker):
+    """RoleChecker для потоковых ответов: соединение с БД не удерживается на время потока."""
+
+    def __call__(self, current_user: User = Depends(get_current_user_for_stream)) -> User:
+        return super().__call__(current_user)
+
+
 require_admin = RoleChecker([Role.ADMIN])
 require_client = RoleChecker([Role.CLIENT, Role.ADMIN])
+require_client_stream = StreamRoleChecker([Role.CLIENT, Role.ADMIN])
 
 
 async def verify_bot_api_key(request: Request) -> None:
@@ -75,19 +95,9 @@ async def verify_yookassa_request(request: Request) -> None:
     """
     Зависимость для проверки, что запрос пришел именно от серверов ЮKassa.
     """
-    x_forwarded_for = request.headers.get("X-Forwarded-For")
-
-    if x_forwarded_for:
-        client_ip = x_forwarded_for.split(",")[0].strip()
-    else:
-        if request.client is None:
-            raise HTTPException(status_code=400, detail="Could not determine client IP")
-        client_ip = request.client.host
-
-    try:
-        is_trusted = SecurityHelper().is_ip_trusted(client_ip)
-    except Exception:
-        is_trusted = False
+    client_ip = ip_ranges.get_client_ip(request)
+    if client_ip is None:
+        raise HTTPException(status_code=400, detail="Could not determine client IP")
 
-    if not is_trusted:
+    if client_ip not in ip_ranges.trusted_networks.yookassa:
         raise HTTPException(status_code=403, detail="Forbidden: Untrusted IP source")
@@ -56,6 +56,14 @@ class ProductNotFoundError(HTTPException):
         super().__init__(status_code=404, detail=f"Товар с ID={product_id} не найден")
 
 
+class AutoPricedProductError(HTTPException):
+    def __init__(self, product_id: int) -> None:
+        super().__init__(
+            status_code=409,
+            detail=f"Цена товара с ID={product_id} рассчитывается по составу, задать ее вручную нельзя",
+        )
+
+
 class ImageNotFoundError(HTTPException):
     def __init__(self, image_id: int) -> None:
         super().__init__(status_code=404, detail=f"Изображение с ID={image_id} не найдено")
@@ -77,6 +85,14 @@ class CartItemNotFoundError(HTTPException):
         super().__init__(status_code=404, detail=f"Товар корзины с ID={cart_item_id} не найден")
 
 
+class CartItemQuantityLimitError(HTTPException):
+    def __init__(self, product_id: int, limit: int) -> None:
+        super().__init__(
+            status_code=400,
+            detail=f"Количество товара с ID={product_id} в корзине не может быть больше {limit}",
+        )
+
+
 class UserCartMissingError(HTTPException):
     def __init__(self, user_id: int) -> None:
         super().__init__(status_code=404, detail="У пользователя нет корзины")
@@ -180,3 +196,22 @@ class PaymentCreationError(HTTPException):
             status_code=502,
             detail=f"Ошибка создания платежа для заказа с ID={order_id}",
         )
+
+
+class InvalidDateRangeError(HTTPException):
+    def __init__(self) -> None:
+        super().__init__(status_code=400, detail="Начало периода должно быть раньше его окончания")
+
+
+class RateLimitExceededError(HTTPException):
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(
+            status_code=429,
+            detail="Слишком много запросов, попробуйте позже",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class NotModifiedError(HTTPException):
+    def __init__(self, headers: dict[str, str]) -> None:
+        super().__init__(status_code=304, headers=headers)
@@ -1,7 +1,9 @@
 from fastapi import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.core.http_cache import CachedResponseHit
+
 
 def sqlalchemy_exception_handler(_request: Request, _exc: Exception) -> JSONResponse:
     if isinstance(_exc, SQLAlchemyError):
@@ -11,3 +13,11 @@ def sqlalchemy_exception_handler(_request: Request, _exc: Exception) -> JSONResp
 
 def unhandled_exception_handler(_request: Request, _exc: Exception) -> JSONResponse:
     return JSONResponse(status_code=500, content={"detail": "Internal server error"})
+
+
+def cached_response_handler(_request: Request, _exc: Exception) -> Response:
+    if not isinstance(_exc, CachedResponseHit):
+        return JSONResponse(status_code=500, content={"detail": "Internal server error"})
+    response = Response(content=_exc.entry.body)
+    response.raw_headers = list(_exc.entry.headers)
+    return response
@@ -0,0 +1,108 @@
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+from redis.exceptions import RedisError
+
+from app.db.replica import replica_engine
+
+from .catalog_version import get_catalog_version
+from .compression_middleware import RESPONSE_CACHE_SCOPE_KEY, CachedBody, negotiate_encoding, response_cache
+from .config import settings
+from .exceptions import NotModifiedError
+from .logger import get_logger
+from .responses import DEFERRED_HEADERS_SCOPE_KEY
+
+logger = get_logger(__name__)
+
+
+class CachedResponseHit(Exception):  # noqa: N818
+    """Прерывает обработку запроса: готовый ответ найден в response_cache."""
+
+    def __init__(self, entry: CachedBody) -> None:
+        self.entry = entry
+
+
+def catalog_cache(policy: str) -> Callable[[Request, Response], Awaitable[None]]:
+    """
+    Зависимость условного GET для публичных эндпоинтов каталога.
+
+    ETag и Last-Modified берутся из версии каталога в Redis, поэтому совпавший
+    If-None-Match (или If-Modified-Since без него) отвечает 304 до запросов к БД.
+    Cache-Control задается по имени группы из HTTP_CACHE_POLICIES. Если тело ответа
+    с тем же ETag и кодировкой уже есть в response_cache, оно отдается сразу, иначе
+    ключ оставляется в scope, и CompressionMiddleware сохранит готовое тело.
+
+    Эндпоинты каталога читают с реплики, а версия увеличивается после фиксации на основном
+    сервере. Пока реплика может не догнать последнее изменение, ответ отдается без ETag
+    и не сохраняется: иначе старые данные закрепились бы под новой версией до следующего изменения.
+
+    Args:
+        policy: имя группы эндпоинтов в HTTP_CACHE_POLICIES
+
+    Returns:
+        Зависимость для параметра dependencies декоратора роутера
+    """
+
+    async def dependency(request: Request, response: Response) -> None:
+        cache_control = settings.HTTP_CACHE_POLICIES.get(policy, settings.HTTP_CACHE_DEFAULT_POLICY)
+        try:
+            catalog = await get_catalog_version()
+        except RedisError as exc:
+            logger.warning("catalog_version_unavailable", policy=policy, exc_info=exc)
+            return
+
+        if _replica_may_lag(catalog.modified_at):
+            request.scope.setdefault(DEFERRED_HEADERS_SCOPE_KEY, {})["Cache-Control"] = "no-cache"
+            response.headers["Cache-Control"] = "no-cache"
+            return
+
+        last_modified = datetime.fromtimestamp(catalog.modified_at, tz=UTC)
+        headers = {
+            "ETag": f'W/"{catalog.version}"',
+            "Last-Modified": format_datetime(last_modified, usegmt=True),
+            "Cache-Control": cache_control,
+        }
+        if _is_not_modified(request, etag=headers["ETag"], last_modified=last_modified):
+            raise NotModifiedError(headers=headers)
+
+        cache_key = (request.url.path, request.url.query, headers["ETag"])
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+        entry = response_cache.get((*cache_key, encoding or "identity"))
+        if entry is not None:
+            raise CachedResponseHit(entry)
+        request.scope[RESPONSE_CACHE_SCOPE_KEY] = cache_key
+        request.scope.setdefault(DEFERRED_HEADERS_SCOPE_KEY, {}).update(headers)
+        response.headers.update(headers)
+
+    return dependency
+
+
+def _replica_may_lag(modified_at: int) -> bool:
+    # Реплика используется, пока отставание не больше REPLICA_MAX_LAG_SECONDS на момент проверки;
+    # между проверками оно может вырасти еще на интервал проверки. modified_at округлен до секунды.
+    if replica_engine is None:
+        return False
+    window = settings.REPLICA_MAX_LAG_SECONDS + settings.REPLICA_LAG_CHECK_INTERVAL + 1
+    return time.time() - modified_at < window
+
+
+def _is_not_modified(request: Request, *, etag: str, last_modified: datetime) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Слабое сравнение (RFC 9110 13.1.2): префикс W/ не учитывается
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    return last_modified <= since
@@ -0,0 +1,131 @@
+from bisect import bisect_right
+from collections.abc import Iterable
+from ipaddress import ip_address, ip_network
+
+from fastapi import Request
+
+from .config import Settings, settings
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class IPRangeSet:
+    """
+    Набор IP-диапазонов для быстрой проверки вхождения адреса.
+
+    Сети переводятся в отсортированные непересекающиеся интервалы целых чисел
+    отдельно для IPv4 и IPv6, проверка — двоичный поиск по началам интервалов.
+    """
+
+    __slots__ = ("_ends", "_starts")
+
+    def __init__(self, networks: Iterable[str]) -> None:
+        intervals: dict[int, list[tuple[int, int]]] = {4: [], 6: []}
+        for network in networks:
+            parsed = ip_network(network.strip(), strict=False)
+            intervals[parsed.version].append((int(parsed.network_address), int(parsed.broadcast_address)))
+
+        self._starts: dict[int, list[int]] = {}
+        self._ends: dict[int, list[int]] = {}
+        for version, items in intervals.items():
+            starts: list[int] = []
+            ends: list[int] = []
+            for start, end in sorted(items):
+                if ends and start <= ends[-1] + 1:
+                    ends[-1] = max(ends[-1], end)
+                else:
+                    starts.append(start)
+                    ends.append(end)
+            self._starts[version] = starts
+            self._ends[version] = ends
+
+    def __contains__(self, address: str) -> bool:
+        try:
+            parsed = ip_address(address)
+        except ValueError:
+            return False
+        if parsed.version == 6 and parsed.ipv4_mapped is not None:
+            parsed = parsed.ipv4_mapped
+        value = int(parsed)
+        starts = self._starts[parsed.version]
+        index = bisect_right(starts, value) - 1
+        return index >= 0 and value <= self._ends[parsed.version][index]
+
+
+class TrustedNetworks:
+    """
+    Доверенные прокси и адреса ЮKassa.
+
+    Наборы хранятся в одном кортеже и заменяются одним присваиванием, поэтому
+    запрос никогда не видит новые прокси вместе со старыми адресами ЮKassa.
+    """
+
+    __slots__ = ("_sets",)
+
+    def __init__(self, config: Settings) -> None:
+        self._sets = self._build(config)
+
+    @property
+    def proxies(self) -> IPRangeSet:
+        return self._sets[0]
+
+    @property
+    def yookassa(self) -> IPRangeSet:
+        return self._sets[1]
+
+    def reload(self, config: Settings) -> None:
+        # Наборы строятся до замены: ошибка в новой конфигурации оставляет прежние
+        self._sets = self._build(config)
+
+    @staticmethod
+    def _build(config: Settings) -> tuple[IPRangeSet, IPRangeSet]:
+        return IPRangeSet(config.TRUSTED_PROXIES), IPRangeSet(config.YOOKASSA_TRUSTED_IPS)
+
+
+trusted_networks = TrustedNetworks(settings)
+
+
+def reload_ip_ranges() -> None:
+    """
+    Перечитывает TRUSTED_PROXIES и YOOKASSA_TRUSTED_IPS из окружения и .env и заменяет наборы.
+
+    Вызывается по SIGHUP. При некорректной конфигурации ошибка логируется, прежние наборы остаются.
+    """
+    try:
+        trusted_networks.reload(Settings())  # type: ignore
+    except ValueError as exc:
+        logger.exception("ip_ranges_reload_failed", exc_info=exc)
+        return
+    logger.info("ip_ranges_reloaded")
+
+
+def get_client_ip(request: Request) -> str | None:
+    """
+    Определяет IP клиента с учетом доверенных прокси.
+
+    X-Forwarded-For учитывается только если запрос пришел от доверенного прокси.
+    Заголовок читается справа налево, пропуская доверенные прокси, поэтому
+    подставленные клиентом значения в начале заголовка игнорируются.
+
+    Args:
+        request: объект запроса FastAPI
+
+    Returns:
+        IP клиента или None, если его не удалось определить
+    """
+    if request.client is None:
+        return None
+    client_ip = request.client.host
+    proxies = trusted_networks.proxies
+    if client_ip not in proxies:
+        return client_ip
+
+    forwarded = request.headers.get("x-forwarded-for")
+    if not forwarded:
+        return client_ip
+    for hop in reversed(forwarded.split(",")):
+        address = hop.strip()
+        if address and address not in proxies:
+            return address
+    return client_ip
@@ -1,17 +1,68 @@
-from typing import Any, cast
+import functools
+import inspect
+import math
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, ParamSpec, TypeVar
 
 from fastapi import Request
-from limits.storage import RedisStorage
-from slowapi import Limiter
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
 
+from app.core import ip_ranges
 from app.core.config import settings
+from app.core.exceptions import RateLimitExceededError
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Скользящее окно из двух фиксированных окон: счетчик прошлого окна учитывается
+# с весом оставшейся доли текущего. ARGV[3] — запросы, уже пропущенные локально
+# и еще не учтенные в Redis: они записываются без проверки, проверяется только текущий.
+_SLIDING_WINDOW_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local pending = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local window = math.floor(now / period)
+local current_key = KEYS[1] .. ':' .. window
+local previous = tonumber(redis.call('GET', KEYS[1] .. ':' .. (window - 1)) or '0')
+local current = tonumber(redis.call('GET', current_key) or '0') + pending
+local elapsed = (now % period) / period
+local weighted = previous * (1 - elapsed) + current
+local allowed = 0
+local retry_after = 0
+if weighted + 1 <= limit then
+    allowed = 1
+    current = current + 1
+    weighted = weighted + 1
+elseif previous > 0 and limit - current - 1 >= 0 then
+    retry_after = math.ceil((1 - (limit - current - 1) / previous) * period - (now % period))
+else
+    retry_after = period - (now % period)
+end
+local increment = pending + allowed
+if increment > 0 then
+    redis.call('INCRBY', current_key, increment)
+    redis.call('PEXPIRE', current_key, period * 2)
+end
+return {allowed, math.ceil(weighted), retry_after}
+"""
 
 
 def real_ip(request: Request) -> str:
     """Extract real client IP for rate limiting.
 
     Only trusts X-Forwarded-For header if request comes from a trusted proxy.
-    If TRUSTED_PROXIES is empty, always uses request.client.host (safe default).
+    By default only a proxy on localhost is trusted; otherwise request.client.host is used.
 
     Args:
         request: FastAPI request object
@@ -19,37 +70,129 @@ def real_ip(request: Request) -> str:
     Returns:
         Client IP address string
     """
-    # Safe default: if no trusted proxies configured, use direct client IP
-    if not settings.TRUSTED_PROXIES:
-        if request.client:
-            return request.client.host
-        return "unknown"
+    return ip_ranges.get_client_ip(request) or "unknown"
 
-    # Only trust X-Forwarded-For if request comes from a known proxy
-    if request.client and request.client.host in settings.TRUSTED_PROXIES:
-        forwarded = request.headers.get("x-forwarded-for")
-        if forwarded:
-            return forwarded.split(",")[0].strip()
 
-    # Fallback to direct client IP
-    if request.client:
-        return request.client.host
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    """Лимит вида "N/период", например "10/minute"."""
 
-    return "unknown"
+    amount: int
+    period: int  # seconds
 
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        amount, _, period = value.partition("/")
+        return cls(amount=int(amount), period=_PERIODS[period.strip().rstrip("s")])
 
-_storage: RedisStorage | None = None
 
-limiter = Limiter(key_func=real_ip, default_limits=["60/minute"])
+@dataclass(slots=True)
+class _LocalWindow:
+    """Локальное состояние ключа в процессе: последний известный счетчик Redis и непереданные запросы."""
 
+    synced_at: float
+    known: int
+    pending: int = 0
 
-def init_limiter() -> None:
-    global _storage
 
-    _storage = RedisStorage(
-        settings.REDIS_URL,
-        socket_timeout=2,
-        socket_connect_timeout=2,
-    )
+class Limiter:
+    """
+    Ограничитель частоты запросов на Redis.
+
+    Каждая проверка в Redis — один вызов Lua-скрипта скользящего окна. Пока по
+    последним данным Redis ключ заметно ниже лимита (RATE_LIMIT_LOCAL_FRACTION),
+    запросы пропускаются локально и передаются в Redis пачкой при следующей
+    синхронизации, не реже раза в RATE_LIMIT_SYNC_INTERVAL секунд.
+    """
 
-    cast(Any, limiter).storage = _storage
+    def __init__(self, key_func: Callable[[Request], str]) -> None:
+        self._key_func = key_func
+        self._script: AsyncScript | None = None
+        self._local: dict[str, _LocalWindow] = {}
+
+    def init(self, redis: Redis) -> None:
+        """Регистрирует Lua-скрипт на клиенте Redis."""
+        self._script = redis.register_script(_SLIDING_WINDOW_SCRIPT)
+        self._local.clear()
+
+    def limit(self, value: str) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+        """
+        Декоратор эндпоинта, ограничивающий частоту запросов с одного IP.
+
+        Ставится под декоратором роутера; эндпоинт должен принимать параметр request.
+        """
+        rate = RateLimit.parse(value)
+
+        def decorator(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+            if "request" not in inspect.signature(func).parameters:
+                raise TypeError(f"{func.__qualname__} must accept a 'request: Request' parameter to be rate limited")
+            scope = f"{func.__module__}.{func.__qualname__}"
+
+            @functools.wraps(func)
+            async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+                request = kwargs["request"]
+                await self.hit(scope=scope, key=self._key_func(request), rate=rate)
+                return await func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    async def hit(self, *, scope: str, key: str, rate: RateLimit) -> None:
+        """
+        Учитывает запрос и проверяет лимит.
+
+        Raises:
+            RateLimitExceededError: если лимит превышен
+        """
+        redis_key = f"rl:{{{scope}:{key}}}:{rate.amount}/{rate.period}"
+        now = time.monotonic()
+        local = self._local.get(redis_key)
+        if (
+            local is not None
+            and now - local.synced_at < settings.RATE_LIMIT_SYNC_INTERVAL
+            and local.known + local.pending + 1 <= rate.amount * settings.RATE_LIMIT_LOCAL_FRACTION
+        ):
+            local.pending += 1
+            return
+
+        pending = local.pending if local is not None else 0
+        try:
+            allowed, count, retry_after_ms = await self._eval(redis_key=redis_key, rate=rate, pending=pending)
+        except RedisError as exc:
+            logger.warning("rate_limit_backend_unavailable", scope=scope, exc_info=exc)
+            if settings.RATE_LIMIT_FAIL_OPEN:
+                return
+            raise RateLimitExceededError(retry_after=1) from exc
+
+        if local is not None and self._local.get(redis_key) is local:
+            # Запросы, пропущенные локально во время обращения к Redis, передаются при следующей синхронизации
+            local.pending -= pending
+            local.synced_at = now
+            local.known = count
+        else:
+            self._remember(redis_key, _LocalWindow(synced_at=now, known=count))
+        if not allowed:
+            raise RateLimitExceededError(retry_after=max(1, math.ceil(retry_after_ms / 1000)))
+
+    async def _eval(self, *, redis_key: str, rate: RateLimit, pending: int) -> tuple[int, int, int]:
+        if self._script is None:
+            raise RedisError("Limiter is not initialized. Call init() first.")
+        result: Any = await self._script(keys=[redis_key], args=[rate.amount, rate.period * 1000, pending])
+        return int(result[0]), int(result[1]), int(result[2])
+
+    def _remember(self, redis_key: str, window: _LocalWindow) -> None:
+        if len(self._local) >= settings.RATE_LIMIT_LOCAL_MAX_KEYS:
+            # Непереданные запросы устаревших ключей теряются — это не больше доли лимита за интервал синхронизации
+            expired_before = window.synced_at - settings.RATE_LIMIT_SYNC_INTERVAL
+            self._local = {k: v for k, v in self._local.items() if v.synced_at >= expired_before}
+            if len(self._local) >= settings.RATE_LIMIT_LOCAL_MAX_KEYS:
+                self._local.clear()
+        self._local[redis_key] = window
+
+
+limiter = Limiter(key_func=real_ip)
+
+
+def init_limiter(redis: Redis) -> None:
+    limiter.init(redis)
@@ -0,0 +1,97 @@
+import asyncio
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Таймаут одного чтения из pub/sub; должен быть задан явно, иначе действует REDIS_SOCKET_TIMEOUT
+LISTEN_TIMEOUT = 30.0
+
+
+class PubSubDispatcher:
+    """
+    Один pub/sub на процесс: подписка по шаблонам и раздача сообщений ожидающим корутинам.
+
+    Ожидающие регистрируют future по имени канала через listen(); задача-слушатель
+    читает сообщения одного соединения Redis и завершает все future этого канала.
+    Тысячи ожидающих клиентов стоят одно соединение и не требуют опроса.
+    """
+
+    def __init__(self) -> None:
+        self._pubsub: PubSub | None = None
+        self._task: asyncio.Task | None = None
+        self._waiters: dict[str, set[asyncio.Future[str]]] = {}
+
+    async def start(self, redis: Redis, patterns: Sequence[str]) -> None:
+        """Подписывается на шаблоны каналов и запускает задачу-слушателя."""
+        pubsub = redis.pubsub(ignore_subscribe_messages=True)
+        await pubsub.psubscribe(*patterns)
+        self._pubsub = pubsub
+        self._task = asyncio.create_task(self._listen(pubsub))
+
+    async def stop(self) -> None:
+        """Останавливает слушателя, закрывает подписку и отменяет ожидающие future."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        for futures in self._waiters.values():
+            for future in futures:
+                future.cancel()
+        self._waiters.clear()
+
+    @contextmanager
+    def listen(self, channel: str) -> Iterator[asyncio.Future[str]]:
+        """
+        Регистрирует ожидание сообщения в канале.
+
+        Future регистрируется при входе в with, поэтому состояние, которое может
+        измениться публикацией, нужно проверять уже внутри блока — иначе сообщение
+        между проверкой и регистрацией будет потеряно.
+
+        Args:
+            channel: имя канала, попадающее под один из шаблонов подписки
+
+        Yields:
+            asyncio.Future[str]: future с данными первого сообщения канала
+        """
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(channel, set()).add(future)
+        try:
+            yield future
+        finally:
+            futures = self._waiters.get(channel)
+            if futures is not None:
+                futures.discard(future)
+                if not futures:
+                    del self._waiters[channel]
+
+    async def _listen(self, pubsub: PubSub) -> None:
+        while True:
+            try:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=LISTEN_TIMEOUT)
+            except asyncio.CancelledError:
+                break
+            except Exception as exc:
+                logger.exception("pubsub_listen_failed", exc_info=exc)
+                await asyncio.sleep(1)
+                continue
+            if message is None or message["type"] != "pmessage":
+                continue
+            self._dispatch(message["channel"], message["data"])
+
+    def _dispatch(self, channel: str, data: str) -> None:
+        for future in self._waiters.pop(channel, ()):
+            if not future.done():
+                future.set_result(data)
+
+
+pubsub_dispatcher = PubSubDispatcher()
@@ -0,0 +1,47 @@
+import time
+from http.cookies import SimpleCookie
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.db.replica import READ_YOUR_WRITES_COOKIE, READ_YOUR_WRITES_HEADER, replica_engine
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ReadYourWritesMiddleware:
+    """
+    После успешного изменяющего запроса открывает окно чтения с основного сервера.
+
+    Cookie и заголовок содержат unix time окончания окна READ_YOUR_WRITES_WINDOW;
+    пока оно не истекло, get_read_db не отправляет запросы клиента на реплику,
+    и клиент видит свои изменения, даже если реплика еще не догнала основной сервер.
+    Без настроенной реплики middleware ничего не делает.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if replica_engine is None or scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = str(int(time.time()) + settings.READ_YOUR_WRITES_WINDOW)
+                cookie: SimpleCookie = SimpleCookie()
+                cookie[READ_YOUR_WRITES_COOKIE] = until
+                morsel = cookie[READ_YOUR_WRITES_COOKIE]
+                morsel["max-age"] = settings.READ_YOUR_WRITES_WINDOW
+                morsel["path"] = "/"
+                morsel["httponly"] = True
+                morsel["samesite"] = settings.COOKIE_SAMESITE
+                morsel["secure"] = settings.COOKIE_SECURE
+                headers = MutableHeaders(scope=message)
+                headers.append("Set-Cookie", morsel.OutputString())
+                headers[READ_YOUR_WRITES_HEADER] = until
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
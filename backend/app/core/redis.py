@@ -1,29 +1,81 @@
-from redis.asyncio import ConnectionPool, Redis
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.asyncio.client import Pipeline
 
 from .config import settings
 
 
 class RedisManager:
-    """Класс для работы с Redis."""
+    """Класс для работы с Redis: один пул и один клиент на процесс."""
 
     def __init__(self):
-        self.pool: ConnectionPool | None = None
+        self.pool: BlockingConnectionPool | None = None
+        self.client: Redis | None = None
 
     async def init_pool(self) -> None:
-        """Инициализация пула."""
-        self.pool = ConnectionPool.from_url(f"{settings.REDIS_URL}", max_connections=10, decode_responses=True)
+        """Инициализация пула и общего клиента."""
+        self.pool = BlockingConnectionPool.from_url(
+            f"{settings.REDIS_URL}",
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_POOL_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+            decode_responses=True,
+        )
+        self.client = Redis(connection_pool=self.pool)
 
     async def close_pool(self) -> None:
-        """Закрытие пула."""
+        """Закрытие клиента и пула."""
+        if self.client:
+            await self.client.aclose()
+            self.client = None
         if self.pool:
             await self.pool.disconnect()
             self.pool = None
 
     def get_client(self) -> Redis:
-        """Создаение клиента из существующего пула."""
-        if self.pool is None:
+        """Возвращает общий клиент поверх пула."""
+        if self.client is None:
             raise RuntimeError("Redis pool is not initialized. Call init_pool() first.")
-        return Redis(connection_pool=self.pool)
+        return self.client
+
+    @asynccontextmanager
+    async def pipeline(self, *, transaction: bool = False) -> AsyncIterator[Pipeline]:
+        """
+        Пайплайн общего клиента: команды копятся и отправляются одним обращением при execute().
+
+        Args:
+            transaction: обернуть команды в MULTI/EXEC
+        """
+        async with self.get_client().pipeline(transaction=transaction) as pipe:
+            yield pipe
+
+    async def health(self) -> dict[str, Any]:
+        """
+        Возвращает задержку PING и состояние пула соединений.
+
+        Returns:
+            Словарь с полями ping_ms, max_connections, in_use, available
+        """
+        started = time.perf_counter()
+        await self.get_client().ping()  # type: ignore[misc]
+        ping_ms = (time.perf_counter() - started) * 1000
+        return {"ping_ms": round(ping_ms, 2), **self.pool_stats()}
+
+    def pool_stats(self) -> dict[str, int]:
+        """Статистика пула: лимит соединений, занятые и свободные соединения."""
+        if self.pool is None:
+            return {"max_connections": 0, "in_use": 0, "available": 0}
+        return {
+            "max_connections": self.pool.max_connections,
+            "in_use": len(getattr(self.pool, "_in_use_connections", ())),
+            "available": len(getattr(self.pool, "_available_connections", ())),
+        }
 
 
 redis_manager = RedisManager()
@@ -0,0 +1,60 @@
+from collections.abc import Mapping, Sequence
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from starlette.background import BackgroundTask
+from starlette.types import Receive, Scope, Send
+
+# Ключ в ASGI scope с заголовками, которые зависимости оставляют для ответов, возвращаемых эндпоинтом напрямую
+DEFERRED_HEADERS_SCOPE_KEY = "deferred_response_headers"
+
+
+def _default(value: Any) -> Any:
+    # Decimal отдается строкой, как и при сериализации Pydantic в режиме json
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON-ответ на orjson; класс ответа по умолчанию для всего приложения."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ModelResponse(JSONResponse):
+    """
+    Ответ из готовых Pydantic-моделей, сериализуемых напрямую в JSON-байты.
+
+    Эндпоинт, возвращающий ModelResponse, минует повторную валидацию по response_model,
+    построение промежуточного словаря и json.dumps. response_model в декораторе
+    остается только для схемы OpenAPI, поэтому возвращаемая модель должна ей соответствовать.
+    """
+
+    def __init__(
+        self,
+        content: BaseModel | Sequence[BaseModel],
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        background: BackgroundTask | None = None,
+    ) -> None:
+        super().__init__(content, status_code=status_code, headers=headers, background=background)
+
+    def render(self, content: BaseModel | Sequence[BaseModel]) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return b"[" + b",".join(item.__pydantic_serializer__.to_json(item) for item in content) + b"]"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # FastAPI не переносит заголовки, выставленные зависимостями, на возвращенный напрямую Response
+        deferred: Mapping[str, str] = scope.get(DEFERRED_HEADERS_SCOPE_KEY, {})
+        for name, value in deferred.items():
+            if name not in self.headers:
+                self.headers[name] = value
+        await super().__call__(scope, receive, send)
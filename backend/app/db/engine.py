@@ -0,0 +1,46 @@
+from uuid import uuid4
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+
+
+def create_engine(url: str) -> AsyncEngine:
+    """
+    Создает движок asyncpg с настройками кэшей запросов из конфигурации.
+
+    DB_PREPARED_STATEMENT_CACHE_SIZE — кэш подготовленных запросов asyncpg на соединение,
+    DB_QUERY_CACHE_SIZE — кэш скомпилированных запросов SQLAlchemy. При DB_PGBOUNCER
+    (pgbouncer в режиме transaction) подготовленные запросы не кэшируются и получают
+    уникальные имена, а пулом управляет pgbouncer.
+
+    Args:
+        url: адрес базы данных
+
+    Returns:
+        AsyncEngine: движок SQLAlchemy
+    """
+    if settings.DB_PGBOUNCER:
+        return create_async_engine(
+            make_url(url).update_query_dict({"prepared_statement_cache_size": "0"}),
+            echo=False,
+            poolclass=NullPool,
+            query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+            connect_args={
+                "statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            },
+        )
+    return create_async_engine(
+        make_url(url).update_query_dict(
+            {"prepared_statement_cache_size": str(settings.DB_PREPARED_STATEMENT_CACHE_SIZE)}
+        ),
+        echo=False,
+        pool_size=20,
+        max_overflow=10,
+        pool_pre_ping=True,
+        pool_recycle=3600,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+    )
@@ -0,0 +1,81 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import ConnectionPoolEntry, PoolProxiedConnection
+
+from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Маршрут текущего запроса, которому приписывается время удержания соединений
+current_route: ContextVar[str | None] = ContextVar("current_route", default=None)
+
+_CHECKOUT_AT = "checked_out_at"
+_CHECKOUT_ROUTE = "checked_out_route"
+
+
+@dataclass(slots=True)
+class ConnectionHoldStats:
+    """Время удержания соединений пула одним маршрутом."""
+
+    checkouts: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "avg_ms": round(self.total_ms / self.checkouts, 2) if self.checkouts else 0.0,
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+_hold_stats: dict[str, ConnectionHoldStats] = {}
+
+
+def register_pool_metrics(engine: Engine) -> None:
+    """Подключает учет времени удержания соединений к пулу движка (sync_engine для AsyncEngine)."""
+    if event.contains(engine, "checkout", _on_checkout):
+        return
+    event.listen(engine, "checkout", _on_checkout)
+    event.listen(engine, "checkin", _on_checkin)
+
+
+def get_connection_hold_stats(limit: int = 20) -> dict[str, dict[str, Any]]:
+    """
+    Возвращает маршруты с наибольшим суммарным временем удержания соединений.
+
+    Args:
+        limit: количество маршрутов в ответе
+
+    Returns:
+        Словарь маршрут -> количество выдач соединения, среднее и максимальное время удержания
+    """
+    top = sorted(_hold_stats.items(), key=lambda item: item[1].total_ms, reverse=True)[:limit]
+    return {route: stats.as_dict() for route, stats in top}
+
+
+def _on_checkout(
+    _dbapi_connection: Any, connection_record: ConnectionPoolEntry, _connection_proxy: PoolProxiedConnection
+) -> None:
+    connection_record.info[_CHECKOUT_AT] = time.perf_counter()
+    connection_record.info[_CHECKOUT_ROUTE] = current_route.get() or "background"
+
+
+def _on_checkin(_dbapi_connection: Any, connection_record: ConnectionPoolEntry) -> None:
+    checked_out_at = connection_record.info.pop(_CHECKOUT_AT, None)
+    route = connection_record.info.pop(_CHECKOUT_ROUTE, "background")
+    if checked_out_at is None:
+        return
+    held_ms = (time.perf_counter() - checked_out_at) * 1000
+    stats = _hold_stats.setdefault(route, ConnectionHoldStats())
+    stats.checkouts += 1
+    stats.total_ms += held_ms
+    stats.max_ms = max(stats.max_ms, held_ms)
+    if held_ms >= settings.DB_CONNECTION_HOLD_WARN_MS:
+        logger.warning("db_connection_held_long", route=route, held_ms=round(held_ms, 2))
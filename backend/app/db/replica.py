@@ -0,0 +1,99 @@
+import asyncio
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.db.engine import create_engine
+
+logger = get_logger(__name__)
+
+READ_YOUR_WRITES_COOKIE = "rw_until"
+# Заголовок для клиентов без cookie: значение — unix time, до которого читать с основного сервера
+READ_YOUR_WRITES_HEADER = "x-read-your-writes-until"
+
+# Если реплика применила все полученное WAL, отставания нет, даже если основной сервер давно не писал
+_REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+replica_engine: AsyncEngine | None = (
+    create_engine(str(settings.SQLALCHEMY_REPLICA_URI)) if settings.SQLALCHEMY_REPLICA_URI is not None else None
+)
+
+
+@dataclass(slots=True)
+class ReplicaState:
+    """Последний результат проверки реплики."""
+
+    healthy: bool = False
+    lag_seconds: float | None = None
+    checked_at: float | None = None
+
+
+replica_state = ReplicaState()
+
+
+def replica_available() -> bool:
+    """Реплика настроена, отвечает и отстает не больше REPLICA_MAX_LAG_SECONDS."""
+    return replica_engine is not None and replica_state.healthy
+
+
+def is_read_your_writes_pending(cookie: str | None, header: str | None) -> bool:
+    """Проверяет, не истекло ли окно чтения своих записей, переданное в cookie или заголовке."""
+    now = time.time()
+    for value in (cookie, header):
+        if not value:
+            continue
+        try:
+            if float(value) > now:
+                return True
+        except ValueError:
+            continue
+    return False
+
+
+async def check_replica_lag() -> ReplicaState:
+    """
+    Измеряет отставание реплики и обновляет replica_state.
+
+    Returns:
+        ReplicaState: состояние реплики после проверки
+    """
+    if replica_engine is None:
+        return replica_state
+    try:
+        async with replica_engine.connect() as conn:
+            lag = float((await conn.execute(_REPLICA_LAG_QUERY)).scalar_one())
+    except Exception as exc:
+        if replica_state.healthy:
+            logger.warning("replica_unavailable", exc_info=exc)
+        replica_state.healthy = False
+        replica_state.lag_seconds = None
+    else:
+        healthy = lag <= settings.REPLICA_MAX_LAG_SECONDS
+        if healthy != replica_state.healthy:
+            logger.info("replica_state_changed", healthy=healthy, lag_seconds=round(lag, 3))
+        replica_state.healthy = healthy
+        replica_state.lag_seconds = lag
+    replica_state.checked_at = time.time()
+    return replica_state
+
+
+async def run_replica_monitor() -> None:
+    """Периодически проверяет отставание реплики до отмены задачи."""
+    while True:
+        try:
+            await check_replica_lag()
+            await asyncio.sleep(settings.REPLICA_LAG_CHECK_INTERVAL)
+        except asyncio.CancelledError:
+            break
@@ -1,18 +1,27 @@
-from collections.abc import AsyncGenerator
+import asyncio
+from collections.abc import AsyncGenerator, Awaitable, Callable
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
 
 from app.core.config import settings
-
-engine = create_async_engine(
-    str(settings.SQLALCHEMY_DATABASE_URI),
-    echo=False,
-    pool_size=20,
-    max_overflow=10,
-    pool_pre_ping=True,
-    pool_recycle=3600,
+from app.core.logger import get_logger
+from app.db.engine import create_engine
+from app.db.metrics import current_route, register_pool_metrics
+from app.db.replica import (
+    READ_YOUR_WRITES_COOKIE,
+    READ_YOUR_WRITES_HEADER,
+    is_read_your_writes_pending,
+    replica_available,
+    replica_engine,
 )
 
+logger = get_logger(__name__)
+
+engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -20,12 +29,111 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+ReadSessionLocal = async_sessionmaker(
+    replica_engine or engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+
+register_pool_metrics(engine.sync_engine)
+if replica_engine is not None:
+    register_pool_metrics(replica_engine.sync_engine)
+
+_HAS_WRITES = "has_writes"
+_AFTER_COMMIT = "after_commit_callbacks"
+_background_tasks: set[asyncio.Task] = set()
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flushed(session: Session, _flush_context: UOWTransaction) -> None:
+    session.info[_HAS_WRITES] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dml(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info[_HAS_WRITES] = True
+
+
+def has_writes(session: AsyncSession) -> bool:
+    """Были ли в сессии изменения: flush, DML-запросы или еще не сброшенные объекты."""
+    return bool(session.info.get(_HAS_WRITES) or session.new or session.dirty or session.deleted)
+
+
+def call_after_commit(session: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+    """
+    Выполняет callback после фиксации транзакции сессии; при откате он отбрасывается.
 
-async def get_db() -> AsyncGenerator[AsyncSession]:
+    Для действий вне базы данных — сброса кэша и уведомлений: выполненные до фиксации,
+    они позволяют параллельному запросу прочитать и сохранить еще старые данные.
+    """
+    session.info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    callbacks = session.info.pop(_AFTER_COMMIT, None)
+    if not callbacks:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    for callback in callbacks:
+        task = loop.create_task(_run_callback(callback))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_commit(session: Session) -> None:
+    session.info.pop(_AFTER_COMMIT, None)
+
+
+async def _run_callback(callback: Callable[[], Awaitable[None]]) -> None:
+    try:
+        await callback()
+    except Exception as exc:
+        logger.warning("after_commit_callback_failed", exc_info=exc)
+
+
+def _bind_route(request: Request) -> None:
+    route = request.scope.get("route")
+    current_route.set(f"{request.method} {getattr(route, 'path', request.url.path)}")
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession]:
+    """
+    Сессия основного сервера на время запроса.
+
+    Соединение берется из пула только при первом запросе к БД, а фиксация выполняется,
+    только если в сессии что-то менялось: иначе соединение возвращается в пул без COMMIT.
+    """
+    _bind_route(request)
     async with AsyncSessionLocal() as session:
         try:
             yield session
-            await session.commit()
+            if has_writes(session):
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession]:
+    """
+    Сессия только для чтения: реплика, если она доступна и клиент не ждет своих недавних изменений.
+
+    Иначе — основной сервер. Сессия никогда не фиксируется.
+    """
+    _bind_route(request)
+    use_replica = replica_available() and not is_read_your_writes_pending(
+        request.cookies.get(READ_YOUR_WRITES_COOKIE), request.headers.get(READ_YOUR_WRITES_HEADER)
+    )
+    session_factory = ReadSessionLocal if use_replica else AsyncSessionLocal
+    async with session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.rollback()
@@ -0,0 +1,16 @@
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import ColumnElement, any_, literal
+from sqlalchemy.dialects.postgresql import ARRAY
+
+
+def any_of(column: ColumnElement[Any], values: Sequence[Any]) -> ColumnElement[bool]:
+    """
+    Условие column = ANY(:array) вместо column IN (...).
+
+    Список передается одним параметром-массивом, поэтому текст запроса не зависит
+    от длины списка: asyncpg переиспользует подготовленный запрос, а SQLAlchemy —
+    скомпилированный. Подходит для колонок скалярных типов (int, str).
+    """
+    return column == any_(literal(list(values), ARRAY(column.type)))
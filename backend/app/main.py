@@ -1,19 +1,23 @@
 import asyncio
+import os
 import re
+import signal
+import socket
 from contextlib import asynccontextmanager
+from typing import Any
 
 from fastapi import APIRouter, Depends, FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.security import APIKeyHeader
 from fastapi.staticfiles import StaticFiles
 from fastapi_pagination import add_pagination
 from scalar_fastapi import get_scalar_api_reference
-from slowapi import _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 from starlette.middleware.cors import CORSMiddleware
 from starlette_csrf.middleware import CSRFMiddleware
 
+from app.api.v1.analytics_router import analytics_router
 from app.api.v1.auth_router import auth_router
 from app.api.v1.banners_router import banner_router
 from app.api.v1.carts_router import cart_router
@@ -21,19 +25,31 @@ from app.api.v1.categories_router import category_router
 from app.api.v1.discounts_router import discount_router
 from app.api.v1.favourites_router import favourite_router
 from app.api.v1.flowers_router import flower_router
+from app.api.v1.inventory_router import inventory_router
 from app.api.v1.orders_router import order_router
 from app.api.v1.pickups_router import pickup_point_router
+from app.api.v1.pricing_router import pricing_router
 from app.api.v1.products_router import product_router
 from app.api.v1.users_router import user_router
+from app.core import ip_ranges
+from app.core.catalog_version import register_catalog_listeners
+from app.core.compression_middleware import CompressionMiddleware
 from app.core.config import settings
-from app.core.handlers import sqlalchemy_exception_handler, unhandled_exception_handler
-from app.core.limiter import init_limiter, limiter
+from app.core.handlers import cached_response_handler, sqlalchemy_exception_handler, unhandled_exception_handler
+from app.core.http_cache import CachedResponseHit
+from app.core.limiter import init_limiter
 from app.core.logger import get_logger, setup_logging
 from app.core.logging_middleware import LoggingMiddleware
+from app.core.pubsub import pubsub_dispatcher
+from app.core.read_your_writes_middleware import ReadYourWritesMiddleware
 from app.core.redis import get_redis, redis_manager
+from app.core.responses import ORJSONResponse
 from app.core.security_headers_middleware import SecurityHeadersMiddleware
+from app.db.metrics import get_connection_hold_stats
+from app.db.replica import READ_YOUR_WRITES_HEADER, check_replica_lag, replica_engine, run_replica_monitor
 from app.db.session import AsyncSessionLocal, engine
 from app.repository import auth_repository
+from app.service import webhooks_service
 
 setup_logging()
 logger = get_logger(__name__)
@@ -55,20 +71,20 @@ async def lifespan(app: FastAPI):
 
     try:
         await redis_manager.init_pool()
-        redis = get_redis()
-        await redis.ping()  # type: ignore[misc]
-        await redis.aclose()
+        await get_redis().ping()  # type: ignore[misc]
         logger.info("redis_connected", url=settings.REDIS_URL.split("@")[-1])
     except Exception as exc:
         logger.exception("redis_connection_failed", exc_info=exc)
         raise
     try:
-        init_limiter()
-        app.state.limiter = limiter
+        init_limiter(get_redis())
         logger.info("limiter_started", url=settings.REDIS_URL.split("@")[-1])
     except Exception as exc:
         logger.exception("limiter_failed", exc_info=exc)
         raise
+    register_catalog_listeners()
+    await pubsub_dispatcher.start(get_redis(), patterns=["reset:*", "order:*"])
+    logger.info("pubsub_dispatcher_started")
 
     async def _cleanup_expired_tokens():
         while True:
@@ -88,16 +104,56 @@ async def lifespan(app: FastAPI):
 
     cleanup_task = asyncio.create_task(_cleanup_expired_tokens())
 
+    replica_task = None
+    if replica_engine is not None:
+        state = await check_replica_lag()
+        logger.info("replica_configured", healthy=state.healthy, lag_seconds=state.lag_seconds)
+        replica_task = asyncio.create_task(run_replica_monitor())
+
+    webhook_redis = get_redis()
+    await webhooks_service.ensure_consumer_group(redis=webhook_redis)
+    webhook_tasks = [
+        asyncio.create_task(
+            webhooks_service.run_consumer(
+                redis=webhook_redis, consumer_name=f"{socket.gethostname()}-{os.getpid()}-{i}"
+            )
+        )
+        for i in range(settings.WEBHOOK_CONSUMERS)
+    ]
+    logger.info("webhook_consumers_started", consumers=settings.WEBHOOK_CONSUMERS)
+
+    # SIGHUP перечитывает доверенные прокси и адреса ЮKassa без перезапуска
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGHUP, ip_ranges.reload_ip_ranges)
+    except (AttributeError, NotImplementedError):
+        logger.warning("ip_ranges_reload_signal_unavailable")
+
     yield
 
+    try:
+        loop.remove_signal_handler(signal.SIGHUP)
+    except (AttributeError, NotImplementedError):
+        pass
+
     cleanup_task.cancel()
     try:
         await cleanup_task
     except asyncio.CancelledError:
         pass
 
+    for task in webhook_tasks:
+        task.cancel()
+    await asyncio.gather(*webhook_tasks, return_exceptions=True)
+
+    await pubsub_dispatcher.stop()
+
     logger.info("application_shutdown")
     await redis_manager.close_pool()
+    if replica_task is not None:
+        replica_task.cancel()
+        await asyncio.gather(replica_task, return_exceptions=True)
+        await replica_engine.dispose()
     await engine.dispose()
 
 
@@ -112,10 +168,47 @@ app = FastAPI(
         {"name": "pickup_points", "description": "Точки самовывоза"},
     ],
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     swagger_ui_parameters={"defaultModelsExpandDepth": -1},
 )
 
 
+@app.get("/health", include_in_schema=False)
+async def health() -> JSONResponse:
+    """Проверка доступности базы данных и Redis с метриками пула Redis."""
+    checks: dict[str, Any] = {}
+    healthy = True
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        checks["database"] = {
+            "status": "ok",
+            "pool": engine.pool.status(),
+            "connection_hold": get_connection_hold_stats(),
+        }
+    except Exception as exc:
+        healthy = False
+        checks["database"] = {"status": "error"}
+        logger.exception("health_database_failed", exc_info=exc)
+    try:
+        checks["redis"] = {"status": "ok", **await redis_manager.health()}
+    except Exception as exc:
+        healthy = False
+        checks["redis"] = {"status": "error", **redis_manager.pool_stats()}
+        logger.exception("health_redis_failed", exc_info=exc)
+    if replica_engine is not None:
+        # Отставшая реплика не делает сервис неработоспособным: чтение уходит на основной сервер
+        state = await check_replica_lag()
+        checks["replica"] = {
+            "status": "ok" if state.healthy else "degraded",
+            "lag_seconds": state.lag_seconds,
+        }
+    return JSONResponse(
+        status_code=200 if healthy else 503,
+        content={"status": "ok" if healthy else "error", "checks": checks},
+    )
+
+
 @app.get("/scalar", include_in_schema=False)
 async def scalar_html():
     return get_scalar_api_reference(
@@ -126,16 +219,14 @@ async def scalar_html():
     )
 
 
-app.add_exception_handler(
-    RateLimitExceeded,
-    _rate_limit_exceeded_handler,  # type: ignore
-)
-
 app.add_exception_handler(SQLAlchemyError, sqlalchemy_exception_handler)
+app.add_exception_handler(CachedResponseHit, cached_response_handler)
 app.add_exception_handler(Exception, unhandled_exception_handler)
 
 csrf_header_scheme = APIKeyHeader(name=settings.CSRF_HEADER_NAME, auto_error=False)
 
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
 app.add_middleware(LoggingMiddleware)
 app.add_middleware(SecurityHeadersMiddleware)
 
@@ -166,7 +257,8 @@ app.add_middleware(
     allow_origins=settings.all_cors_origins,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE"],
-    allow_headers=["Content-Type", "Authorization", settings.CSRF_HEADER_NAME],
+    allow_headers=["Content-Type", "Authorization", settings.CSRF_HEADER_NAME, READ_YOUR_WRITES_HEADER],
+    expose_headers=[READ_YOUR_WRITES_HEADER],
 )
 
 api_router = APIRouter(prefix=settings.API_V1_STR)
@@ -181,6 +273,9 @@ api_router.include_router(discount_router)
 api_router.include_router(pickup_point_router)
 api_router.include_router(flower_router)
 api_router.include_router(banner_router)
+api_router.include_router(analytics_router)
+api_router.include_router(inventory_router)
+api_router.include_router(pricing_router)
 app.include_router(api_router, dependencies=[Depends(csrf_header_scheme)])
 
 
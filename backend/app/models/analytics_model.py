@@ -0,0 +1,43 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import DECIMAL, Date, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class SalesDailyProduct(Base):
+    """Дневные продажи по товарам."""
+
+    __tablename__ = "sales_daily_product"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    product_id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    revenue: Mapped[Decimal] = mapped_column(DECIMAL(precision=12, scale=2), default=0)
+    units: Mapped[int] = mapped_column(Integer, default=0)
+    orders_count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class SalesDailyCategory(Base):
+    """Дневные продажи по категориям."""
+
+    __tablename__ = "sales_daily_category"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    category_id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    revenue: Mapped[Decimal] = mapped_column(DECIMAL(precision=12, scale=2), default=0)
+    units: Mapped[int] = mapped_column(Integer, default=0)
+    orders_count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class SalesDailyPickupPoint(Base):
+    """Дневные продажи по точкам самовывоза."""
+
+    __tablename__ = "sales_daily_pickup_point"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    pickup_point_id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    revenue: Mapped[Decimal] = mapped_column(DECIMAL(precision=12, scale=2), default=0)
+    units: Mapped[int] = mapped_column(Integer, default=0)
+    orders_count: Mapped[int] = mapped_column(Integer, default=0)
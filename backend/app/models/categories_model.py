@@ -6,6 +6,7 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
@@ -34,6 +35,8 @@ product_category = Table(
         ForeignKey("category.id", ondelete="CASCADE"),
         primary_key=True,
     ),
+    # Первичный ключ (product_id, category_id) не помогает искать товары по категории
+    Index("ix_product_category_category_id_product_id", "category_id", "product_id"),
 )
 
 
@@ -67,3 +70,14 @@ class Category(Base):
         back_populates="children",
     )
     children: Mapped[list["Category"]] = relationship("Category", back_populates="parent", cascade="all, delete-orphan")
+
+
+class CategoryClosure(Base):
+    """Замыкание дерева категорий: все пары предок-потомок, включая пару категории с собой (depth=0)."""
+
+    __tablename__ = "category_closure"
+    __table_args__ = (Index("ix_category_closure_descendant_id_depth", "descendant_id", "depth"),)
+
+    ancestor_id: Mapped[int] = mapped_column(ForeignKey("category.id", ondelete="CASCADE"), primary_key=True)
+    descendant_id: Mapped[int] = mapped_column(ForeignKey("category.id", ondelete="CASCADE"), primary_key=True)
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -8,10 +8,12 @@ from typing import TYPE_CHECKING
 from sqlalchemy import (
     DECIMAL,
     Boolean,
+    CheckConstraint,
     Column,
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
@@ -44,6 +46,8 @@ bouquet_composition = Table(
         primary_key=True,
     ),
     Column("quantity", Integer, nullable=False, default=1),
+    # Поиск букетов по цветку при пересчете доступности
+    Index("ix_bouquet_composition_flower_id_product_id", "flower_id", "product_id"),
 )
 
 
@@ -56,6 +60,12 @@ class Product(Base):
     """Сущность товара."""
 
     __tablename__ = "product"
+    __table_args__ = (
+        CheckConstraint(
+            "stock_quantity IS NULL OR stock_quantity >= 0",
+            name="ck_product_stock_quantity_non_negative",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     type: Mapped[ProductType] = mapped_column(
@@ -74,6 +84,13 @@ class Product(Base):
     color: Mapped[str | None] = mapped_column(String(64))
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, index=True)
     in_stock: Mapped[bool] = mapped_column(Boolean, default=True, index=True)
+    # NULL — остаток не учитывается, доступность определяет только in_stock
+    stock_quantity: Mapped[int | None] = mapped_column(Integer)
+    # Цену рассчитывает pricing_service по стоимости состава букета
+    auto_price: Mapped[bool] = mapped_column(Boolean, default=False, server_default="false")
+    # Снят с продажи пересчетом доступности букетов (кончились цветы), а не администратором:
+    # такой букет пересчет возвращает в продажу, когда его снова есть из чего собрать
+    auto_closed: Mapped[bool] = mapped_column(Boolean, default=False, server_default="false")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -108,10 +125,18 @@ class Flower(Base):
     """Сущность цветка-ингредиента для состава букета."""
 
     __tablename__ = "flower"
+    __table_args__ = (
+        CheckConstraint(
+            "stock_quantity IS NULL OR stock_quantity >= 0",
+            name="ck_flower_stock_quantity_non_negative",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
     price: Mapped[Decimal] = mapped_column(DECIMAL(precision=10, scale=2))
+    # NULL — остаток не учитывается и не ограничивает сборку букетов
+    stock_quantity: Mapped[int | None] = mapped_column(Integer)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -0,0 +1,160 @@
+from collections.abc import Sequence
+from datetime import date
+
+from sqlalchemy import (
+    ColumnElement,
+    Date,
+    Select,
+    cast,
+    delete,
+    distinct,
+    func,
+    literal,
+    select,
+)
+from sqlalchemy.dialects.postgresql import Insert, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.analytics_model import SalesDailyCategory, SalesDailyPickupPoint, SalesDailyProduct
+from app.models.categories_model import product_category
+from app.models.orders_model import Order, OrderItem, Status
+
+RollupModel = type[SalesDailyProduct] | type[SalesDailyCategory] | type[SalesDailyPickupPoint]
+
+
+async def apply_order(*, session: AsyncSession, order_id: int, sign: int, timezone: str) -> None:
+    """Добавляет (sign=1) или вычитает (sign=-1) оплаченный заказ из дневных агрегатов."""
+    conditions = [Order.id == order_id, Order.paid_at.is_not(None)]
+    await _upsert_increment(
+        session=session, model=SalesDailyProduct, rows=_product_rows(timezone, conditions, sign)
+    )
+    await _upsert_increment(
+        session=session, model=SalesDailyCategory, rows=_category_rows(timezone, conditions, sign)
+    )
+    await _upsert_increment(
+        session=session, model=SalesDailyPickupPoint, rows=_pickup_point_rows(timezone, conditions, sign)
+    )
+
+
+async def rebuild(*, session: AsyncSession, date_from: date, date_to: date, timezone: str) -> None:
+    """Пересчитывает дневные агрегаты за период [date_from, date_to] по оплаченным заказам."""
+    day = _paid_day(timezone)
+    conditions = [
+        Order.paid_at.is_not(None),
+        Order.status != Status.CANCELLED,
+        day >= date_from,
+        day <= date_to,
+    ]
+    for model, rows in (
+        (SalesDailyProduct, _product_rows(timezone, conditions, 1)),
+        (SalesDailyCategory, _category_rows(timezone, conditions, 1)),
+        (SalesDailyPickupPoint, _pickup_point_rows(timezone, conditions, 1)),
+    ):
+        await session.execute(delete(model).where(model.day >= date_from, model.day <= date_to))
+        await session.execute(_insert_from(model, rows))
+
+
+async def get_product_sales(
+    *, session: AsyncSession, date_from: date, date_to: date, product_id: int | None = None
+) -> Sequence[SalesDailyProduct]:
+    statement = (
+        select(SalesDailyProduct)
+        .where(SalesDailyProduct.day >= date_from, SalesDailyProduct.day <= date_to)
+        .order_by(SalesDailyProduct.day, SalesDailyProduct.product_id)
+    )
+    if product_id is not None:
+        statement = statement.where(SalesDailyProduct.product_id == product_id)
+    result = await session.execute(statement)
+    return result.scalars().all()
+
+
+async def get_category_sales(
+    *, session: AsyncSession, date_from: date, date_to: date, category_id: int | None = None
+) -> Sequence[SalesDailyCategory]:
+    statement = (
+        select(SalesDailyCategory)
+        .where(SalesDailyCategory.day >= date_from, SalesDailyCategory.day <= date_to)
+        .order_by(SalesDailyCategory.day, SalesDailyCategory.category_id)
+    )
+    if category_id is not None:
+        statement = statement.where(SalesDailyCategory.category_id == category_id)
+    result = await session.execute(statement)
+    return result.scalars().all()
+
+
+async def get_pickup_point_sales(
+    *, session: AsyncSession, date_from: date, date_to: date, pickup_point_id: int | None = None
+) -> Sequence[SalesDailyPickupPoint]:
+    statement = (
+        select(SalesDailyPickupPoint)
+        .where(SalesDailyPickupPoint.day >= date_from, SalesDailyPickupPoint.day <= date_to)
+        .order_by(SalesDailyPickupPoint.day, SalesDailyPickupPoint.pickup_point_id)
+    )
+    if pickup_point_id is not None:
+        statement = statement.where(SalesDailyPickupPoint.pickup_point_id == pickup_point_id)
+    result = await session.execute(statement)
+    return result.scalars().all()
+
+
+def _paid_day(timezone: str) -> ColumnElement[date]:
+    return cast(func.timezone(timezone, Order.paid_at), Date)
+
+
+def _aggregates(sign: int) -> tuple[ColumnElement, ...]:
+    return (
+        (func.sum(OrderItem.price * OrderItem.quantity) * literal(sign)).label("revenue"),
+        (func.sum(OrderItem.quantity) * literal(sign)).label("units"),
+        (func.count(distinct(Order.id)) * literal(sign)).label("orders_count"),
+    )
+
+
+def _product_rows(timezone: str, conditions: Sequence[ColumnElement[bool]], sign: int) -> Select:
+    day = _paid_day(timezone).label("day")
+    return (
+        select(day, OrderItem.product_id, *_aggregates(sign))
+        .select_from(Order)
+        .join(OrderItem, OrderItem.order_id == Order.id)
+        .where(*conditions)
+        .group_by(day, OrderItem.product_id)
+    )
+
+
+def _category_rows(timezone: str, conditions: Sequence[ColumnElement[bool]], sign: int) -> Select:
+    day = _paid_day(timezone).label("day")
+    return (
+        select(day, product_category.c.category_id, *_aggregates(sign))
+        .select_from(Order)
+        .join(OrderItem, OrderItem.order_id == Order.id)
+        .join(product_category, product_category.c.product_id == OrderItem.product_id)
+        .where(*conditions)
+        .group_by(day, product_category.c.category_id)
+    )
+
+
+def _pickup_point_rows(timezone: str, conditions: Sequence[ColumnElement[bool]], sign: int) -> Select:
+    day = _paid_day(timezone).label("day")
+    return (
+        select(day, Order.pickup_point_id, *_aggregates(sign))
+        .select_from(Order)
+        .join(OrderItem, OrderItem.order_id == Order.id)
+        .where(*conditions, Order.pickup_point_id.is_not(None))
+        .group_by(day, Order.pickup_point_id)
+    )
+
+
+def _insert_from(model: RollupModel, rows: Select) -> Insert:
+    columns = [column.name for column in model.__table__.columns]
+    return insert(model).from_select(columns, rows)
+
+
+async def _upsert_increment(*, session: AsyncSession, model: RollupModel, rows: Select) -> None:
+    statement = _insert_from(model, rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=[column.name for column in model.__table__.primary_key.columns],
+        set_={
+            "revenue": model.revenue + statement.excluded.revenue,
+            "units": model.units + statement.excluded.units,
+            "orders_count": model.orders_count + statement.excluded.orders_count,
+        },
+    )
+    await session.execute(statement)
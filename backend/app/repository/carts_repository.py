@@ -1,10 +1,16 @@
+from collections.abc import Sequence
 from decimal import Decimal
 
-from sqlalchemy import delete, select
+from sqlalchemy import Row, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.db.sql import any_of
 from app.models.carts_model import Cart, CartItem
+from app.models.categories_model import product_category
+from app.models.products_model import Product, ProductImage
+from app.schemas.carts_schema import MAX_CART_ITEM_QUANTITY
 
 
 async def create_cart(*, session: AsyncSession, user_id: int) -> Cart:
@@ -24,9 +30,51 @@ async def get_cart_by_user_id(*, session: AsyncSession, user_id: int) -> Cart |
     return result.scalar_one_or_none()
 
 
-async def get_cart_by_id(*, session: AsyncSession, cart_id: int) -> Cart | None:
+async def get_cart_details_by_user_id(*, session: AsyncSession, user_id: int) -> Sequence[Row]:
+    image_url = (
+        select(ProductImage.url)
+        .where(ProductImage.product_id == Product.id)
+        .order_by(ProductImage.sort_order, ProductImage.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    category_ids = (
+        select(func.array_agg(product_category.c.category_id))
+        .where(product_category.c.product_id == Product.id)
+        .scalar_subquery()
+    )
+    statement = (
+        select(
+            Cart.id.label("cart_id"),
+            Cart.user_id,
+            CartItem.id.label("item_id"),
+            CartItem.product_id,
+            CartItem.quantity,
+            Product.name,
+            Product.price,
+            Product.in_stock,
+            Product.is_active,
+            image_url.label("image_url"),
+            category_ids.label("category_ids"),
+        )
+        .select_from(Cart)
+        .outerjoin(CartItem, CartItem.cart_id == Cart.id)
+        .outerjoin(Product, Product.id == CartItem.product_id)
+        .where(Cart.user_id == user_id)
+        .order_by(CartItem.id)
+    )
+    result = await session.execute(statement)
+    return result.all()
+
+
+async def get_cart_by_id(
+    *, session: AsyncSession, cart_id: int, populate_existing: bool = False
+) -> Cart | None:
     statement = (
-        select(Cart).options(selectinload(Cart.cart_item)).where(Cart.id == cart_id)
+        select(Cart)
+        .options(selectinload(Cart.cart_item))
+        .where(Cart.id == cart_id)
+        .execution_options(populate_existing=populate_existing)
     )
     cart = await session.execute(statement)
     return cart.scalar_one_or_none()
@@ -69,6 +117,18 @@ async def get_cart_item(
     return cart_item.scalar_one_or_none()
 
 
+async def get_cart_item_for_update(
+    *, session: AsyncSession, cart_id: int, product_id: int
+) -> CartItem | None:
+    statement = (
+        select(CartItem)
+        .where(CartItem.cart_id == cart_id, CartItem.product_id == product_id)
+        .with_for_update()
+    )
+    result = await session.execute(statement)
+    return result.scalar_one_or_none()
+
+
 async def get_cart_item_by_id(
     *, session: AsyncSession, cart_item_id: int
 ) -> CartItem | None:
@@ -100,3 +160,45 @@ async def delete_cart_item(*, session: AsyncSession, cart_item_id: int) -> bool:
     )
     result = await session.execute(statement)
     return result.scalar_one_or_none() is not None
+
+
+async def upsert_cart_items(
+    *,
+    session: AsyncSession,
+    cart_id: int,
+    items: Sequence[tuple[int, int, Decimal]],
+    increment: bool,
+) -> None:
+    if not items:
+        return
+    statement = insert(CartItem).values(
+        [
+            {"cart_id": cart_id, "product_id": product_id, "quantity": quantity, "price": price}
+            for product_id, quantity, price in items
+        ]
+    )
+    # add прибавляет к количеству (не больше предела схемы) и сохраняет цену, как одиночное добавление
+    if increment:
+        set_ = {
+            "quantity": func.least(CartItem.quantity + statement.excluded.quantity, MAX_CART_ITEM_QUANTITY),
+            "updated_at": func.now(),
+        }
+    else:
+        set_ = {
+            "quantity": statement.excluded.quantity,
+            "price": statement.excluded.price,
+            "updated_at": func.now(),
+        }
+    statement = statement.on_conflict_do_update(constraint="uq_cart_product", set_=set_)
+    await session.execute(statement)
+
+
+async def delete_cart_items_by_product_ids(
+    *, session: AsyncSession, cart_id: int, product_ids: Sequence[int]
+) -> None:
+    if not product_ids:
+        return
+    statement = delete(CartItem).where(
+        CartItem.cart_id == cart_id, any_of(CartItem.product_id, product_ids)
+    )
+    await session.execute(statement)
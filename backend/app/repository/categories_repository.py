@@ -1,10 +1,10 @@
 from collections.abc import Sequence
 
-from sqlalchemy import Select, delete, select, update
+from sqlalchemy import Select, delete, exists, func, insert, literal, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 
-from app.models.categories_model import Category
+from app.models.categories_model import Category, CategoryClosure
 from app.schemas.categories_schema import CategoryCreate, CategoryUpdate
 
 
@@ -52,28 +52,94 @@ async def get_all_active_categories(
     return result.scalars().all()
 
 
-async def get_root_categories(session: AsyncSession, only_active: bool = True) -> Sequence[Category]:
-    statement = select(Category).where(Category.parent_id.is_(None))
+def get_subtree_ids_query(*, category_id: int) -> Select[tuple[int]]:
+    # Потомок исключается, если он сам или любой его предок ниже category_id не активен
+    path = aliased(CategoryClosure)
+    inactive_on_path = (
+        exists()
+        .where(
+            path.descendant_id == CategoryClosure.descendant_id,
+            path.depth < CategoryClosure.depth,
+            Category.id == path.ancestor_id,
+            Category.is_active.is_(False),
+        )
+    )
+    return select(CategoryClosure.descendant_id).where(CategoryClosure.ancestor_id == category_id, ~inactive_on_path)
 
-    if only_active:
-        statement = statement.where(Category.is_active)
 
-    statement = statement.order_by(Category.sort_order, Category.id).options(selectinload(Category.children))
+async def is_descendant(*, session: AsyncSession, ancestor_id: int, descendant_id: int) -> bool:
+    statement = select(
+        exists().where(CategoryClosure.ancestor_id == ancestor_id, CategoryClosure.descendant_id == descendant_id)
+    )
+    result = await session.execute(statement)
+    return result.scalar_one()
+
 
+async def get_categories_for_tree(*, session: AsyncSession, only_active: bool = True) -> Sequence[Category]:
+    statement = select(Category).order_by(Category.sort_order, Category.id)
+    if only_active:
+        statement = statement.where(Category.is_active)
     result = await session.execute(statement)
     return result.scalars().all()
 
 
-async def get_children(session: AsyncSession, parent_id: int, only_active: bool = True) -> Sequence[Category]:
-    statement = select(Category).where(Category.parent_id == parent_id)
+async def add_closure(*, session: AsyncSession, category_id: int, parent_id: int | None) -> None:
+    await session.execute(insert(CategoryClosure).values(ancestor_id=category_id, descendant_id=category_id, depth=0))
+    if parent_id is None:
+        return
+    ancestors = select(
+        CategoryClosure.ancestor_id, literal(category_id), CategoryClosure.depth + 1
+    ).where(CategoryClosure.descendant_id == parent_id)
+    await session.execute(
+        insert(CategoryClosure).from_select(["ancestor_id", "descendant_id", "depth"], ancestors)
+    )
 
-    if only_active:
-        statement = statement.where(Category.is_active)
 
-    statement = statement.order_by(Category.sort_order, Category.id)
+async def move_closure(*, session: AsyncSession, category_id: int, parent_id: int | None) -> None:
+    subtree = select(CategoryClosure.descendant_id).where(CategoryClosure.ancestor_id == category_id)
+    # Пути от внешних предков к поддереву: удаляются все, внутренние пути поддерева сохраняются
+    await session.execute(
+        delete(CategoryClosure).where(
+            CategoryClosure.descendant_id.in_(subtree),
+            CategoryClosure.ancestor_id.not_in(subtree),
+        )
+    )
+    if parent_id is None:
+        return
+    above = aliased(CategoryClosure)
+    below = aliased(CategoryClosure)
+    paths = (
+        select(above.ancestor_id, below.descendant_id, above.depth + below.depth + 1)
+        .where(above.descendant_id == parent_id, below.ancestor_id == category_id)
+    )
+    await session.execute(insert(CategoryClosure).from_select(["ancestor_id", "descendant_id", "depth"], paths))
 
-    result = await session.execute(statement)
-    return result.scalars().all()
+
+def _expected_closure_query() -> Select[tuple[int, int, int]]:
+    tree = select(
+        Category.id.label("ancestor_id"), Category.id.label("descendant_id"), literal(0).label("depth")
+    ).cte("tree", recursive=True)
+    child = aliased(Category)
+    tree = tree.union(
+        select(tree.c.ancestor_id, child.id, tree.c.depth + 1).where(child.parent_id == tree.c.descendant_id)
+    )
+    return select(tree.c.ancestor_id, tree.c.descendant_id, tree.c.depth)
+
+
+async def rebuild_closure(*, session: AsyncSession) -> int:
+    await session.execute(delete(CategoryClosure))
+    result = await session.execute(
+        insert(CategoryClosure).from_select(["ancestor_id", "descendant_id", "depth"], _expected_closure_query())
+    )
+    return result.rowcount
+
+
+async def count_closure_mismatches(*, session: AsyncSession) -> tuple[int, int]:
+    expected = _expected_closure_query()
+    actual = select(CategoryClosure.ancestor_id, CategoryClosure.descendant_id, CategoryClosure.depth)
+    missing = select(func.count()).select_from(expected.except_(actual).subquery())
+    extra = select(func.count()).select_from(actual.except_(expected).subquery())
+    return (await session.execute(missing)).scalar_one(), (await session.execute(extra)).scalar_one()
 
 
 def get_categories_query() -> Select[tuple[Category]]:
@@ -3,6 +3,7 @@ from collections.abc import Sequence
 from sqlalchemy import Select, delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.sql import any_of
 from app.models.discounts_model import Discount
 from app.schemas.discounts_schema import DiscountCreate, DiscountUpdate
 
@@ -46,7 +47,7 @@ async def get_active_for_category_ids(*, session: AsyncSession, category_ids: Se
     if not category_ids:
         return []
     statement = select(Discount).where(
-        Discount.category_id.in_(category_ids),
+        any_of(Discount.category_id, category_ids),
         Discount.is_active.is_(True),
     )
     result = await session.execute(statement)
@@ -57,7 +58,7 @@ async def get_active_for_products(*, session: AsyncSession, product_ids: Sequenc
     if not product_ids:
         return []
     statement = select(Discount).where(
-        Discount.product_id.in_(product_ids),
+        any_of(Discount.product_id, product_ids),
         Discount.is_active.is_(True),
     )
     result = await session.execute(statement)
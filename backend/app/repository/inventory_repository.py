@@ -0,0 +1,324 @@
+from collections.abc import Mapping, Sequence
+
+from sqlalchemy import Integer, Row, Select, and_, column, func, literal, or_, select, update, values
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.expression import Subquery, Values
+
+from app.db.sql import any_of
+from app.models.categories_model import product_category
+from app.models.orders_model import OrderItem
+from app.models.pickups_model import PickupPointStock
+from app.models.products_model import Flower, Product, bouquet_composition
+
+
+def _stock_values(items: Sequence[tuple[int, int]], key_column: str, value_column: str) -> Values:
+    return values(column(key_column, Integer), column(value_column, Integer), name="stock").data(list(items))
+
+
+def _bouquet_capacity_query() -> Select:
+    # Сколько букетов можно собрать из остатков цветов; цветы без учета остатка не ограничивают сборку
+    return (
+        select(
+            bouquet_composition.c.product_id,
+            func.min(Flower.stock_quantity // bouquet_composition.c.quantity).label("capacity"),
+        )
+        .join(Flower, Flower.id == bouquet_composition.c.flower_id)
+        .where(Flower.stock_quantity.is_not(None))
+        .group_by(bouquet_composition.c.product_id)
+    )
+
+
+def _order_flowers_query(*, order_id: int) -> Subquery:
+    return (
+        select(
+            bouquet_composition.c.flower_id,
+            func.sum(bouquet_composition.c.quantity * OrderItem.quantity).label("quantity"),
+        )
+        .join(OrderItem, OrderItem.product_id == bouquet_composition.c.product_id)
+        .where(OrderItem.order_id == order_id)
+        .group_by(bouquet_composition.c.flower_id)
+        .subquery("used")
+    )
+
+
+async def get_existing_product_ids(*, session: AsyncSession, product_ids: Sequence[int]) -> Sequence[int]:
+    result = await session.execute(select(Product.id).where(any_of(Product.id, product_ids)))
+    return result.scalars().all()
+
+
+async def set_product_stock(*, session: AsyncSession, items: Sequence[tuple[int, int]]) -> Sequence[int]:
+    stock = _stock_values(items, "product_id", "quantity")
+    statement = (
+        update(Product)
+        .where(Product.id == stock.c.product_id)
+        .values(stock_quantity=stock.c.quantity, in_stock=stock.c.quantity > 0, auto_closed=False)
+        .returning(Product.id)
+    )
+    result = await session.execute(statement)
+    return result.scalars().all()
+
+
+async def adjust_product_stock(*, session: AsyncSession, items: Sequence[tuple[int, int]]) -> Sequence[int]:
+    stock = _stock_values(items, "product_id", "delta")
+    quantity = func.coalesce(Product.stock_quantity, 0) + stock.c.delta
+    statement = (
+        update(Product)
+        .where(Product.id == stock.c.product_id)
+        .values(stock_quantity=func.greatest(quantity, 0), in_stock=quantity > 0, auto_closed=False)
+        .returning(Product.id)
+    )
+    result = await session.execute(statement)
+    return result.scalars().all()
+
+
+async def set_pickup_point_stock(
+    *, session: AsyncSession, pickup_point_id: int, items: Sequence[tuple[int, int]]
+) -> None:
+    statement = insert(PickupPointStock).values(
+        [
+            {"pickup_point_id": pickup_point_id, "product_id": product_id, "quantity": quantity}
+            for product_id, quantity in items
+        ]
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[PickupPointStock.pickup_point_id, PickupPointStock.product_id],
+        set_={"quantity": statement.excluded.quantity, "updated_at": func.now()},
+    )
+    await session.execute(statement)
+
+
+async def adjust_pickup_point_stock(
+    *, session: AsyncSession, pickup_point_id: int, items: Sequence[tuple[int, int]]
+) -> None:
+    stock = _stock_values(items, "product_id", "delta")
+    statement = (
+        update(PickupPointStock)
+        .where(
+            PickupPointStock.pickup_point_id == pickup_point_id,
+            PickupPointStock.product_id == stock.c.product_id,
+        )
+        .values(quantity=func.greatest(PickupPointStock.quantity + stock.c.delta, 0))
+        .returning(PickupPointStock.product_id)
+    )
+    result = await session.execute(statement)
+    adjusted = set(result.scalars().all())
+
+    missing = [(product_id, delta) for product_id, delta in items if product_id not in adjusted]
+    if missing:
+        await session.execute(
+            insert(PickupPointStock)
+            .values(
+                [
+                    {"pickup_point_id": pickup_point_id, "product_id": product_id, "quantity": max(delta, 0)}
+                    for product_id, delta in missing
+                ]
+            )
+            .on_conflict_do_nothing()
+        )
+
+
+async def get_order_availability(
+    *, session: AsyncSession, quantities: Mapping[int, int], pickup_point_id: int | None
+) -> Sequence[Row]:
+    product_ids = list(quantities)
+    requested = (
+        func.unnest(
+            literal(product_ids, ARRAY(Integer)),
+            literal([quantities[product_id] for product_id in product_ids], ARRAY(Integer)),
+        )
+        .table_valued("product_id", "quantity")
+        .render_derived(name="requested")
+    )
+    category_ids = (
+        select(func.array_agg(product_category.c.category_id))
+        .where(product_category.c.product_id == Product.id)
+        .scalar_subquery()
+    )
+    capacity = (
+        select(func.min(Flower.stock_quantity // bouquet_composition.c.quantity))
+        .select_from(bouquet_composition.join(Flower, Flower.id == bouquet_composition.c.flower_id))
+        .where(bouquet_composition.c.product_id == Product.id, Flower.stock_quantity.is_not(None))
+        .scalar_subquery()
+    )
+    conditions = [
+        Product.is_active,
+        Product.in_stock,
+        or_(Product.stock_quantity.is_(None), Product.stock_quantity >= requested.c.quantity),
+        or_(capacity.is_(None), capacity >= requested.c.quantity),
+    ]
+    statement = select(
+        Product.id,
+        Product.price,
+        Product.in_stock,
+        Product.is_active,
+        category_ids.label("category_ids"),
+    ).join(requested, requested.c.product_id == Product.id)
+    if pickup_point_id is not None:
+        # Нет строки остатка на точке — остаток на ней не учитывается
+        statement = statement.outerjoin(
+            PickupPointStock,
+            and_(
+                PickupPointStock.product_id == Product.id,
+                PickupPointStock.pickup_point_id == pickup_point_id,
+            ),
+        )
+        conditions.append(
+            or_(PickupPointStock.quantity.is_(None), PickupPointStock.quantity >= requested.c.quantity)
+        )
+    statement = statement.add_columns(and_(*conditions).label("available"))
+    result = await session.execute(statement)
+    return result.all()
+
+
+async def decrement_stock_for_order(
+    *, session: AsyncSession, order_id: int, pickup_point_id: int | None
+) -> Sequence[int]:
+    ordered = (
+        select(OrderItem.product_id, OrderItem.quantity).where(OrderItem.order_id == order_id).subquery("ordered")
+    )
+    statement = (
+        update(Product)
+        .where(Product.id == ordered.c.product_id, Product.stock_quantity.is_not(None))
+        .values(
+            stock_quantity=func.greatest(Product.stock_quantity - ordered.c.quantity, 0),
+            in_stock=and_(Product.in_stock, Product.stock_quantity > ordered.c.quantity),
+        )
+        .returning(Product.id, Product.in_stock)
+    )
+    result = await session.execute(statement)
+    sold_out = [row.id for row in result if not row.in_stock]
+
+    if pickup_point_id is not None:
+        await session.execute(
+            update(PickupPointStock)
+            .where(
+                PickupPointStock.pickup_point_id == pickup_point_id,
+                PickupPointStock.product_id == ordered.c.product_id,
+            )
+            .values(quantity=func.greatest(PickupPointStock.quantity - ordered.c.quantity, 0))
+        )
+    return sold_out
+
+
+async def restore_stock_for_order(
+    *, session: AsyncSession, order_id: int, pickup_point_id: int | None
+) -> Sequence[int]:
+    ordered = (
+        select(OrderItem.product_id, OrderItem.quantity).where(OrderItem.order_id == order_id).subquery("ordered")
+    )
+    # Снова в продаже только товары, закончившиеся по остатку; закрытые вручную при остатке остаются закрытыми,
+    # а снятые из-за цветов букеты открывает пересчет доступности после возврата цветов
+    statement = (
+        update(Product)
+        .where(Product.id == ordered.c.product_id, Product.stock_quantity.is_not(None))
+        .values(
+            stock_quantity=Product.stock_quantity + ordered.c.quantity,
+            in_stock=or_(Product.in_stock, and_(Product.stock_quantity == 0, ~Product.auto_closed)),
+        )
+        .returning(Product.id)
+    )
+    result = await session.execute(statement)
+    restored = result.scalars().all()
+
+    if pickup_point_id is not None:
+        await session.execute(
+            update(PickupPointStock)
+            .where(
+                PickupPointStock.pickup_point_id == pickup_point_id,
+                PickupPointStock.product_id == ordered.c.product_id,
+            )
+            .values(quantity=PickupPointStock.quantity + ordered.c.quantity)
+        )
+    return restored
+
+
+async def set_flower_stock(*, session: AsyncSession, items: Sequence[tuple[int, int]]) -> Sequence[int]:
+    stock = _stock_values(items, "flower_id", "quantity")
+    statement = (
+        update(Flower)
+        .where(Flower.id == stock.c.flower_id)
+        .values(stock_quantity=stock.c.quantity)
+        .returning(Flower.id)
+    )
+    result = await session.execute(statement)
+    return result.scalars().all()
+
+
+async def adjust_flower_stock(*, session: AsyncSession, items: Sequence[tuple[int, int]]) -> Sequence[int]:
+    stock = _stock_values(items, "flower_id", "delta")
+    statement = (
+        update(Flower)
+        .where(Flower.id == stock.c.flower_id)
+        .values(stock_quantity=func.greatest(func.coalesce(Flower.stock_quantity, 0) + stock.c.delta, 0))
+        .returning(Flower.id)
+    )
+    result = await session.execute(statement)
+    return result.scalars().all()
+
+
+async def decrement_flower_stock_for_order(*, session: AsyncSession, order_id: int) -> Sequence[int]:
+    used = _order_flowers_query(order_id=order_id)
+    statement = (
+        update(Flower)
+        .where(Flower.id == used.c.flower_id, Flower.stock_quantity.is_not(None))
+        .values(stock_quantity=func.greatest(Flower.stock_quantity - used.c.quantity, 0))
+        .returning(Flower.id)
+    )
+    result = await session.execute(statement)
+    return result.scalars().all()
+
+
+async def restore_flower_stock_for_order(*, session: AsyncSession, order_id: int) -> Sequence[int]:
+    used = _order_flowers_query(order_id=order_id)
+    statement = (
+        update(Flower)
+        .where(Flower.id == used.c.flower_id, Flower.stock_quantity.is_not(None))
+        .values(stock_quantity=Flower.stock_quantity + used.c.quantity)
+        .returning(Flower.id)
+    )
+    result = await session.execute(statement)
+    return result.scalars().all()
+
+
+async def get_bouquet_capacities(
+    *, session: AsyncSession, product_ids: Sequence[int] | None = None
+) -> Sequence[Row]:
+    statement = _bouquet_capacity_query().order_by(bouquet_composition.c.product_id)
+    if product_ids is not None:
+        statement = statement.where(any_of(bouquet_composition.c.product_id, product_ids))
+    result = await session.execute(statement)
+    return result.all()
+
+
+async def sync_bouquets_availability(
+    *,
+    session: AsyncSession,
+    flower_ids: Sequence[int] | None = None,
+    product_ids: Sequence[int] | None = None,
+) -> Sequence[int]:
+    capacity = _bouquet_capacity_query()
+    if flower_ids is not None:
+        affected = select(bouquet_composition.c.product_id).where(any_of(bouquet_composition.c.flower_id, flower_ids))
+        capacity = capacity.where(bouquet_composition.c.product_id.in_(affected))
+    if product_ids is not None:
+        capacity = capacity.where(any_of(bouquet_composition.c.product_id, product_ids))
+    capacity = capacity.subquery("capacity")
+
+    # Снимаются букеты в продаже, которые не из чего собрать; возвращаются только снятые этим же пересчетом
+    # (auto_closed) и с ненулевым собственным остатком, закрытые администратором остаются закрытыми
+    close = and_(Product.in_stock, capacity.c.capacity == 0)
+    reopen = and_(
+        ~Product.in_stock,
+        Product.auto_closed,
+        capacity.c.capacity > 0,
+        or_(Product.stock_quantity.is_(None), Product.stock_quantity > 0),
+    )
+    statement = (
+        update(Product)
+        .where(Product.id == capacity.c.product_id, or_(close, reopen))
+        .values(in_stock=capacity.c.capacity > 0, auto_closed=capacity.c.capacity == 0)
+        .returning(Product.id)
+    )
+    result = await session.execute(statement)
+    return result.scalars().all()
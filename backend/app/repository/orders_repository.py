@@ -3,7 +3,8 @@ from collections.abc import Sequence
 from datetime import UTC, datetime
 from decimal import Decimal
 
-from sqlalchemy import Select, select, text, update
+from sqlalchemy import JSON, Row, ScalarSelect, Select, String, cast, func, literal_column, select, text, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -44,6 +45,7 @@ async def create_order(
         method_of_receipt=data.method_of_receipt,
         idempotency_key=idempotency_key,
         expires_at=expires_at,
+        pickup_point_id=data.pickup_point_id,
         status=Status.PENDING,
         order_item=[
             OrderItem(
@@ -87,25 +89,101 @@ async def get_order_by_id(*, session: AsyncSession, order_id: int) -> Order | No
     return result.scalar_one_or_none()
 
 
-def get_orders_query(user_id: int) -> Select[tuple[Order]]:
-    return (
+async def get_order_owner_and_status(*, session: AsyncSession, order_id: int) -> Row | None:
+    statement = select(Order.user_id, Order.status).where(Order.id == order_id)
+    result = await session.execute(statement)
+    return result.one_or_none()
+
+
+async def get_order_by_id_for_update(*, session: AsyncSession, order_id: int) -> Order | None:
+    statement = (
         select(Order)
+        .where(Order.id == order_id)
         .options(selectinload(Order.order_item), selectinload(Order.delivery))
-        .where(Order.user_id == user_id)
+        .with_for_update(of=Order)
+    )
+    result = await session.execute(statement)
+    return result.scalar_one_or_none()
+
+
+def get_order_rows_query(*, user_id: int | None = None, status: Status | None = None) -> Select:
+    items = _order_items_json()
+    statement = (
+        select(
+            Order.id,
+            Order.user_id,
+            Order.method_of_receipt,
+            Order.pickup_point_id,
+            Delivery.address.label("delivery_address"),
+            Delivery.recipient_name.label("delivery_recipient_name"),
+            Delivery.recipient_phone.label("delivery_recipient_phone"),
+            Delivery.comment.label("delivery_comment"),
+            items.label("order_item"),
+        )
+        .outerjoin(Delivery, Delivery.order_id == Order.id)
         .order_by(Order.id)
     )
+    if user_id is not None:
+        statement = statement.where(Order.user_id == user_id)
+    if status is not None:
+        statement = statement.where(Order.status == status)
+    return statement
 
 
-def get_all_orders_query() -> Select[tuple[Order]]:
-    return select(Order).options(selectinload(Order.order_item), selectinload(Order.delivery)).order_by(Order.id)
+def get_order_export_query(
+    *, date_from: datetime, date_to: datetime, statuses: Sequence[Status] | None = None
+) -> Select:
+    items = _order_items_json()
+    statement = (
+        select(
+            Order.id,
+            Order.created_at,
+            Order.paid_at,
+            Order.status,
+            Order.user_id,
+            Order.total_price,
+            Order.method_of_receipt,
+            Order.pickup_point_id,
+            Order.payment_id,
+            Delivery.address.label("delivery_address"),
+            items.label("order_item"),
+        )
+        .outerjoin(Delivery, Delivery.order_id == Order.id)
+        .where(Order.created_at >= date_from, Order.created_at < date_to)
+        .order_by(Order.created_at, Order.id)
+    )
+    if statuses:
+        statement = statement.where(Order.status.in_(statuses))
+    return statement
 
 
-def get_all_paid_query() -> Select[tuple[Order]]:
+def _order_items_json() -> ScalarSelect:
     return (
-        select(Order)
-        .options(selectinload(Order.order_item), selectinload(Order.delivery))
-        .where(Order.status == Status.PAID)
-        .order_by(Order.id)
+        select(
+            func.coalesce(
+                func.json_agg(
+                    aggregate_order_by(
+                        func.json_build_object(
+                            "id",
+                            OrderItem.id,
+                            "order_id",
+                            OrderItem.order_id,
+                            "product_id",
+                            OrderItem.product_id,
+                            "quantity",
+                            OrderItem.quantity,
+                            "price",
+                            cast(OrderItem.price, String),
+                        ),
+                        OrderItem.id,
+                    )
+                ),
+                literal_column("'[]'::json"),
+                type_=JSON,
+            )
+        )
+        .where(OrderItem.order_id == Order.id)
+        .scalar_subquery()
     )
 
 
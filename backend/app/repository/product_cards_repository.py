@@ -0,0 +1,68 @@
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.db.sql import any_of
+from app.models.categories_model import product_category
+from app.models.product_cards_model import ProductCard
+from app.models.products_model import Product, bouquet_composition
+
+
+def get_product_cards_query() -> Select[tuple[dict[str, Any]]]:
+    return select(ProductCard.document).join(Product, Product.id == ProductCard.product_id).order_by(Product.sort_order)
+
+
+async def get_product_card(*, session: AsyncSession, product_id: int) -> dict[str, Any] | None:
+    statement = select(ProductCard.document).where(ProductCard.product_id == product_id)
+    result = await session.execute(statement)
+    return result.scalar_one_or_none()
+
+
+async def get_products_for_cards(*, session: AsyncSession, product_ids: Sequence[int]) -> Sequence[Product]:
+    statement = (
+        select(Product)
+        .where(any_of(Product.id, product_ids))
+        .options(
+            selectinload(Product.images),
+            selectinload(Product.categories),
+            selectinload(Product.composition),
+        )
+        .execution_options(populate_existing=True)
+    )
+    result = await session.execute(statement)
+    return result.scalars().all()
+
+
+async def get_all_product_ids(*, session: AsyncSession) -> Sequence[int]:
+    result = await session.execute(select(Product.id).order_by(Product.id))
+    return result.scalars().all()
+
+
+async def get_product_ids_by_flower(*, session: AsyncSession, flower_id: int) -> Sequence[int]:
+    statement = select(bouquet_composition.c.product_id).where(bouquet_composition.c.flower_id == flower_id)
+    result = await session.execute(statement)
+    return result.scalars().all()
+
+
+async def get_product_ids_by_category(*, session: AsyncSession, category_id: int) -> Sequence[int]:
+    statement = select(product_category.c.product_id).where(product_category.c.category_id == category_id)
+    result = await session.execute(statement)
+    return result.scalars().all()
+
+
+async def upsert_product_cards(*, session: AsyncSession, documents: dict[int, dict[str, Any]]) -> None:
+    if not documents:
+        return
+    statement = insert(ProductCard).values(
+        [{"product_id": product_id, "document": document} for product_id, document in documents.items()]
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[ProductCard.product_id],
+        set_={"document": statement.excluded.document, "updated_at": func.now()},
+    )
+    await session.execute(statement)
+
@@ -1,12 +1,15 @@
 from collections.abc import Sequence
 from decimal import Decimal
 
-from sqlalchemy import Select, delete, func, select, update
+from sqlalchemy import ColumnElement, Row, Select, delete, distinct, exists, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.models.products_model import Product, ProductImage
-from app.schemas.products_schema import ProductCreate, ProductUpdate
+from app.db.sql import any_of
+from app.models.categories_model import product_category
+from app.models.products_model import Flower, Product, ProductImage, bouquet_composition
+from app.schemas.products_schema import ProductCreate, ProductSummary, ProductUpdate
 
 
 async def create_product(
@@ -44,15 +47,21 @@ def get_products_query() -> Select[tuple[Product]]:
     )
 
 
+def in_categories(*, category_ids: Select[tuple[int]]) -> ColumnElement[bool]:
+    return exists().where(
+        product_category.c.product_id == Product.id,
+        product_category.c.category_id.in_(category_ids),
+    )
+
+
 async def update_product(
     *, session: AsyncSession, product_id: int, product_data: ProductUpdate
 ) -> Product | None:
-    statement = (
-        update(Product)
-        .where(Product.id == product_id)
-        .values(**product_data.model_dump(exclude_unset=True))
-        .returning(Product)
-    )
+    values = product_data.model_dump(exclude_unset=True)
+    if "in_stock" in values:
+        # Наличие задал администратор: пересчет доступности букетов его больше не меняет
+        values["auto_closed"] = False
+    statement = update(Product).where(Product.id == product_id).values(**values).returning(Product)
     result = await session.execute(statement)
     await session.flush()
     return result.scalar_one_or_none()
@@ -79,14 +88,17 @@ async def get_product_images(*, session: AsyncSession) -> Sequence[ProductImage]
     return result.scalars().all()
 
 
-async def delete_product_image(*, session: AsyncSession, image_id: int) -> str | None:
+async def delete_product_image(
+    *, session: AsyncSession, image_id: int
+) -> tuple[int, str] | None:
     statement = (
         delete(ProductImage)
         .where(ProductImage.id == image_id)
-        .returning(ProductImage.url)
+        .returning(ProductImage.product_id, ProductImage.url)
     )
     result = await session.execute(statement)
-    return result.scalar_one_or_none()
+    row = result.one_or_none()
+    return (row.product_id, row.url) if row is not None else None
 
 
 async def get_product_price(
@@ -102,7 +114,7 @@ async def get_products_by_ids(
 ) -> Sequence[Product]:
     statement = (
         select(Product)
-        .where(Product.id.in_(product_ids))
+        .where(any_of(Product.id, product_ids))
         .options(
             selectinload(Product.images),
             selectinload(Product.categories),
@@ -113,6 +125,36 @@ async def get_products_by_ids(
     return result.scalars().all()
 
 
+async def get_product_summaries(
+    *, session: AsyncSession, product_ids: Sequence[int]
+) -> list[ProductSummary]:
+    if not product_ids:
+        return []
+    category_ids = (
+        select(func.array_agg(product_category.c.category_id))
+        .where(product_category.c.product_id == Product.id)
+        .scalar_subquery()
+    )
+    statement = select(
+        Product.id,
+        Product.price,
+        Product.in_stock,
+        Product.is_active,
+        category_ids.label("category_ids"),
+    ).where(any_of(Product.id, product_ids))
+    result = await session.execute(statement)
+    return [
+        ProductSummary(
+            id=row.id,
+            price=row.price,
+            in_stock=row.in_stock,
+            is_active=row.is_active,
+            category_ids=row.category_ids or [],
+        )
+        for row in result
+    ]
+
+
 async def get_product_by_id(
     *, session: AsyncSession, product_id: int
 ) -> Product | None:
@@ -125,14 +167,171 @@ async def get_product_by_id(
     return result.scalar_one_or_none()
 
 
-async def set_all_products_in_stock(*, session: AsyncSession, in_stock: bool) -> int:
-    count_stmt = (
-        select(func.count()).select_from(Product).where(Product.in_stock != in_stock)
+async def set_all_products_in_stock(
+    *, session: AsyncSession, in_stock: bool
+) -> Sequence[int]:
+    statement = (
+        update(Product)
+        .where(or_(Product.in_stock.is_distinct_from(in_stock), Product.auto_closed))
+        .values(in_stock=in_stock, auto_closed=False)
+        .returning(Product.id)
     )
-    count_result = await session.execute(count_stmt)
-    count = count_result.scalar() or 0
+    result = await session.execute(statement)
+    return result.scalars().all()
 
-    statement = update(Product).values(in_stock=in_stock)
-    await session.execute(statement)
-    await session.flush()
-    return count
+
+def get_product_facets_query(*, price_bounds: Sequence[Decimal]) -> Select:
+    price_bucket = func.width_bucket(Product.price, literal(list(price_bounds), ARRAY(Product.price.type)))
+    return select(Product.id, Product.color, Product.in_stock, price_bucket.label("price_bucket"))
+
+
+async def count_product_facets(*, session: AsyncSession, products_query: Select) -> Sequence[Row]:
+    products = products_query.subquery("products")
+    statement = (
+        select(
+            products.c.color,
+            products.c.in_stock,
+            products.c.price_bucket,
+            product_category.c.category_id,
+            func.grouping(products.c.color).label("by_color"),
+            func.grouping(products.c.in_stock).label("by_in_stock"),
+            func.grouping(products.c.price_bucket).label("by_price_bucket"),
+            func.grouping(product_category.c.category_id).label("by_category"),
+            func.count(distinct(products.c.id)).label("count"),
+        )
+        .select_from(products.outerjoin(product_category, product_category.c.product_id == products.c.id))
+        .group_by(
+            func.grouping_sets(
+                products.c.color,
+                products.c.in_stock,
+                products.c.price_bucket,
+                product_category.c.category_id,
+            )
+        )
+    )
+    result = await session.execute(statement)
+    return result.all()
+
+
+_PRICE_ROUNDING = {"up": func.ceil, "down": func.floor, "nearest": func.round}
+
+
+def _repricing_query(
+    *,
+    markup: Decimal,
+    rounding_step: Decimal,
+    rounding: str,
+    flower_ids: Sequence[int] | None,
+    product_ids: Sequence[int] | None,
+) -> Select:
+    # Букеты с автоматической ценой, у которых цена по составу отличается от текущей
+    cost = func.sum(Flower.price * bouquet_composition.c.quantity)
+    new_price = _PRICE_ROUNDING[rounding](cost * markup / rounding_step) * rounding_step
+    statement = (
+        select(
+            Product.id.label("product_id"),
+            Product.name,
+            Product.price.label("old_price"),
+            cost.label("cost"),
+            new_price.label("new_price"),
+        )
+        .join(bouquet_composition, bouquet_composition.c.product_id == Product.id)
+        .join(Flower, Flower.id == bouquet_composition.c.flower_id)
+        .where(Product.auto_price)
+        .group_by(Product.id)
+        .having(Product.price != new_price)
+    )
+    if flower_ids is not None:
+        affected = select(bouquet_composition.c.product_id).where(any_of(bouquet_composition.c.flower_id, flower_ids))
+        statement = statement.where(Product.id.in_(affected))
+    if product_ids is not None:
+        statement = statement.where(any_of(Product.id, product_ids))
+    return statement
+
+
+def _without_composition_condition(*, product_ids: Sequence[int] | None) -> list[ColumnElement[bool]]:
+    # Букеты с автоматической ценой без состава: цену рассчитать не из чего
+    conditions = [
+        Product.auto_price,
+        ~exists().where(bouquet_composition.c.product_id == Product.id),
+    ]
+    if product_ids is not None:
+        conditions.append(any_of(Product.id, product_ids))
+    return conditions
+
+
+async def get_auto_priced_without_composition(
+    *, session: AsyncSession, product_ids: Sequence[int] | None = None
+) -> Sequence[int]:
+    statement = (
+        select(Product.id)
+        .where(*_without_composition_condition(product_ids=product_ids))
+        .order_by(Product.id)
+    )
+    result = await session.execute(statement)
+    return result.scalars().all()
+
+
+async def close_auto_priced_without_composition(
+    *, session: AsyncSession, product_ids: Sequence[int] | None = None
+) -> Sequence[int]:
+    statement = (
+        update(Product)
+        .where(Product.in_stock, *_without_composition_condition(product_ids=product_ids))
+        .values(in_stock=False)
+        .returning(Product.id)
+    )
+    result = await session.execute(statement)
+    return sorted(result.scalars().all())
+
+
+async def get_price_changes(
+    *,
+    session: AsyncSession,
+    markup: Decimal,
+    rounding_step: Decimal,
+    rounding: str,
+    flower_ids: Sequence[int] | None = None,
+    product_ids: Sequence[int] | None = None,
+) -> Sequence[Row]:
+    statement = _repricing_query(
+        markup=markup,
+        rounding_step=rounding_step,
+        rounding=rounding,
+        flower_ids=flower_ids,
+        product_ids=product_ids,
+    ).order_by(Product.id)
+    result = await session.execute(statement)
+    return result.all()
+
+
+async def reprice_products(
+    *,
+    session: AsyncSession,
+    markup: Decimal,
+    rounding_step: Decimal,
+    rounding: str,
+    flower_ids: Sequence[int] | None = None,
+    product_ids: Sequence[int] | None = None,
+) -> Sequence[Row]:
+    changes = _repricing_query(
+        markup=markup,
+        rounding_step=rounding_step,
+        rounding=rounding,
+        flower_ids=flower_ids,
+        product_ids=product_ids,
+    ).subquery("changes")
+    statement = (
+        update(Product)
+        .where(Product.id == changes.c.product_id)
+        .values(price=changes.c.new_price)
+        .returning(
+            changes.c.product_id,
+            changes.c.name,
+            changes.c.old_price,
+            changes.c.cost,
+            Product.price.label("new_price"),
+        )
+    )
+    result = await session.execute(statement)
+    return sorted(result.all(), key=lambda row: row.product_id)
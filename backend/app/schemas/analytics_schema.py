@@ -0,0 +1,33 @@
+from datetime import date
+from decimal import Decimal
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class SalesRollupBase(BaseModel):
+    """Базовые поля дневного агрегата продаж."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    day: date = Field(..., description="День продаж")
+    revenue: Decimal = Field(..., description="Выручка")
+    units: int = Field(..., description="Продано единиц товара")
+    orders_count: int = Field(..., description="Количество оплаченных заказов")
+
+
+class ProductSalesResponse(SalesRollupBase):
+    """Схема API ответа дневных продаж товара."""
+
+    product_id: int = Field(..., description="Идентификатор товара")
+
+
+class CategorySalesResponse(SalesRollupBase):
+    """Схема API ответа дневных продаж категории."""
+
+    category_id: int = Field(..., description="Идентификатор категории")
+
+
+class PickupPointSalesResponse(SalesRollupBase):
+    """Схема API ответа дневных продаж точки самовывоза."""
+
+    pickup_point_id: int = Field(..., description="Идентификатор точки самовывоза")
@@ -1,7 +1,10 @@
 from decimal import Decimal
+from enum import StrEnum
 
 from pydantic import BaseModel, ConfigDict, Field
 
+MAX_CART_ITEM_QUANTITY = 999
+
 
 class CartItemBase(BaseModel):
     """Базовые поля товара в корзин, используемые в других схемах."""
@@ -16,13 +19,38 @@ class CartItemCreate(BaseModel):
     """Схема для создания товара в корзине."""
 
     product_id: int = Field(..., description="Уникальный идентификатор товара")
-    quantity: int = Field(default=1, ge=1, le=999)
+    quantity: int = Field(default=1, ge=1, le=MAX_CART_ITEM_QUANTITY)
 
 
 class CartItemUpdate(BaseModel):
     """Схема для частичного обновления товара в корзине."""
 
-    quantity: int | None = Field(default=None, ge=1, le=999, description="Количество товара")
+    quantity: int | None = Field(default=None, ge=1, le=MAX_CART_ITEM_QUANTITY, description="Количество товара")
+
+
+class CartItemOperation(StrEnum):
+    """Операция над товаром в пакетном изменении корзины."""
+
+    ADD = "add"
+    SET = "set"
+    REMOVE = "remove"
+
+
+class CartBatchItem(BaseModel):
+    """Одна операция пакетного изменения корзины."""
+
+    product_id: int = Field(..., description="Идентификатор товара")
+    quantity: int = Field(
+        default=1, ge=1, le=MAX_CART_ITEM_QUANTITY, description="Количество товара, для remove не учитывается"
+    )
+    op: CartItemOperation = Field(default=CartItemOperation.ADD, description="Операция над товаром")
+
+
+class CartBatchRequest(BaseModel):
+    """Схема для пакетного изменения корзины."""
+
+    items: list[CartBatchItem] = Field(..., min_length=1, max_length=100, description="Операции над товарами")
+    target_user_id: int | None = Field(default=None, description="Пользователь, корзина которого изменяется")
 
 
 class CartItemResponse(CartItemBase):
@@ -42,3 +70,27 @@ class CartResponse(BaseModel):
     user_id: int = Field(..., description="Уникальный идентификатор пользователя")
 
     cart_item: list[CartItemResponse] = Field(default_factory=list, description="Товары в корзине")
+
+
+class CartItemDetailResponse(BaseModel):
+    """Схема товара корзины с данными товара и актуальной ценой."""
+
+    id: int = Field(..., description="Уникальный идентификатор товара корзины")
+    product_id: int = Field(..., description="Идентификатор товара")
+    name: str = Field(..., description="Название товара")
+    image_url: str | None = Field(default=None, description="Первое изображение товара")
+    in_stock: bool = Field(..., description="В наличии")
+    quantity: int = Field(..., description="Количество товара")
+    price: Decimal = Field(..., description="Актуальная цена товара с учетом скидки")
+    base_price: Decimal = Field(..., description="Цена товара без скидки")
+    discount_percentage: Decimal | None = Field(default=None, description="Процент скидки")
+    line_total: Decimal = Field(..., description="Стоимость позиции")
+
+
+class CartDetailResponse(BaseModel):
+    """Схема API ответа с содержимым корзины, актуальными ценами и итоговой суммой."""
+
+    id: int = Field(..., description="Уникальный идентификатор корзины")
+    user_id: int = Field(..., description="Уникальный идентификатор пользователя")
+    items: list[CartItemDetailResponse] = Field(default_factory=list, description="Товары в корзине")
+    total: Decimal = Field(..., description="Итоговая стоимость корзины")
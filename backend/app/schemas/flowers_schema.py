@@ -19,6 +19,7 @@ class FlowerResponse(BaseModel):
     id: int = Field(..., description="Уникальный идентификатор")
     name: str = Field(..., description="Название цветка")
     price: Decimal = Field(..., description="Цена за штуку")
+    stock_quantity: int | None = Field(default=None, description="Остаток; null — не учитывается")
 
 
 class CompositionItem(BaseModel):
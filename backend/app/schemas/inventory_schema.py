@@ -0,0 +1,93 @@
+from typing import Self
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class StockSetItem(BaseModel):
+    product_id: int = Field(..., description="Идентификатор товара")
+    quantity: int = Field(..., ge=0, description="Новый остаток")
+
+
+class StockAdjustItem(BaseModel):
+    product_id: int = Field(..., description="Идентификатор товара")
+    delta: int = Field(..., description="Изменение остатка, отрицательное — списание")
+
+
+class StockUpdateBase(BaseModel):
+    pickup_point_id: int | None = Field(
+        default=None, description="Точка самовывоза; если не указана, меняется общий остаток товара"
+    )
+
+    @model_validator(mode="after")
+    def check_unique_products(self) -> Self:
+        product_ids = [item.product_id for item in self.items]  # type: ignore[attr-defined]
+        if len(product_ids) != len(set(product_ids)):
+            raise ValueError("Товары в списке не должны повторяться")
+        return self
+
+
+class StockSetRequest(StockUpdateBase):
+    """Схема для установки остатков списком."""
+
+    items: list[StockSetItem] = Field(..., min_length=1, max_length=1000)
+
+
+class StockAdjustRequest(StockUpdateBase):
+    """Схема для изменения остатков на величину списком."""
+
+    items: list[StockAdjustItem] = Field(..., min_length=1, max_length=1000)
+
+
+class StockUpdateResponse(BaseModel):
+    """Схема API ответа массового изменения остатков."""
+
+    updated: int = Field(..., description="Количество обновленных товаров")
+    not_found_product_ids: list[int] = Field(default_factory=list, description="Несуществующие товары")
+
+
+class FlowerStockSetItem(BaseModel):
+    flower_id: int = Field(..., description="Идентификатор цветка")
+    quantity: int = Field(..., ge=0, description="Новый остаток")
+
+
+class FlowerStockAdjustItem(BaseModel):
+    flower_id: int = Field(..., description="Идентификатор цветка")
+    delta: int = Field(..., description="Изменение остатка, отрицательное — списание")
+
+
+class FlowerStockUpdateBase(BaseModel):
+    @model_validator(mode="after")
+    def check_unique_flowers(self) -> Self:
+        flower_ids = [item.flower_id for item in self.items]  # type: ignore[attr-defined]
+        if len(flower_ids) != len(set(flower_ids)):
+            raise ValueError("Цветы в списке не должны повторяться")
+        return self
+
+
+class FlowerStockSetRequest(FlowerStockUpdateBase):
+    """Схема для установки остатков цветов списком."""
+
+    items: list[FlowerStockSetItem] = Field(..., min_length=1, max_length=1000)
+
+
+class FlowerStockAdjustRequest(FlowerStockUpdateBase):
+    """Схема для изменения остатков цветов на величину списком."""
+
+    items: list[FlowerStockAdjustItem] = Field(..., min_length=1, max_length=1000)
+
+
+class FlowerStockUpdateResponse(BaseModel):
+    """Схема API ответа массового изменения остатков цветов."""
+
+    updated: int = Field(..., description="Количество обновленных цветов")
+    not_found_flower_ids: list[int] = Field(default_factory=list, description="Несуществующие цветы")
+    changed_product_ids: list[int] = Field(
+        default_factory=list, description="Букеты, снятые с продажи или возвращенные в продажу"
+    )
+
+
+class BouquetAvailability(BaseModel):
+    """Сколько букетов можно собрать из текущих остатков цветов."""
+
+    product_id: int = Field(..., description="Идентификатор букета")
+    capacity: int = Field(..., description="Количество букетов, которое можно собрать")
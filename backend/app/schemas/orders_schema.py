@@ -1,4 +1,5 @@
 from decimal import Decimal
+from enum import StrEnum
 
 from pydantic import (
     BaseModel,
@@ -9,10 +10,17 @@ from pydantic import (
 )
 from pydantic_extra_types.phone_numbers import PhoneNumber
 
-from app.models.orders_model import MethodOfReceipt
+from app.models.orders_model import MethodOfReceipt, Status
 from app.utils.validators.phone import normalize_phone
 
 
+class OrderExportFormat(StrEnum):
+    """Формат выгрузки заказов."""
+
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
 class OrderItemResponse(BaseModel):
     """Схема API ответа товара в заказе."""
 
@@ -84,6 +92,23 @@ class WebhookPayload(BaseModel):
     object: WebhookPaymentObject = Field(...)
 
 
+class OrderStatusEvent(BaseModel):
+    """Событие смены статуса заказа в SSE-потоке."""
+
+    order_id: int = Field(..., description="Уникальный идентификатор заказа")
+    status: Status = Field(..., description="Статус заказа")
+
+
+class WebhookQueueMetrics(BaseModel):
+    """Состояние очереди уведомлений ЮKassa."""
+
+    length: int = Field(..., description="Количество сообщений в потоке")
+    lag: int | None = Field(None, description="Сообщения, еще не прочитанные группой обработчиков")
+    pending: int = Field(..., description="Прочитанные, но не подтвержденные сообщения")
+    consumers: int = Field(..., description="Количество обработчиков в группе")
+    dead_letters: int = Field(..., description="Сообщения, перенесенные в dead-letter поток")
+
+
 class CreateOrderRequest(BaseModel):
     """Схема для создания заказа."""
 
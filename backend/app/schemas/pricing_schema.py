@@ -0,0 +1,38 @@
+from decimal import Decimal
+
+from pydantic import BaseModel, Field
+
+
+class RepriceRequest(BaseModel):
+    """Схема для пересчета цен букетов по составу."""
+
+    flower_ids: list[int] | None = Field(
+        default=None, max_length=1000, description="Пересчитать букеты с этими цветами; null — все"
+    )
+    product_ids: list[int] | None = Field(
+        default=None, max_length=1000, description="Пересчитать эти букеты; null — все"
+    )
+    dry_run: bool = Field(default=True, description="Только показать изменения, не применяя их")
+
+
+class PriceChange(BaseModel):
+    product_id: int = Field(..., description="Идентификатор букета")
+    name: str = Field(..., description="Название букета")
+    cost: Decimal = Field(..., description="Стоимость состава")
+    old_price: Decimal = Field(..., description="Текущая цена")
+    new_price: Decimal = Field(..., description="Цена по составу")
+    difference: Decimal = Field(..., description="Изменение цены")
+
+
+class RepriceReport(BaseModel):
+    """Схема API ответа пересчета цен букетов."""
+
+    dry_run: bool = Field(..., description="Изменения не применены")
+    markup: Decimal = Field(..., description="Наценка к стоимости состава")
+    rounding_step: Decimal = Field(..., description="Шаг округления цены")
+    rounding: str = Field(..., description="Способ округления")
+    changes: list[PriceChange] = Field(default_factory=list, description="Букеты, у которых меняется цена")
+    without_composition: list[int] = Field(
+        default_factory=list,
+        description="Букеты с автоматической ценой без состава: цену рассчитать не из чего, они снимаются с продажи",
+    )
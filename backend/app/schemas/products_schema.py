@@ -29,6 +29,7 @@ class ProductBase(BaseModel):
     color: str = Field(..., max_length=64, description="Цвет")
     is_active: bool = Field(default=False, description="Активен ли товар")
     in_stock: bool = Field(default=True, description="В наличии")
+    auto_price: bool = Field(default=False, description="Цена рассчитывается по составу букета")
 
 
 class ProductCreate(ProductBase):
@@ -48,6 +49,19 @@ class ProductUpdate(BaseModel):
     color: str | None = Field(default=None, max_length=64, description="Цвет")
     is_active: bool | None = Field(default=None, description="Активен ли товар")
     in_stock: bool | None = Field(default=None, description="В наличии")
+    auto_price: bool | None = Field(default=None, description="Цена рассчитывается по составу букета")
+
+
+class ProductSummary(BaseModel):
+    """Краткие данные товара для проверок наличия и цены."""
+
+    id: int = Field(..., description="Уникальный идентификатор товара")
+    price: Decimal = Field(..., description="Стоимость товара")
+    in_stock: bool = Field(..., description="В наличии")
+    is_active: bool = Field(..., description="Активен ли товар")
+    category_ids: list[int] = Field(
+        default_factory=list, description="Идентификаторы категорий товара"
+    )
 
 
 class ProductResponse(ProductBase):
@@ -66,3 +80,34 @@ class ProductResponse(ProductBase):
     discount_percentage: Decimal | None = Field(
         default=None, description="Процент скидки"
     )
+
+
+class ColorFacet(BaseModel):
+    color: str | None = Field(..., description="Цвет")
+    count: int = Field(..., description="Количество товаров")
+
+
+class CategoryFacet(BaseModel):
+    category_id: int = Field(..., description="Идентификатор категории")
+    count: int = Field(..., description="Количество товаров")
+
+
+class StockFacet(BaseModel):
+    in_stock: bool | None = Field(..., description="В наличии")
+    count: int = Field(..., description="Количество товаров")
+
+
+class PriceBucketFacet(BaseModel):
+    min_price: Decimal | None = Field(..., description="Нижняя граница цены (включительно)")
+    max_price: Decimal | None = Field(..., description="Верхняя граница цены (не включительно)")
+    count: int = Field(..., description="Количество товаров")
+
+
+class ProductFacets(BaseModel):
+    """Количество товаров по значениям фильтров для текущего фильтра."""
+
+    total: int = Field(..., description="Количество товаров, подходящих под фильтр")
+    colors: list[ColorFacet] = Field(default_factory=list)
+    categories: list[CategoryFacet] = Field(default_factory=list)
+    in_stock: list[StockFacet] = Field(default_factory=list)
+    price_buckets: list[PriceBucketFacet] = Field(default_factory=list)
@@ -0,0 +1,141 @@
+from collections.abc import Sequence
+from datetime import date
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import InvalidDateRangeError
+from app.repository import analytics_repository
+from app.schemas.analytics_schema import (
+    CategorySalesResponse,
+    PickupPointSalesResponse,
+    ProductSalesResponse,
+)
+
+
+async def register_paid_order(*, session: AsyncSession, order_id: int) -> None:
+    """
+    Добавляет оплаченный заказ в дневные агрегаты продаж.
+
+    Args:
+        session: сессия базы данных
+        order_id: идентификатор оплаченного заказа
+    """
+    await analytics_repository.apply_order(
+        session=session, order_id=order_id, sign=1, timezone=settings.ANALYTICS_TIMEZONE
+    )
+
+
+async def revert_paid_order(*, session: AsyncSession, order_id: int) -> None:
+    """
+    Вычитает отмененный оплаченный заказ из дневных агрегатов продаж.
+
+    Заказ вычитается из того же дня оплаты, в который был добавлен.
+
+    Args:
+        session: сессия базы данных
+        order_id: идентификатор заказа
+    """
+    await analytics_repository.apply_order(
+        session=session, order_id=order_id, sign=-1, timezone=settings.ANALYTICS_TIMEZONE
+    )
+
+
+async def rebuild_sales_rollups(*, session: AsyncSession, date_from: date, date_to: date) -> None:
+    """
+    Пересчитывает дневные агрегаты продаж за период по таблицам заказов.
+
+    Args:
+        session: сессия базы данных
+        date_from: первый день периода
+        date_to: последний день периода (включительно)
+
+    Raises:
+        InvalidDateRangeError: если начало периода позже окончания
+    """
+    _validate_range(date_from=date_from, date_to=date_to)
+    await analytics_repository.rebuild(
+        session=session, date_from=date_from, date_to=date_to, timezone=settings.ANALYTICS_TIMEZONE
+    )
+
+
+async def get_product_sales(
+    *, session: AsyncSession, date_from: date, date_to: date, product_id: int | None = None
+) -> Sequence[ProductSalesResponse]:
+    """
+    Возвращает дневные продажи по товарам за период.
+
+    Args:
+        session: сессия базы данных
+        date_from: первый день периода
+        date_to: последний день периода (включительно)
+        product_id: опциональный фильтр по товару
+
+    Returns:
+        Sequence[ProductSalesResponse] дневные продажи
+
+    Raises:
+        InvalidDateRangeError: если начало периода позже окончания
+    """
+    _validate_range(date_from=date_from, date_to=date_to)
+    rows = await analytics_repository.get_product_sales(
+        session=session, date_from=date_from, date_to=date_to, product_id=product_id
+    )
+    return [ProductSalesResponse.model_validate(row) for row in rows]
+
+
+async def get_category_sales(
+    *, session: AsyncSession, date_from: date, date_to: date, category_id: int | None = None
+) -> Sequence[CategorySalesResponse]:
+    """
+    Возвращает дневные продажи по категориям за период.
+
+    Товар из нескольких категорий учитывается в каждой из них.
+
+    Args:
+        session: сессия базы данных
+        date_from: первый день периода
+        date_to: последний день периода (включительно)
+        category_id: опциональный фильтр по категории
+
+    Returns:
+        Sequence[CategorySalesResponse] дневные продажи
+
+    Raises:
+        InvalidDateRangeError: если начало периода позже окончания
+    """
+    _validate_range(date_from=date_from, date_to=date_to)
+    rows = await analytics_repository.get_category_sales(
+        session=session, date_from=date_from, date_to=date_to, category_id=category_id
+    )
+    return [CategorySalesResponse.model_validate(row) for row in rows]
+
+
+async def get_pickup_point_sales(
+    *, session: AsyncSession, date_from: date, date_to: date, pickup_point_id: int | None = None
+) -> Sequence[PickupPointSalesResponse]:
+    """
+    Возвращает дневные продажи по точкам самовывоза за период.
+
+    Args:
+        session: сессия базы данных
+        date_from: первый день периода
+        date_to: последний день периода (включительно)
+        pickup_point_id: опциональный фильтр по точке самовывоза
+
+    Returns:
+        Sequence[PickupPointSalesResponse] дневные продажи
+
+    Raises:
+        InvalidDateRangeError: если начало периода позже окончания
+    """
+    _validate_range(date_from=date_from, date_to=date_to)
+    rows = await analytics_repository.get_pickup_point_sales(
+        session=session, date_from=date_from, date_to=date_to, pickup_point_id=pickup_point_id
+    )
+    return [PickupPointSalesResponse.model_validate(row) for row in rows]
+
+
+def _validate_range(*, date_from: date, date_to: date) -> None:
+    if date_from > date_to:
+        raise InvalidDateRangeError()
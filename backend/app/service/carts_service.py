@@ -1,17 +1,31 @@
+from decimal import Decimal
+
+from redis.asyncio import Redis
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import (
     CartItemNotFoundError,
+    CartItemQuantityLimitError,
     CartNotFoundError,
     InsufficientPermissionError,
     ProductNotFoundError,
     UserCartMissingError,
 )
+from app.models.carts_model import Cart
 from app.models.users_model import Role, User
-from app.repository import carts_repository, products_repository
-from app.schemas.carts_schema import CartItemResponse, CartResponse
-from app.service import discounts_service
+from app.repository import carts_repository
+from app.schemas.carts_schema import (
+    MAX_CART_ITEM_QUANTITY,
+    CartBatchItem,
+    CartDetailResponse,
+    CartItemDetailResponse,
+    CartItemOperation,
+    CartItemResponse,
+    CartResponse,
+)
+from app.schemas.products_schema import ProductSummary
+from app.service import discounts_service, products_service
 
 
 async def get_current_user_cart(*, session: AsyncSession, user_id: int) -> CartResponse:
@@ -34,6 +48,65 @@ async def get_current_user_cart(*, session: AsyncSession, user_id: int) -> CartR
     return CartResponse.model_validate(cart)
 
 
+async def get_current_user_cart_details(*, session: AsyncSession, user_id: int) -> CartDetailResponse:
+    """
+    Возвращает корзину текущего пользователя с данными товаров, актуальными ценами и итоговой суммой.
+
+    Товары, первые изображения и категории загружаются одним запросом, цены
+    пересчитываются одним расчетом скидок.
+
+    Args:
+        session: сессия базы данных
+        user_id: идентификатор пользователя
+
+    Returns:
+        CartDetailResponse о корзине пользователя
+
+    Raises:
+        UserCartMissingError: у пользователя нет корзины
+    """
+    rows = await carts_repository.get_cart_details_by_user_id(session=session, user_id=user_id)
+    if not rows:
+        raise UserCartMissingError(user_id=user_id)
+
+    item_rows = [row for row in rows if row.item_id is not None]
+    summaries = [
+        ProductSummary(
+            id=row.product_id,
+            price=row.price,
+            in_stock=row.in_stock,
+            is_active=row.is_active,
+            category_ids=row.category_ids or [],
+        )
+        for row in item_rows
+    ]
+    discount_map = await discounts_service.enrich_product_summaries(session=session, summaries=summaries)
+
+    items: list[CartItemDetailResponse] = []
+    total = Decimal("0")
+    for row in item_rows:
+        discounted_price, discount = discount_map.get(row.product_id, (None, None))
+        price = discounted_price if discounted_price is not None else row.price
+        line_total = price * row.quantity
+        total += line_total
+        items.append(
+            CartItemDetailResponse(
+                id=row.item_id,
+                product_id=row.product_id,
+                name=row.name,
+                image_url=row.image_url,
+                in_stock=row.in_stock,
+                quantity=row.quantity,
+                price=price,
+                base_price=row.price,
+                discount_percentage=discount.percentage if discount else None,
+                line_total=line_total,
+            )
+        )
+
+    return CartDetailResponse(id=rows[0].cart_id, user_id=rows[0].user_id, items=items, total=total)
+
+
 async def delete_cart(*, session: AsyncSession, cart_id: int) -> None:
     """
     Удаляет корзину пользователя.
@@ -59,6 +132,7 @@ async def delete_cart(*, session: AsyncSession, cart_id: int) -> None:
 async def create_cart_item(
     *,
     session: AsyncSession,
+    redis: Redis,
     current_user: User,
     target_user_id: int | None = None,
     product_id: int,
@@ -67,8 +141,11 @@ async def create_cart_item(
     """
     Добавляет товар в корзину пользователя.
 
+    Если товар уже в корзине, количество увеличивается, но не больше MAX_CART_ITEM_QUANTITY.
+
     Args:
         session: сессия базы данных
+        redis: клиент Redis
         current_user: активный пользователь
         target_user_id: пользователь, которому в корзину добавится товар
         product_id: идентификатор товара
@@ -81,36 +158,22 @@ async def create_cart_item(
         ProductNotFoundError: не найден товар по ID
         InsufficientPermissionError: недостаточно прав для удаления корзины
     """
-    if target_user_id and target_user_id != current_user.id:
-        if current_user.role != Role.ADMIN:
-            raise InsufficientPermissionError()
-        user_id = target_user_id
-    else:
-        user_id = current_user.id
+    user_id = _resolve_cart_owner(current_user=current_user, target_user_id=target_user_id)
 
-    product = await products_repository.get_product(session=session, product_id=product_id)
-    if not product:
-        raise ProductNotFoundError(product_id=product_id)
+    product = await products_service.get_product_summary(session=session, redis=redis, product_id=product_id)
 
-    discount_map = await discounts_service.enrich_products(session=session, products=[product])
+    discount_map = await discounts_service.enrich_product_summaries(session=session, summaries=[product])
     discounted_price, _ = discount_map.get(product.id, (None, None))
     price = discounted_price if discounted_price is not None else product.price
 
-    cart = await carts_repository.get_cart_by_user_id(session=session, user_id=user_id)
-    if not cart:
-        try:
-            cart = await carts_repository.create_cart(session=session, user_id=user_id)
-        except IntegrityError:
-            await session.rollback()
-            cart = await carts_repository.get_cart_by_user_id(session=session, user_id=user_id)
-            if cart is None:
-                raise
+    cart = await _get_or_create_cart(session=session, user_id=user_id)
 
     cart_item_exists = await carts_repository.get_cart_item_for_update(
         session=session, cart_id=cart.id, product_id=product_id
     )
     if cart_item_exists:
-        cart_item_exists.quantity += quantity
+        # Как и в batch_update_cart, количество позиции не превышает MAX_CART_ITEM_QUANTITY
+        cart_item_exists.quantity = min(cart_item_exists.quantity + quantity, MAX_CART_ITEM_QUANTITY)
         await session.flush()
         return CartItemResponse.model_validate(cart_item_exists)
 
@@ -129,12 +192,83 @@ async def create_cart_item(
             session=session, cart_id=cart.id, product_id=product_id
         )
         if cart_item_exists:
-            cart_item_exists.quantity += quantity
+            cart_item_exists.quantity = min(cart_item_exists.quantity + quantity, MAX_CART_ITEM_QUANTITY)
             await session.flush()
             return CartItemResponse.model_validate(cart_item_exists)
         raise
 
 
+async def batch_update_cart(
+    *,
+    session: AsyncSession,
+    redis: Redis,
+    current_user: User,
+    target_user_id: int | None = None,
+    items: list[CartBatchItem],
+) -> CartResponse:
+    """
+    Применяет набор операций над товарами корзины в одной транзакции.
+
+    Операции над одним товаром сворачиваются в порядке следования, товары проверяются
+    одним запросом, цены считаются одним расчетом скидок, изменения записываются
+    пакетным upsert.
+
+    Args:
+        session: сессия базы данных
+        redis: клиент Redis
+        current_user: активный пользователь
+        target_user_id: пользователь, корзина которого изменяется
+        items: операции над товарами
+
+    Returns:
+        CartResponse с итоговым содержимым корзины
+
+    Raises:
+        ProductNotFoundError: не найден товар по ID
+        InsufficientPermissionError: недостаточно прав для изменения чужой корзины
+        CartItemQuantityLimitError: сумма add по товару в запросе больше MAX_CART_ITEM_QUANTITY
+    """
+    user_id = _resolve_cart_owner(current_user=current_user, target_user_id=target_user_id)
+    operations = _fold_cart_operations(items)
+
+    upsert_ids = [pid for pid, (op, _) in operations.items() if op != CartItemOperation.REMOVE]
+    summaries = await products_service.get_product_summaries(session=session, redis=redis, product_ids=upsert_ids)
+    for product_id in upsert_ids:
+        if product_id not in summaries:
+            raise ProductNotFoundError(product_id=product_id)
+
+    discount_map = await discounts_service.enrich_product_summaries(
+        session=session, summaries=list(summaries.values())
+    )
+
+    def _price(product_id: int) -> Decimal:
+        discounted_price, _ = discount_map.get(product_id, (None, None))
+        return discounted_price if discounted_price is not None else summaries[product_id].price
+
+    cart = await _get_or_create_cart(session=session, user_id=user_id)
+
+    await carts_repository.upsert_cart_items(
+        session=session,
+        cart_id=cart.id,
+        items=[(pid, qty, _price(pid)) for pid, (op, qty) in operations.items() if op == CartItemOperation.ADD],
+        increment=True,
+    )
+    await carts_repository.upsert_cart_items(
+        session=session,
+        cart_id=cart.id,
+        items=[(pid, qty, _price(pid)) for pid, (op, qty) in operations.items() if op == CartItemOperation.SET],
+        increment=False,
+    )
+    await carts_repository.delete_cart_items_by_product_ids(
+        session=session,
+        cart_id=cart.id,
+        product_ids=[pid for pid, (op, _) in operations.items() if op == CartItemOperation.REMOVE],
+    )
+
+    cart = await carts_repository.get_cart_by_id(session=session, cart_id=cart.id, populate_existing=True)
+    return CartResponse.model_validate(cart)
+
+
 async def update_cart_item_quantity(
     *, session: AsyncSession, cart_item_id: int, quantity: int, current_user: User
 ) -> CartItemResponse:
@@ -190,3 +324,52 @@ async def delete_cart_item(*, session: AsyncSession, cart_item_id: int, current_
         raise InsufficientPermissionError()
 
     await carts_repository.delete_cart_item(session=session, cart_item_id=cart_item_id)
+
+
+def _resolve_cart_owner(*, current_user: User, target_user_id: int | None) -> int:
+    """Возвращает владельца изменяемой корзины, чужая корзина доступна только администратору."""
+    if target_user_id and target_user_id != current_user.id:
+        if current_user.role != Role.ADMIN:
+            raise InsufficientPermissionError()
+        return target_user_id
+    return current_user.id
+
+
+async def _get_or_create_cart(*, session: AsyncSession, user_id: int) -> Cart:
+    """Возвращает корзину пользователя, создавая ее при отсутствии."""
+    cart = await carts_repository.get_cart_by_user_id(session=session, user_id=user_id)
+    if cart is None:
+        try:
+            cart = await carts_repository.create_cart(session=session, user_id=user_id)
+        except IntegrityError:
+            await session.rollback()
+            cart = await carts_repository.get_cart_by_user_id(session=session, user_id=user_id)
+            if cart is None:
+                raise
+    return cart
+
+
+def _fold_cart_operations(items: list[CartBatchItem]) -> dict[int, tuple[CartItemOperation, int]]:
+    """
+    Сворачивает операции над одним товаром в одну итоговую.
+
+    add после set или remove превращается в set, несколько add суммируются.
+
+    Raises:
+        CartItemQuantityLimitError: если сумма количеств товара больше MAX_CART_ITEM_QUANTITY
+    """
+    operations: dict[int, tuple[CartItemOperation, int]] = {}
+    for item in items:
+        previous = operations.get(item.product_id)
+        if item.op != CartItemOperation.ADD or previous is None:
+            operations[item.product_id] = (item.op, item.quantity)
+            continue
+        previous_op, previous_quantity = previous
+        if previous_op == CartItemOperation.REMOVE:
+            operations[item.product_id] = (CartItemOperation.SET, item.quantity)
+        else:
+            quantity = previous_quantity + item.quantity
+            if quantity > MAX_CART_ITEM_QUANTITY:
+                raise CartItemQuantityLimitError(product_id=item.product_id, limit=MAX_CART_ITEM_QUANTITY)
+            operations[item.product_id] = (previous_op, quantity)
+    return operations
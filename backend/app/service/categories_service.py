@@ -4,7 +4,9 @@ from collections.abc import Sequence
 import anyio
 from fastapi import UploadFile
 from fastapi_pagination import Page
+from fastapi_pagination.bases import AbstractPage
 from fastapi_pagination.ext.sqlalchemy import paginate
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
@@ -14,14 +16,16 @@ from app.core.exceptions import (
     CategoryNotExistsError,
     CategoryParentNotFoundError,
 )
-from app.models.categories_model import Category
-from app.repository import categories_repository
+from app.repository import categories_repository, product_cards_repository
 from app.schemas.categories_schema import (
     CategoryCreate,
     CategoryResponse,
     CategoryUpdate,
     CategoryWithChildren,
 )
+from app.schemas.products_schema import ProductResponse
+from app.service import product_cards_service, products_service
+from app.utils.filters.products import ProductFilter
 from app.utils.validators.image import validate_image
 
 
@@ -50,6 +54,7 @@ async def create_category(session: AsyncSession, category_data: CategoryCreate)
             raise CategoryParentNotFoundError(parent_id=category_data.parent_id)
 
     category = await categories_repository.create_category(session=session, category_data=category_data)
+    await categories_repository.add_closure(session=session, category_id=category.id, parent_id=category.parent_id)
     return CategoryResponse.model_validate(category)
 
 
@@ -94,6 +99,35 @@ async def get_category_by_slug(session: AsyncSession, slug: str) -> CategoryResp
     return CategoryResponse.model_validate(category)
 
 
+async def get_category_products(
+    *, session: AsyncSession, slug: str, product_filter: ProductFilter
+) -> AbstractPage[ProductResponse]:
+    """
+    Возвращает товары категории вместе с товарами всех ее активных подкатегорий.
+
+    Подкатегории раскрываются рекурсивным запросом внутри запроса товаров,
+    поэтому обходить дерево категорий на клиенте не нужно.
+
+    Args:
+        session: сессия базы данных
+        slug: slug категории
+        product_filter: фильтр товара
+
+    Returns:
+        Page или CursorPage со списком товаров — по типу пагинации маршрута
+
+    Raises:
+        CategoryNotExistsError: если категория не существует или не активна
+    """
+    category = await categories_repository.get_category_by_slug(session=session, slug=slug)
+    if category is None or not category.is_active:
+        raise CategoryNotExistsError(slug=slug)
+
+    return await products_service.get_products(
+        session=session, product_filter=product_filter, category_id=category.id
+    )
+
+
 async def update_category(session: AsyncSession, category_id: int, category_data: CategoryUpdate) -> CategoryResponse:
     """
     Обновляет информацию о категории в базе данных.
@@ -130,6 +164,7 @@ async def update_category(session: AsyncSession, category_id: int, category_data
         if has_cycle:
             raise CategoryCycleError(category_id=category_id, parent_id=category_data.parent_id)
 
+    old_parent_id = category.parent_id
     updated_category = await categories_repository.update_category(
         session=session, category_id=category_id, category_data=category_data
     )
@@ -137,6 +172,11 @@ async def update_category(session: AsyncSession, category_id: int, category_data
     if not updated_category:
         raise CategoryNotExistsError(category_id=category_id)
 
+    if "parent_id" in category_data.model_fields_set and category_data.parent_id != old_parent_id:
+        await categories_repository.move_closure(
+            session=session, category_id=category_id, parent_id=category_data.parent_id
+        )
+
     return CategoryResponse.model_validate(updated_category)
 
 
@@ -172,7 +212,11 @@ async def get_all_categories(session: AsyncSession) -> Page[CategoryResponse]:
 
 async def get_category_tree(session: AsyncSession, only_active: bool = True) -> list[CategoryWithChildren]:
     """
-    Возвращает дерево категорий, рекурсивно собирая дочерние элементы.
+    Возвращает дерево категорий, собранное из одного запроса.
+
+    Категории загружаются одним списком в порядке сортировки и раскладываются
+    по родителям в памяти. Если only_active, неактивная категория скрывает
+    и все свое поддерево.
 
     Args:
         session: сессия базы данных
@@ -181,28 +225,31 @@ async def get_category_tree(session: AsyncSession, only_active: bool = True) ->
     Returns:
         CategoryWithChildren список корневых категорий с вложенными дочерними элементами
     """
-    root_categories = await categories_repository.get_root_categories(session=session, only_active=only_active)
-
-    async def build_tree(category: Category) -> CategoryWithChildren:
-        children = await categories_repository.get_children(
-            session=session, parent_id=category.id, only_active=only_active
-        )
-
-        children_tree = [await build_tree(child) for child in children]
-
-        category_dict = CategoryResponse.model_validate(category).model_dump()
-        category_dict["children"] = children_tree
-        return CategoryWithChildren(**category_dict)
-
-    return [await build_tree(cat) for cat in root_categories]
-
-
-async def delete_category_by_id(session: AsyncSession, category_id: int) -> None:
+    categories = await categories_repository.get_categories_for_tree(session=session, only_active=only_active)
+
+    nodes = {
+        category.id: CategoryWithChildren(**CategoryResponse.model_validate(category).model_dump())
+        for category in categories
+    }
+    roots: list[CategoryWithChildren] = []
+    for category in categories:
+        if category.parent_id is None:
+            roots.append(nodes[category.id])
+        elif category.parent_id in nodes:
+            nodes[category.parent_id].children.append(nodes[category.id])
+    return roots
+
+
+async def delete_category_by_id(session: AsyncSession, redis: Redis, category_id: int) -> None:
     """
     Удаляет категорию по ID и ее изображение.
 
+    У товаров категории меняются category_ids, от которых зависят категорийные скидки,
+    поэтому их карточки пересобираются, а краткие данные удаляются из кэша.
+
     Args:
         session: сессия базы данных
+        redis: клиент Redis
         category_id: идентификатор категории
 
     Returns:
@@ -222,9 +269,12 @@ async def delete_category_by_id(session: AsyncSession, category_id: int) -> None
         if file_path.exists():
             file_path.unlink()
 
+    product_ids = await product_cards_repository.get_product_ids_by_category(session=session, category_id=category_id)
     deleted = await categories_repository.delete_category(session=session, category_id=category_id)
     if not deleted:
         raise CategoryNotExistsError(category_id=category_id)
+    await product_cards_service.refresh_product_cards(session=session, product_ids=product_ids)
+    await products_service.invalidate_product_summaries(session=session, redis=redis, product_ids=product_ids)
 
 
 async def delete_image(*, session: AsyncSession, category_id: int) -> CategoryResponse:
@@ -306,8 +356,8 @@ async def _check_circular_dependency(session: AsyncSession, category_id: int, pa
     """
     Проверяет наличие циклической зависимости при назначении нового родителя категории.
 
-    Поднимается по цепочке родителей от parent_id вверх. Если на пути встречается
-    category_id — значит, назначение создаст цикл.
+    Назначение создаст цикл, если parent_id — сама категория или ее потомок;
+    это одна проверка пары по первичному ключу category_closure.
 
     Args:
         session: сессия базы данных
@@ -317,22 +367,4 @@ async def _check_circular_dependency(session: AsyncSession, category_id: int, pa
     Returns:
         True, если обнаружен цикл, иначе False
     """
-    if category_id == parent_id:
-        return True
-
-    current_id = parent_id
-    visited = {category_id}
-
-    while current_id is not None:
-        if current_id in visited:
-            return True
-
-        visited.add(current_id)
-
-        parent = await categories_repository.get_category_by_id(session, current_id)
-        if not parent:
-            break
-
-        current_id = parent.parent_id
-
-    return False
+    return await categories_repository.is_descendant(session=session, ancestor_id=category_id, descendant_id=parent_id)
@@ -10,6 +10,8 @@ from app.models.discounts_model import Discount, DiscountType
 from app.models.products_model import Product
 from app.repository import discounts_repository
 from app.schemas.discounts_schema import DiscountCreate, DiscountResponse, DiscountUpdate
+from app.schemas.products_schema import ProductSummary
+from app.service import product_cards_service
 
 
 async def create_discount(*, session: AsyncSession, discount_data: DiscountCreate) -> DiscountResponse:
@@ -40,6 +42,7 @@ async def create_discount(*, session: AsyncSession, discount_data: DiscountCreat
     data["discount_type"] = discount_type
 
     discount = await discounts_repository.create_discount(session=session, discount_data=DiscountCreate(**data))
+    await _refresh_discount_product_cards(session=session, discount=discount)
     return DiscountResponse.model_validate(discount)
 
 
@@ -110,6 +113,7 @@ async def update_discount(
     )
     if not discount:
         raise DiscountNotFoundError(discount_id=discount_id)
+    await _refresh_discount_product_cards(session=session, discount=discount)
     return DiscountResponse.model_validate(discount)
 
 
@@ -134,6 +138,7 @@ async def delete_discount(*, session: AsyncSession, discount_id: int) -> None:
     deleted = await discounts_repository.delete_discount(session=session, discount_id=discount_id)
     if not deleted:
         raise DiscountNotFoundError(discount_id=discount_id)
+    await _refresh_discount_product_cards(session=session, discount=existing)
 
 
 async def enrich_products(
@@ -152,10 +157,53 @@ async def enrich_products(
     Returns:
         Словарь {product_id: (цена со скидкой, скидка)} — значения (None, None), если скидки нет.
     """
-    if not products:
+    entries = [
+        (
+            p.id,
+            p.price,
+            [cat.id for cat in p.categories] if hasattr(p, "categories") and p.categories else [],
+        )
+        for p in products
+    ]
+    return await _resolve_discounts(session=session, entries=entries)
+
+
+async def enrich_product_summaries(
+    *, session: AsyncSession, summaries: Sequence[ProductSummary]
+) -> dict[int, tuple[Decimal | None, Discount | None]]:
+    """
+    Дополняет краткие данные товаров информацией о скидках.
+
+    Работает как enrich_products, но не требует загруженных ORM-связей товара.
+
+    Args:
+        session: сессия базы данных
+        summaries: краткие данные товаров
+
+    Returns:
+        Словарь {product_id: (цена со скидкой, скидка)} — значения (None, None), если скидки нет.
+    """
+    entries = [(s.id, s.price, s.category_ids) for s in summaries]
+    return await _resolve_discounts(session=session, entries=entries)
+
+
+async def _resolve_discounts(
+    *, session: AsyncSession, entries: Sequence[tuple[int, Decimal, Sequence[int]]]
+) -> dict[int, tuple[Decimal | None, Discount | None]]:
+    """
+    Подбирает активные скидки для товаров двумя запросами: по товарам и по категориям.
+
+    Args:
+        session: сессия базы данных
+        entries: кортежи (product_id, базовая цена, идентификаторы категорий)
+
+    Returns:
+        Словарь {product_id: (цена со скидкой, скидка)}
+    """
+    if not entries:
         return {}
 
-    product_ids = [p.id for p in products]
+    product_ids = [product_id for product_id, _, _ in entries]
 
     product_discounts = await discounts_repository.get_active_for_products(session=session, product_ids=product_ids)
 
@@ -165,10 +213,8 @@ async def enrich_products(
             product_discount_map[d.product_id] = d
 
     all_category_ids: set[int] = set()
-    for p in products:
-        if hasattr(p, "categories") and p.categories:
-            for cat in p.categories:
-                all_category_ids.add(cat.id)
+    for _, _, category_ids in entries:
+        all_category_ids.update(category_ids)
 
     category_discounts = await discounts_repository.get_active_for_category_ids(
         session=session, category_ids=list(all_category_ids)
@@ -181,23 +227,37 @@ async def enrich_products(
 
     result: dict[int, tuple[Decimal | None, Discount | None]] = {}
 
-    for p in products:
-        discount = product_discount_map.get(p.id)
+    for product_id, price, category_ids in entries:
+        discount = product_discount_map.get(product_id)
 
-        if not discount and hasattr(p, "categories") and p.categories:
-            for cat in p.categories:
-                if cat.id in category_discount_map:
-                    discount = category_discount_map[cat.id]
+        if not discount:
+            for category_id in category_ids:
+                if category_id in category_discount_map:
+                    discount = category_discount_map[category_id]
                     break
 
         if discount:
-            result[p.id] = (_apply_discount(p.price, discount), discount)
+            result[product_id] = (_apply_discount(price, discount), discount)
         else:
-            result[p.id] = (None, None)
+            result[product_id] = (None, None)
 
     return result
 
 
+async def _refresh_discount_product_cards(*, session: AsyncSession, discount: Discount) -> None:
+    """
+    Пересобирает карточки товаров, на цену которых влияет акция.
+
+    Args:
+        session: сессия базы данных
+        discount: созданная, измененная или удаленная акция
+    """
+    if discount.product_id is not None:
+        await product_cards_service.refresh_product_cards(session=session, product_ids=[discount.product_id])
+    elif discount.category_id is not None:
+        await product_cards_service.refresh_category_product_cards(session=session, category_id=discount.category_id)
+
+
 def _calc_percentage(original_price: Decimal, new_price: Decimal) -> Decimal:
     """
     Вычисляет процент скидки по исходной и новой цене.
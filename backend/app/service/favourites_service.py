@@ -1,25 +1,31 @@
 from collections.abc import Sequence
 
+from redis.asyncio import Redis
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import (
     FavouriteItemAlreadyExistsError,
     FavouriteItemNotFoundError,
-    ProductNotFoundError,
 )
 from app.repository import favourites_repository, products_repository
 from app.schemas.favourites_schema import FavouriteResponse
+from app.schemas.products_schema import ProductResponse
+from app.service import product_cards_service, products_service
 
 
 async def add_to_favourite(
-    *, session: AsyncSession, product_id: int, user_id: int
+    *, session: AsyncSession, redis: Redis, product_id: int, user_id: int
 ) -> FavouriteResponse:
     """
     Добавляет товар в избранный список товаров пользователя.
 
+    Существование товара проверяется по кэшу кратких данных, ответ собирается из готовой
+    карточки товара; полная загрузка товара со связями нужна, только если карточки еще нет.
+
     Args:
         session: сессия базы данных
+        redis: клиент Redis
         product_id: идентификатор товара
         user_id: идентификатор пользователя
 
@@ -30,11 +36,9 @@ async def add_to_favourite(
         ProductNotFoundError: если товар не найден
         FavouriteItemAlreadyExistsError: если товар уже находится в списке избранных
     """
-    product_exist = await products_repository.get_product(
-        session=session, product_id=product_id
+    await products_service.get_product_summary(
+        session=session, redis=redis, product_id=product_id
     )
-    if product_exist is None:
-        raise ProductNotFoundError(product_id=product_id)
 
     favourite_exist = await favourites_repository.get_favourite_by_product(
         session=session, user_id=user_id, product_id=product_id
@@ -49,7 +53,17 @@ async def add_to_favourite(
     except IntegrityError:
         await session.rollback()
         raise FavouriteItemAlreadyExistsError(product_id=product_id) from None
-    return FavouriteResponse.model_validate(favourite)
+
+    product = await product_cards_service.get_product_card(
+        session=session, product_id=product_id
+    )
+    if product is None:
+        product = ProductResponse.model_validate(
+            await products_repository.get_product_by_id(
+                session=session, product_id=product_id
+            )
+        )
+    return FavouriteResponse(id=favourite.id, product=product)
 
 
 async def get_favourite_list(
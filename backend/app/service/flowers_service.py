@@ -1,15 +1,17 @@
 from collections.abc import Sequence
 
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import FlowerNotFoundError, ProductNotFoundError
-from app.repository import flowers_repository
+from app.repository import flowers_repository, product_cards_repository
 from app.schemas.flowers_schema import (
     CompositionItem,
     FlowerCreate,
     FlowerResponse,
     FlowerUpdate,
 )
+from app.service import inventory_service, pricing_service, product_cards_service
 
 
 async def create_flower(*, session: AsyncSession, flower_data: FlowerCreate) -> FlowerResponse:
@@ -29,21 +31,31 @@ async def get_flowers(*, session: AsyncSession) -> Sequence[FlowerResponse]:
     return [FlowerResponse.model_validate(f) for f in flowers]
 
 
-async def update_flower(*, session: AsyncSession, flower_id: int, flower_data: FlowerUpdate) -> FlowerResponse:
+async def update_flower(
+    *, session: AsyncSession, redis: Redis, flower_id: int, flower_data: FlowerUpdate
+) -> FlowerResponse:
     flower = await flowers_repository.update_flower(session=session, flower_id=flower_id, flower_data=flower_data)
     if flower is None:
         raise FlowerNotFoundError(flower_id=flower_id)
+    await product_cards_service.refresh_flower_product_cards(session=session, flower_id=flower_id)
+    if flower_data.price is not None:
+        await pricing_service.reprice_products(session=session, redis=redis, flower_ids=[flower_id])
     return FlowerResponse.model_validate(flower)
 
 
-async def delete_flower(*, session: AsyncSession, flower_id: int) -> bool:
+async def delete_flower(*, session: AsyncSession, redis: Redis, flower_id: int) -> bool:
+    product_ids = await product_cards_repository.get_product_ids_by_flower(session=session, flower_id=flower_id)
     deleted = await flowers_repository.delete_flower(session=session, flower_id=flower_id)
     if not deleted:
         raise FlowerNotFoundError(flower_id=flower_id)
+    await product_cards_service.refresh_product_cards(session=session, product_ids=product_ids)
+    await pricing_service.reprice_products(session=session, redis=redis, product_ids=product_ids)
     return True
 
 
-async def set_product_composition(*, session: AsyncSession, product_id: int, items: list[CompositionItem]) -> None:
+async def set_product_composition(
+    *, session: AsyncSession, redis: Redis, product_id: int, items: list[CompositionItem]
+) -> None:
     product = await flowers_repository.get_product_for_composition(session=session, product_id=product_id)
     if product is None:
         raise ProductNotFoundError(product_id=product_id)
@@ -54,3 +66,6 @@ async def set_product_composition(*, session: AsyncSession, product_id: int, ite
             raise FlowerNotFoundError(flower_id=item.flower_id)
 
     await flowers_repository.set_product_composition(session=session, product_id=product_id, items=items)
+    await product_cards_service.refresh_product_cards(session=session, product_ids=[product_id])
+    await inventory_service.recompute_bouquet_availability(session=session, redis=redis, product_ids=[product_id])
+    await pricing_service.reprice_products(session=session, redis=redis, product_ids=[product_id])
@@ -0,0 +1,314 @@
+from collections.abc import Mapping, Sequence
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ProductOutOfStockError
+from app.repository import inventory_repository
+from app.schemas.inventory_schema import (
+    BouquetAvailability,
+    FlowerStockAdjustRequest,
+    FlowerStockSetRequest,
+    FlowerStockUpdateResponse,
+    StockAdjustRequest,
+    StockSetRequest,
+    StockUpdateResponse,
+)
+from app.schemas.products_schema import ProductSummary
+from app.service import pickups_service, product_cards_service, products_service
+
+
+async def set_stock(*, session: AsyncSession, redis: Redis, data: StockSetRequest) -> StockUpdateResponse:
+    """
+    Устанавливает остатки списка товаров одним запросом.
+
+    Без точки самовывоза меняется общий остаток товара, а in_stock становится quantity > 0.
+    С точкой самовывоза меняются только остатки на ней.
+
+    Args:
+        session: сессия базы данных
+        redis: клиент Redis
+        data: точка самовывоза и новые остатки товаров
+
+    Returns:
+        StockUpdateResponse с количеством обновленных и списком несуществующих товаров
+
+    Raises:
+        PickupPointNotFoundError: если точка самовывоза не найдена
+    """
+    items = [(item.product_id, item.quantity) for item in data.items]
+    if data.pickup_point_id is None:
+        updated = await inventory_repository.set_product_stock(session=session, items=items)
+        await _refresh_products(session=session, redis=redis, product_ids=updated)
+    else:
+        await pickups_service.get_pickup_point_by_id(session, data.pickup_point_id)
+        updated = await inventory_repository.get_existing_product_ids(
+            session=session, product_ids=[product_id for product_id, _ in items]
+        )
+        if updated:
+            existing = set(updated)
+            await inventory_repository.set_pickup_point_stock(
+                session=session,
+                pickup_point_id=data.pickup_point_id,
+                items=[item for item in items if item[0] in existing],
+            )
+    return _build_stock_update_response(items=items, updated=updated)
+
+
+async def adjust_stock(*, session: AsyncSession, redis: Redis, data: StockAdjustRequest) -> StockUpdateResponse:
+    """
+    Изменяет остатки списка товаров на заданные величины одним запросом.
+
+    Остаток не опускается ниже нуля. Товар без учета остатка начинает учитываться с нуля.
+
+    Args:
+        session: сессия базы данных
+        redis: клиент Redis
+        data: точка самовывоза и изменения остатков товаров
+
+    Returns:
+        StockUpdateResponse с количеством обновленных и списком несуществующих товаров
+
+    Raises:
+        PickupPointNotFoundError: если точка самовывоза не найдена
+    """
+    items = [(item.product_id, item.delta) for item in data.items]
+    if data.pickup_point_id is None:
+        updated = await inventory_repository.adjust_product_stock(session=session, items=items)
+        await _refresh_products(session=session, redis=redis, product_ids=updated)
+    else:
+        await pickups_service.get_pickup_point_by_id(session, data.pickup_point_id)
+        updated = await inventory_repository.get_existing_product_ids(
+            session=session, product_ids=[product_id for product_id, _ in items]
+        )
+        if updated:
+            existing = set(updated)
+            await inventory_repository.adjust_pickup_point_stock(
+                session=session,
+                pickup_point_id=data.pickup_point_id,
+                items=[item for item in items if item[0] in existing],
+            )
+    return _build_stock_update_response(items=items, updated=updated)
+
+
+async def set_flower_stock(
+    *, session: AsyncSession, redis: Redis, data: FlowerStockSetRequest
+) -> FlowerStockUpdateResponse:
+    """
+    Устанавливает остатки цветов одним запросом и пересчитывает наличие букетов с этими цветами.
+
+    Args:
+        session: сессия базы данных
+        redis: клиент Redis
+        data: новые остатки цветов
+
+    Returns:
+        FlowerStockUpdateResponse с обновленными цветами и букетами, наличие которых изменилось
+    """
+    items = [(item.flower_id, item.quantity) for item in data.items]
+    updated = await inventory_repository.set_flower_stock(session=session, items=items)
+    changed = await recompute_bouquet_availability(session=session, redis=redis, flower_ids=updated)
+    return _build_flower_stock_update_response(items=items, updated=updated, changed=changed)
+
+
+async def adjust_flower_stock(
+    *, session: AsyncSession, redis: Redis, data: FlowerStockAdjustRequest
+) -> FlowerStockUpdateResponse:
+    """
+    Изменяет остатки цветов на заданные величины и пересчитывает наличие букетов с этими цветами.
+
+    Остаток не опускается ниже нуля. Цветок без учета остатка начинает учитываться с нуля.
+
+    Args:
+        session: сессия базы данных
+        redis: клиент Redis
+        data: изменения остатков цветов
+
+    Returns:
+        FlowerStockUpdateResponse с обновленными цветами и букетами, наличие которых изменилось
+    """
+    items = [(item.flower_id, item.delta) for item in data.items]
+    updated = await inventory_repository.adjust_flower_stock(session=session, items=items)
+    changed = await recompute_bouquet_availability(session=session, redis=redis, flower_ids=updated)
+    return _build_flower_stock_update_response(items=items, updated=updated, changed=changed)
+
+
+async def get_bouquet_availability(
+    *, session: AsyncSession, product_ids: Sequence[int] | None = None
+) -> list[BouquetAvailability]:
+    """
+    Возвращает, сколько букетов можно собрать из текущих остатков цветов.
+
+    Количество — минимум по составу букета из остатка цветка, деленного на его количество
+    в букете. Букеты, в составе которых нет цветов с учетом остатка, в ответ не попадают.
+
+    Args:
+        session: сессия базы данных
+        product_ids: идентификаторы букетов; None — все букеты
+
+    Returns:
+        list[BouquetAvailability] количество букетов по идентификаторам
+    """
+    rows = await inventory_repository.get_bouquet_capacities(session=session, product_ids=product_ids)
+    return [BouquetAvailability(product_id=row.product_id, capacity=row.capacity) for row in rows]
+
+
+async def recompute_bouquet_availability(
+    *,
+    session: AsyncSession,
+    redis: Redis,
+    flower_ids: Sequence[int] | None = None,
+    product_ids: Sequence[int] | None = None,
+) -> Sequence[int]:
+    """
+    Обновляет наличие букетов по остаткам цветов.
+
+    Проверяются только букеты с указанными цветами или указанные букеты, одним UPDATE
+    по сгруппированному составу. Букет, который не из чего собрать, снимается с продажи
+    и помечается auto_closed; после пополнения цветов такие букеты возвращаются в продажу.
+    Букеты, закрытые администратором, пересчет не открывает.
+    Заказать открытый букет больше, чем можно собрать, не дает проверка при оформлении заказа.
+
+    Args:
+        session: сессия базы данных
+        redis: клиент Redis для сброса кэша кратких данных товаров
+        flower_ids: цветы, остатки которых изменились
+        product_ids: букеты, состав которых изменился
+
+    Returns:
+        Sequence[int] букеты, снятые с продажи или возвращенные в продажу
+    """
+    if flower_ids is not None and not flower_ids:
+        return []
+    changed = await inventory_repository.sync_bouquets_availability(
+        session=session, flower_ids=flower_ids, product_ids=product_ids
+    )
+    await _refresh_products(session=session, redis=redis, product_ids=changed)
+    return changed
+
+
+async def get_available_products(
+    *, session: AsyncSession, quantities: Mapping[int, int], pickup_point_id: int | None
+) -> list[ProductSummary]:
+    """
+    Загружает товары заказа и одним запросом проверяет, что их можно заказать.
+
+    Товар доступен, если он активен, в наличии и его остатка (общего и на точке
+    самовывоза, если они учитываются) хватает на заказанное количество.
+
+    Args:
+        session: сессия базы данных
+        quantities: заказываемое количество по идентификаторам товаров
+        pickup_point_id: точка самовывоза заказа
+
+    Returns:
+        list[ProductSummary] краткие данные товаров
+
+    Raises:
+        ProductOutOfStockError: если какой-либо товар недоступен или не существует
+    """
+    rows = await inventory_repository.get_order_availability(
+        session=session, quantities=quantities, pickup_point_id=pickup_point_id
+    )
+    found = {row.id for row in rows}
+    unavailable = [row.id for row in rows if not row.available]
+    unavailable.extend(product_id for product_id in quantities if product_id not in found)
+    if unavailable:
+        raise ProductOutOfStockError(product_ids=unavailable)
+
+    return [
+        ProductSummary(
+            id=row.id,
+            price=row.price,
+            in_stock=row.in_stock,
+            is_active=row.is_active,
+            category_ids=row.category_ids or [],
+        )
+        for row in rows
+    ]
+
+
+async def decrement_stock_for_order(
+    *, session: AsyncSession, redis: Redis, order_id: int, pickup_point_id: int | None
+) -> Sequence[int]:
+    """
+    Списывает остатки товаров оплаченного заказа.
+
+    Списание — один UPDATE по позициям заказа для товаров и один для цветов их состава
+    в транзакции отметки оплаты; остаток не опускается ниже нуля, товары без остатка
+    и букеты, которые больше не из чего собрать, снимаются с продажи.
+
+    Args:
+        session: сессия базы данных
+        redis: клиент Redis для сброса кэша кратких данных товаров
+        order_id: идентификатор заказа
+        pickup_point_id: точка самовывоза заказа
+
+    Returns:
+        Sequence[int] товары, снятые с продажи
+    """
+    sold_out = await inventory_repository.decrement_stock_for_order(
+        session=session, order_id=order_id, pickup_point_id=pickup_point_id
+    )
+    await _refresh_products(session=session, redis=redis, product_ids=sold_out)
+
+    flower_ids = await inventory_repository.decrement_flower_stock_for_order(session=session, order_id=order_id)
+    closed = await recompute_bouquet_availability(session=session, redis=redis, flower_ids=flower_ids)
+    return list({*sold_out, *closed})
+
+
+async def restore_stock_for_order(
+    *, session: AsyncSession, redis: Redis, order_id: int, pickup_point_id: int | None
+) -> Sequence[int]:
+    """
+    Возвращает на склад остатки товаров и цветов отмененного оплаченного заказа.
+
+    Обратная операция к decrement_stock_for_order. Товары, закончившиеся по остатку,
+    и букеты, снятые из-за нехватки цветов, снова поступают в продажу; товары,
+    закрытые вручную, остаются закрытыми.
+
+    Args:
+        session: сессия базы данных
+        redis: клиент Redis для сброса кэша кратких данных товаров
+        order_id: идентификатор заказа
+        pickup_point_id: точка самовывоза заказа
+
+    Returns:
+        Sequence[int] товары, остаток или наличие которых изменились
+    """
+    restored = await inventory_repository.restore_stock_for_order(
+        session=session, order_id=order_id, pickup_point_id=pickup_point_id
+    )
+    await _refresh_products(session=session, redis=redis, product_ids=restored)
+
+    flower_ids = await inventory_repository.restore_flower_stock_for_order(session=session, order_id=order_id)
+    reopened = await recompute_bouquet_availability(session=session, redis=redis, flower_ids=flower_ids)
+    return list({*restored, *reopened})
+
+
+async def _refresh_products(*, session: AsyncSession, redis: Redis, product_ids: Sequence[int]) -> None:
+    if not product_ids:
+        return
+    await product_cards_service.refresh_product_cards(session=session, product_ids=product_ids)
+    await products_service.invalidate_product_summaries(session=session, redis=redis, product_ids=product_ids)
+
+
+def _build_stock_update_response(
+    *, items: Sequence[tuple[int, int]], updated: Sequence[int]
+) -> StockUpdateResponse:
+    found = set(updated)
+    return StockUpdateResponse(
+        updated=len(found),
+        not_found_product_ids=[product_id for product_id, _ in items if product_id not in found],
+    )
+
+
+def _build_flower_stock_update_response(
+    *, items: Sequence[tuple[int, int]], updated: Sequence[int], changed: Sequence[int]
+) -> FlowerStockUpdateResponse:
+    found = set(updated)
+    return FlowerStockUpdateResponse(
+        updated=len(found),
+        not_found_flower_ids=[flower_id for flower_id, _ in items if flower_id not in found],
+        changed_product_ids=list(changed),
+    )
@@ -1,34 +1,70 @@
+import asyncio
+import csv
+import io
+import json
 import uuid
+from collections.abc import AsyncIterator, Sequence
 from datetime import UTC, datetime
 from decimal import Decimal
+from functools import partial
+from typing import Any
 
 from fastapi_pagination import Page
 from fastapi_pagination.ext.sqlalchemy import paginate
+from redis.asyncio import Redis
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.exceptions import (
     CartNotFoundError,
     EmptyCartError,
     InsufficientPermissionError,
+    InvalidDateRangeError,
     OrderNotFoundError,
     OrderNotUpdatedError,
-    ProductOutOfStockError,
 )
+from app.core.pubsub import pubsub_dispatcher
+from app.db.session import AsyncSessionLocal, call_after_commit
 from app.models.orders_model import Order, Status
 from app.models.users_model import Role, User
-from app.repository import carts_repository, orders_repository, products_repository
+from app.repository import carts_repository, orders_repository
 from app.schemas.orders_schema import (
     CreateOrderRequest,
+    OrderExportFormat,
     OrderResponse,
     OrderResponseWithPayment,
+    OrderStatusEvent,
     WebhookPayload,
 )
-from app.service import discounts_service, payments_service, pickups_service
+from app.service import (
+    analytics_service,
+    discounts_service,
+    inventory_service,
+    payments_service,
+    pickups_service,
+)
+
+ORDER_EXPORT_BATCH_SIZE = 1000
+ORDER_EXPORT_COLUMNS = (
+    "id",
+    "created_at",
+    "paid_at",
+    "status",
+    "user_id",
+    "total_price",
+    "method_of_receipt",
+    "pickup_point_id",
+    "payment_id",
+    "delivery_address",
+    "order_item",
+)
 
 
 async def create_order(
     *,
     session: AsyncSession,
+    redis: Redis,
     data: CreateOrderRequest,
     user_id: int,
     idempotency_key: uuid.UUID,
@@ -39,6 +75,7 @@ async def create_order(
 
     Args:
         session: сессия базы данных
+        redis: клиент Redis
         data: данные для создания заказа
         user_id: идентификатор пользователя
         idempotency_key: уникальный ключ, чтобы не создавать дубликаты заказа и оплаты
@@ -50,6 +87,7 @@ async def create_order(
     Raises:
         CartNotFoundError: если корзина пользователя не найдена
         EmptyCartError: если корзина пустая
+        ProductOutOfStockError: если товара нет в наличии или его остатка не хватает
     """
     await orders_repository.acquire_user_order_lock(session=session, user_id=user_id)
 
@@ -63,14 +101,14 @@ async def create_order(
     if data.pickup_point_id is not None:
         await pickups_service.validate_pickup_point(session=session, pickup_point_id=data.pickup_point_id)
 
-    product_ids = [item.product_id for item in cart.cart_item]
-    products = await products_repository.get_products_by_ids(session=session, product_ids=product_ids)
-
-    out_of_stock = [p for p in products if not p.in_stock]
-    if out_of_stock:
-        raise ProductOutOfStockError(product_ids=[p.id for p in out_of_stock])
+    quantities: dict[int, int] = {}
+    for item in cart.cart_item:
+        quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+    products = await inventory_service.get_available_products(
+        session=session, quantities=quantities, pickup_point_id=data.pickup_point_id
+    )
 
-    discount_map = await discounts_service.enrich_products(session=session, products=products)
+    discount_map = await discounts_service.enrich_product_summaries(session=session, summaries=products)
 
     product_base_prices = {p.id: p.price for p in products}
     price_map: dict[int, Decimal] = {}
@@ -88,6 +126,7 @@ async def create_order(
                 return _build_response_with_payment(pending_order, pending_order.payment_id, confirmation_url)
 
         await orders_repository.update_order_status(session=session, order_id=pending_order.id, status=Status.CANCELLED)
+        _publish_after_commit(session=session, redis=redis, order_id=pending_order.id, status=Status.CANCELLED)
 
     order = await orders_repository.create_order(
         session=session,
@@ -106,31 +145,122 @@ async def create_order(
     return _build_response_with_payment(order, payment_id, confirmation_url)
 
 
-async def process_webhook(*, session: AsyncSession, payload: WebhookPayload) -> None:
+async def process_webhook(*, session: AsyncSession, redis: Redis, payload: WebhookPayload) -> Order | None:
     """
-    Если оплата прошла, то помечает заказ как оплаченный и очищает корзину пользователя.
+    Если оплата прошла, то помечает заказ как оплаченный, списывает остатки и очищает корзину пользователя.
     Если оплату отменили, то обновляет статус заказа как отмененный.
 
     Args:
         session: сессия базы данных
+        redis: клиент Redis
         payload: данные об уведомлении от юkassa
     Returns:
-        None
+        Order | None: заказ, если его статус изменился
     """
     order = await orders_repository.get_order_by_payment_id(session=session, payment_id=payload.object.id)
     if order is None:
-        return
+        return None
 
     if order.status != Status.PENDING:
-        return  # Already processed — idempotent
+        return None  # Already processed — idempotent
 
     if payload.event == "payment.succeeded":
-        await orders_repository.mark_order_paid(session=session, order_id=order.id)
+        updated = await orders_repository.mark_order_paid(session=session, order_id=order.id)
+        await inventory_service.decrement_stock_for_order(
+            session=session, redis=redis, order_id=order.id, pickup_point_id=order.pickup_point_id
+        )
+        await analytics_service.register_paid_order(session=session, order_id=order.id)
         cart = await carts_repository.get_cart_by_user_id(session=session, user_id=order.user_id)
         if cart is not None:
             await carts_repository.clear_cart(session=session, cart_id=cart.id)
-    elif payload.event == "payment.canceled":
-        await orders_repository.update_order_status(session=session, order_id=order.id, status=Status.CANCELLED)
+        return updated
+    if payload.event == "payment.canceled":
+        return await orders_repository.update_order_status(
+            session=session, order_id=order.id, status=Status.CANCELLED
+        )
+    return None
+
+
+async def publish_order_status(*, redis: Redis, order_id: int, status: Status) -> None:
+    """
+    Сохраняет последний статус заказа и уведомляет подписчиков SSE-потока.
+
+    Вызывается после фиксации транзакции при любой смене статуса, чтобы клиент не увидел
+    статус, который еще может откатиться.
+
+    Args:
+        redis: клиент Redis
+        order_id: идентификатор заказа
+        status: новый статус заказа
+    """
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.set(_order_status_key(order_id), status.value, ex=settings.ORDER_STATUS_TTL)
+        pipe.publish(_order_channel(order_id), status.value)
+        await pipe.execute()
+
+
+async def get_order_status_for_events(*, session: AsyncSession, order_id: int, current_user: User) -> Status:
+    """
+    Проверяет доступ к заказу и возвращает его текущий статус для SSE-потока.
+
+    Args:
+        session: сессия базы данных
+        order_id: идентификатор заказа
+        current_user: текущий пользователь
+
+    Returns:
+        Status: статус заказа
+
+    Raises:
+        OrderNotFoundError: если заказ не найден
+        InsufficientPermissionError: если заказ принадлежит другому пользователю
+    """
+    row = await orders_repository.get_order_owner_and_status(session=session, order_id=order_id)
+    if row is None:
+        raise OrderNotFoundError(order_id=order_id)
+    if row.user_id != current_user.id and current_user.role != Role.ADMIN:
+        raise InsufficientPermissionError()
+    return row.status
+
+
+async def stream_order_events(*, redis: Redis, order_id: int, status: Status) -> AsyncIterator[str]:
+    """
+    SSE-поток статуса заказа: текущий статус сразу, затем смена статуса ожиданием.
+
+    Статус из базы данных главный. Статус из Redis используется, только если база вернула
+    pending: ожидание регистрируется в общем pub/sub процесса до чтения Redis, поэтому смена
+    статуса, зафиксированная между проверкой доступа и подпиской, не теряется.
+    Поток закрывается после первого статуса, отличного от pending, или по ORDER_EVENTS_TIMEOUT.
+
+    Args:
+        redis: клиент Redis
+        order_id: идентификатор заказа
+        status: статус заказа, прочитанный из базы данных при проверке доступа
+
+    Yields:
+        str: SSE-сообщения и комментарии-пинги
+    """
+    loop = asyncio.get_running_loop()
+    with pubsub_dispatcher.listen(_order_channel(order_id)) as changed:
+        if status == Status.PENDING:
+            cached = await redis.get(_order_status_key(order_id))
+            if cached is not None:
+                status = Status(cached)
+        yield _format_order_event(order_id=order_id, status=status)
+        if status != Status.PENDING:
+            return
+
+        deadline = loop.time() + settings.ORDER_EVENTS_TIMEOUT
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                data = await asyncio.wait_for(
+                    asyncio.shield(changed), timeout=min(remaining, settings.ORDER_EVENTS_KEEPALIVE)
+                )
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield _format_order_event(order_id=order_id, status=Status(data))
+            return
 
 
 async def get_orders(session: AsyncSession, user_id: int) -> Page[OrderResponse]:
@@ -143,8 +273,8 @@ async def get_orders(session: AsyncSession, user_id: int) -> Page[OrderResponse]
     Returns:
         Page[OrderResponse] список заказов пользователя
     """
-    query = orders_repository.get_orders_query(user_id=user_id)
-    return await paginate(session, query)
+    query = orders_repository.get_order_rows_query(user_id=user_id)
+    return await paginate(session, query, transformer=_build_order_responses)
 
 
 async def get_order_by_id(session: AsyncSession, order_id: int, current_user: User) -> OrderResponse:
@@ -165,12 +295,13 @@ async def get_order_by_id(session: AsyncSession, order_id: int, current_user: Us
     return OrderResponse.model_validate(order)
 
 
-async def update_order_status(session: AsyncSession, order_id: int, status: Status) -> OrderResponse:
+async def update_order_status(session: AsyncSession, redis: Redis, order_id: int, status: Status) -> OrderResponse:
     """
     Изменяет статус заказа.
 
     Args:
         session: сессия базы данных
+        redis: клиент Redis
         order_id: идентификатор заказа
         status: новый статус заказа
     Returns:
@@ -180,28 +311,49 @@ async def update_order_status(session: AsyncSession, order_id: int, status: Stat
         OrderNotFoundError: если заказ не найден
         OrderNotUpdatedError: если не удалось обновить статус
     """
-    order = await orders_repository.get_order_by_id(session=session, order_id=order_id)
+    order = await orders_repository.get_order_by_id_for_update(session=session, order_id=order_id)
     if order is None:
         raise OrderNotFoundError(order_id=order_id)
+    was_counted = _is_counted_in_sales(status=order.status, paid_at=order.paid_at)
     updated = await orders_repository.update_order_status(session=session, order_id=order_id, status=status)
     if updated is None:
         raise OrderNotUpdatedError(order_id=order_id)
 
+    is_counted = _is_counted_in_sales(status=status, paid_at=updated.paid_at)
+    if was_counted and not is_counted:
+        await analytics_service.revert_paid_order(session=session, order_id=order_id)
+        await inventory_service.restore_stock_for_order(
+            session=session, redis=redis, order_id=order_id, pickup_point_id=updated.pickup_point_id
+        )
+    elif is_counted and not was_counted:
+        await analytics_service.register_paid_order(session=session, order_id=order_id)
+        await inventory_service.decrement_stock_for_order(
+            session=session, redis=redis, order_id=order_id, pickup_point_id=updated.pickup_point_id
+        )
+
+    _publish_after_commit(session=session, redis=redis, order_id=order_id, status=updated.status)
     return OrderResponse.model_validate(updated)
 
 
-async def cancel_order(session: AsyncSession, order_id: int, user_id: int) -> OrderResponse:
-    order = await orders_repository.get_order_by_id(session=session, order_id=order_id)
+async def cancel_order(session: AsyncSession, redis: Redis, order_id: int, user_id: int) -> OrderResponse:
+    order = await orders_repository.get_order_by_id_for_update(session=session, order_id=order_id)
     if order is None:
         raise OrderNotFoundError(order_id=order_id)
     if order.user_id != user_id:
         raise InsufficientPermissionError()
     if order.status not in (Status.PENDING, Status.PAID):
         raise OrderNotUpdatedError(order_id=order_id)
+    was_counted = _is_counted_in_sales(status=order.status, paid_at=order.paid_at)
 
     updated = await orders_repository.update_order_status(session=session, order_id=order_id, status=Status.CANCELLED)
     if updated is None:
         raise OrderNotUpdatedError(order_id=order_id)
+    if was_counted:
+        await analytics_service.revert_paid_order(session=session, order_id=order_id)
+        await inventory_service.restore_stock_for_order(
+            session=session, redis=redis, order_id=order_id, pickup_point_id=updated.pickup_point_id
+        )
+    _publish_after_commit(session=session, redis=redis, order_id=order_id, status=Status.CANCELLED)
     return OrderResponse.model_validate(updated)
 
 
@@ -214,8 +366,8 @@ async def get_all_orders(session: AsyncSession) -> Page[OrderResponse]:
     Returns:
         Page[OrderResponse] список заказов
     """
-    query = orders_repository.get_all_orders_query()
-    return await paginate(session, query)
+    query = orders_repository.get_order_rows_query()
+    return await paginate(session, query, transformer=_build_order_responses)
 
 
 async def get_all_paid_orders(session: AsyncSession) -> Page[OrderResponse]:
@@ -227,8 +379,103 @@ async def get_all_paid_orders(session: AsyncSession) -> Page[OrderResponse]:
     Returns:
         Page[OrderResponse]
     """
-    query = orders_repository.get_all_paid_query()
-    return await paginate(session, query)
+    query = orders_repository.get_order_rows_query(status=Status.PAID)
+    return await paginate(session, query, transformer=_build_order_responses)
+
+
+def validate_export_range(*, date_from: datetime, date_to: datetime) -> None:
+    """
+    Проверяет период выгрузки заказов.
+
+    Raises:
+        InvalidDateRangeError: если начало периода не раньше окончания
+    """
+    if date_from >= date_to:
+        raise InvalidDateRangeError()
+
+
+async def stream_orders_export(
+    *,
+    date_from: datetime,
+    date_to: datetime,
+    statuses: Sequence[Status] | None,
+    export_format: OrderExportFormat,
+) -> AsyncIterator[str]:
+    """
+    Построчно выгружает заказы за период одним запросом через серверный курсор.
+
+    Генератор открывает собственную сессию: сессия запроса закрывается до начала
+    отправки тела ответа. Память не растет с объемом выгрузки — строки читаются
+    пачками по ORDER_EXPORT_BATCH_SIZE.
+
+    Args:
+        date_from: начало периода (включительно) по дате создания заказа
+        date_to: конец периода (не включительно)
+        statuses: статусы заказов, если пусто — все статусы
+        export_format: формат выгрузки, CSV или NDJSON
+
+    Yields:
+        Фрагменты выгрузки в выбранном формате
+    """
+    query = orders_repository.get_order_export_query(date_from=date_from, date_to=date_to, statuses=statuses)
+
+    if export_format == OrderExportFormat.CSV:
+        yield _format_csv([ORDER_EXPORT_COLUMNS])
+
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(query.execution_options(yield_per=ORDER_EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            if export_format == OrderExportFormat.CSV:
+                yield _format_csv([_export_csv_row(row) for row in rows])
+            else:
+                yield "".join(
+                    json.dumps(dict(row._mapping), default=_export_json_default, ensure_ascii=False) + "\n"
+                    for row in rows
+                )
+
+
+def _export_csv_row(row: Row) -> list[Any]:
+    data = row._mapping
+    return [
+        json.dumps(data[column], ensure_ascii=False) if column == "order_item" else data[column]
+        for column in ORDER_EXPORT_COLUMNS
+    ]
+
+
+def _format_csv(rows: Sequence[Sequence[Any]]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def _export_json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _order_channel(order_id: int) -> str:
+    return f"order:{order_id}"
+
+
+def _order_status_key(order_id: int) -> str:
+    return f"order_status:{order_id}"
+
+
+def _publish_after_commit(*, session: AsyncSession, redis: Redis, order_id: int, status: Status) -> None:
+    call_after_commit(session, partial(publish_order_status, redis=redis, order_id=order_id, status=status))
+
+
+def _format_order_event(*, order_id: int, status: Status) -> str:
+    event = OrderStatusEvent(order_id=order_id, status=status)
+    return f"event: status\ndata: {event.model_dump_json()}\n\n"
+
+
+def _is_counted_in_sales(*, status: Status, paid_at: datetime | None) -> bool:
+    """Оплаченный и не отмененный заказ учитывается в аналитике продаж."""
+    return paid_at is not None and status != Status.CANCELLED
 
 
 def _build_response_with_payment(order: Order, payment_id: str, confirmation_url: str) -> OrderResponseWithPayment:
@@ -246,3 +493,37 @@ def _build_response_with_payment(order: Order, payment_id: str, confirmation_url
     order_data["payment_id"] = payment_id
     order_data["confirmation_url"] = confirmation_url
     return OrderResponseWithPayment.model_validate(order_data)
+
+
+def build_order_response(row: Row) -> OrderResponse:
+    """
+    Собирает ответ заказа из строки проекционного запроса без загрузки ORM-объектов.
+
+    Args:
+        row: строка запроса orders_repository.get_order_rows_query
+    Returns:
+        OrderResponse: информация о заказе
+    """
+    data = row._mapping
+    delivery = None
+    if data["delivery_address"] is not None:
+        delivery = {
+            "address": data["delivery_address"],
+            "recipient_name": data["delivery_recipient_name"],
+            "recipient_phone": data["delivery_recipient_phone"],
+            "comment": data["delivery_comment"],
+        }
+    return OrderResponse.model_validate(
+        {
+            "id": data["id"],
+            "user_id": data["user_id"],
+            "method_of_receipt": data["method_of_receipt"],
+            "pickup_point_id": data["pickup_point_id"],
+            "delivery": delivery,
+            "order_item": data["order_item"],
+        }
+    )
+
+
+def _build_order_responses(rows: Sequence[Row]) -> list[OrderResponse]:
+    return [build_order_response(row) for row in rows]
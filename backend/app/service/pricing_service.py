@@ -0,0 +1,99 @@
+from collections.abc import Sequence
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.repository import products_repository
+from app.schemas.pricing_schema import PriceChange, RepriceReport
+from app.service import product_cards_service, products_service
+
+logger = get_logger(__name__)
+
+
+async def reprice_products(
+    *,
+    session: AsyncSession,
+    redis: Redis,
+    flower_ids: Sequence[int] | None = None,
+    product_ids: Sequence[int] | None = None,
+    dry_run: bool = False,
+) -> RepriceReport:
+    """
+    Пересчитывает цены букетов с автоматической ценой по стоимости состава.
+
+    Цена — сумма цен цветов состава с учетом количества, умноженная на PRICING_MARKUP
+    и округленная до PRICING_ROUNDING_STEP способом PRICING_ROUNDING. Пересчет — один
+    UPDATE по сгруппированному составу; меняются только букеты, у которых цена
+    действительно отличается. Букет без состава (например, после удаления его последнего
+    цветка) прежнюю цену не сохраняет молча: он попадает в without_composition и снимается
+    с продажи, пока ему не зададут состав или не отключат автоматическую цену.
+    Карточки товаров и кэш кратких данных обновляются, версия каталога (а с ней кэш
+    фасетов и ответов) увеличивается после фиксации транзакции.
+
+    Args:
+        session: сессия базы данных
+        redis: клиент Redis для сброса кэша кратких данных товаров
+        flower_ids: цветы, цена которых изменилась; None — без ограничения
+        product_ids: букеты для пересчета; None — без ограничения
+        dry_run: только вернуть изменения, не применяя их
+
+    Returns:
+        RepriceReport со списком изменений цен
+    """
+    report = RepriceReport(
+        dry_run=dry_run,
+        markup=settings.PRICING_MARKUP,
+        rounding_step=settings.PRICING_ROUNDING_STEP,
+        rounding=settings.PRICING_ROUNDING,
+    )
+    if (flower_ids is not None and not flower_ids) or (product_ids is not None and not product_ids):
+        return report
+
+    params = {
+        "session": session,
+        "markup": settings.PRICING_MARKUP,
+        "rounding_step": settings.PRICING_ROUNDING_STEP,
+        "rounding": settings.PRICING_ROUNDING,
+        "flower_ids": flower_ids,
+        "product_ids": product_ids,
+    }
+    # Букет с указанным цветом состав имеет, поэтому без состава проверяются только выборки без flower_ids
+    check_empty = flower_ids is None
+    if dry_run:
+        rows = await products_repository.get_price_changes(**params)
+        if check_empty:
+            report.without_composition = list(
+                await products_repository.get_auto_priced_without_composition(
+                    session=session, product_ids=product_ids
+                )
+            )
+    else:
+        rows = await products_repository.reprice_products(**params)
+        if check_empty:
+            report.without_composition = list(
+                await products_repository.close_auto_priced_without_composition(
+                    session=session, product_ids=product_ids
+                )
+            )
+
+    report.changes = [
+        PriceChange(
+            product_id=row.product_id,
+            name=row.name,
+            cost=row.cost,
+            old_price=row.old_price,
+            new_price=row.new_price,
+            difference=row.new_price - row.old_price,
+        )
+        for row in rows
+    ]
+    if dry_run or not (report.changes or report.without_composition):
+        return report
+
+    changed = [change.product_id for change in report.changes] + report.without_composition
+    await product_cards_service.refresh_product_cards(session=session, product_ids=changed)
+    await products_service.invalidate_product_summaries(session=session, redis=redis, product_ids=changed)
+    logger.info("products_repriced", count=len(changed))
+    return report
@@ -0,0 +1,126 @@
+from collections.abc import Sequence
+from typing import Any
+
+from fastapi_pagination.bases import AbstractPage
+from fastapi_pagination.ext.sqlalchemy import paginate
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.products_model import Product
+from app.repository import categories_repository, product_cards_repository, products_repository
+from app.schemas.products_schema import ProductResponse
+from app.service import discounts_service
+from app.utils.filters.products import ProductFilter
+
+REFRESH_BATCH_SIZE = 500
+
+
+async def get_products(
+    *, session: AsyncSession, product_filter: ProductFilter, category_id: int | None = None
+) -> AbstractPage[ProductResponse]:
+    """
+    Возвращает отфильтрованный пагинированный список товаров из готовых карточек.
+
+    Фильтры и сортировка применяются к таблице product, карточка читается по первичному ключу,
+    поэтому связи товара и скидки на каждый запрос не загружаются.
+
+    Args:
+        session: сессия базы данных
+        product_filter: фильтр товара
+        category_id: только товары этой категории и ее активных подкатегорий
+
+    Returns:
+        Page или CursorPage со списком товаров — по типу пагинации маршрута
+    """
+    query = product_cards_repository.get_product_cards_query()
+    if category_id is not None:
+        subtree_ids = categories_repository.get_subtree_ids_query(category_id=category_id)
+        query = query.where(products_repository.in_categories(category_ids=subtree_ids))
+    sorted_query = product_filter.sort(product_filter.filter(query)).order_by(Product.id)
+    return await paginate(session, sorted_query, unwrap_mode="unwrap", transformer=_build_product_responses)
+
+
+async def get_product_card(*, session: AsyncSession, product_id: int) -> ProductResponse | None:
+    """
+    Возвращает готовую карточку товара одним запросом по первичному ключу.
+
+    Args:
+        session: сессия базы данных
+        product_id: идентификатор товара
+
+    Returns:
+        ProductResponse из карточки или None, если карточка еще не собрана
+    """
+    document = await product_cards_repository.get_product_card(session=session, product_id=product_id)
+    if document is None:
+        return None
+    return ProductResponse.model_validate(document)
+
+
+async def refresh_product_cards(*, session: AsyncSession, product_ids: Sequence[int] | None = None) -> int:
+    """
+    Пересобирает карточки товаров в текущей транзакции.
+
+    Args:
+        session: сессия базы данных
+        product_ids: идентификаторы товаров; None — все товары
+
+    Returns:
+        int: количество пересобранных карточек
+    """
+    if product_ids is None:
+        product_ids = await product_cards_repository.get_all_product_ids(session=session)
+    product_ids = list(dict.fromkeys(product_ids))
+
+    refreshed = 0
+    for start in range(0, len(product_ids), REFRESH_BATCH_SIZE):
+        batch = product_ids[start : start + REFRESH_BATCH_SIZE]
+        products = await product_cards_repository.get_products_for_cards(session=session, product_ids=batch)
+        discount_map = await discounts_service.enrich_products(session=session, products=products)
+
+        documents: dict[int, dict[str, Any]] = {}
+        for product in products:
+            response = ProductResponse.model_validate(product)
+            discounted_price, discount = discount_map.get(product.id, (None, None))
+            response.discounted_price = discounted_price
+            response.discount_percentage = discount.percentage if discount else None
+            document = response.model_dump(mode="json")
+            document["category_ids"] = [category.id for category in product.categories]
+            documents[product.id] = document
+
+        await product_cards_repository.upsert_product_cards(session=session, documents=documents)
+        refreshed += len(documents)
+    return refreshed
+
+
+async def refresh_flower_product_cards(*, session: AsyncSession, flower_id: int) -> int:
+    """
+    Пересобирает карточки букетов, в состав которых входит цветок.
+
+    Args:
+        session: сессия базы данных
+        flower_id: идентификатор цветка
+
+    Returns:
+        int: количество пересобранных карточек
+    """
+    product_ids = await product_cards_repository.get_product_ids_by_flower(session=session, flower_id=flower_id)
+    return await refresh_product_cards(session=session, product_ids=product_ids)
+
+
+async def refresh_category_product_cards(*, session: AsyncSession, category_id: int) -> int:
+    """
+    Пересобирает карточки товаров категории.
+
+    Args:
+        session: сессия базы данных
+        category_id: идентификатор категории
+
+    Returns:
+        int: количество пересобранных карточек
+    """
+    product_ids = await product_cards_repository.get_product_ids_by_category(session=session, category_id=category_id)
+    return await refresh_product_cards(session=session, product_ids=product_ids)
+
+
+def _build_product_responses(documents: Sequence[dict[str, Any]]) -> list[ProductResponse]:
+    return [ProductResponse.model_validate(document) for document in documents]
@@ -1,26 +1,47 @@
+import hashlib
+import json
 import uuid
 from collections.abc import Sequence
 from decimal import Decimal
+from functools import partial
 
 import anyio
 from fastapi import UploadFile
-from fastapi_pagination import Page
+from fastapi_pagination.bases import AbstractPage
 from fastapi_pagination.ext.sqlalchemy import paginate
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.catalog_version import get_catalog_version
 from app.core.config import settings
-from app.core.exceptions import ImageNotFoundError, ProductNotFoundError
-from app.repository import products_repository
+from app.core.exceptions import AutoPricedProductError, ImageNotFoundError, ProductNotFoundError
+from app.core.logger import get_logger
+from app.db.session import call_after_commit
+from app.models.products_model import Product
+from app.repository import categories_repository, products_repository
 from app.schemas.products_schema import (
+    CategoryFacet,
+    ColorFacet,
+    PriceBucketFacet,
     ProductCreate,
+    ProductFacets,
     ProductImageResponse,
     ProductResponse,
+    ProductSummary,
     ProductUpdate,
+    StockFacet,
 )
-from app.service import discounts_service
+from app.service import discounts_service, pricing_service, product_cards_service
 from app.utils.filters.products import ProductFilter
 from app.utils.validators.image import validate_image
 
+logger = get_logger(__name__)
+
+PRODUCT_SUMMARY_CACHE_KEY = "product_summaries"
+PRODUCT_FACETS_CACHE_PREFIX = "product_facets"
+
 
 async def create_product(
     *,
@@ -58,6 +79,9 @@ async def create_product(
             session=session, product_id=product.id, url=url, sort_order=0
         )
 
+    await product_cards_service.refresh_product_cards(
+        session=session, product_ids=[product.id]
+    )
     product = await products_repository.get_product_by_id(
         session=session, product_id=product.id
     )
@@ -65,21 +89,34 @@ async def create_product(
 
 
 async def get_products(
-    *, session: AsyncSession, product_filter: ProductFilter
-) -> Page[ProductResponse]:
+    *,
+    session: AsyncSession,
+    product_filter: ProductFilter,
+    category_id: int | None = None,
+) -> AbstractPage[ProductResponse]:
     """
     Возвращает отфильтрованный пагинированный список товаров из базы данных.
 
     Args:
         session: сессия базы данных
         product_filter: фильтр товара
+        category_id: только товары этой категории и ее активных подкатегорий
 
     Returns:
-        Page[ProductResponse] список товаров
+        Page или CursorPage со списком товаров — по типу пагинации маршрута
     """
+    if settings.PRODUCT_CARDS_ENABLED:
+        return await product_cards_service.get_products(
+            session=session, product_filter=product_filter, category_id=category_id
+        )
+
     query = products_repository.get_products_query()
+    if category_id is not None:
+        subtree_ids = categories_repository.get_subtree_ids_query(category_id=category_id)
+        query = query.where(products_repository.in_categories(category_ids=subtree_ids))
     filtered_query = product_filter.filter(query)
-    sorted_query = product_filter.sort(filtered_query)
+    # id делает порядок однозначным, без этого курсорная пагинация пропускает товары
+    sorted_query = product_filter.sort(filtered_query).order_by(Product.id)
     page = await paginate(session, sorted_query)
 
     discount_map = await discounts_service.enrich_products(
@@ -98,6 +135,54 @@ async def get_products(
     return page
 
 
+async def get_product_facets(
+    *, session: AsyncSession, redis: Redis, product_filter: ProductFilter
+) -> ProductFacets:
+    """
+    Возвращает количество товаров по цветам, категориям, наличию и ценовым диапазонам.
+
+    Все счетчики считаются одним запросом с GROUPING SETS по товарам, подходящим
+    под фильтр, и кэшируются в Redis по версии каталога: любое изменение каталога
+    меняет ключ, поэтому явная инвалидация не нужна.
+
+    Args:
+        session: сессия базы данных
+        redis: клиент Redis
+        product_filter: фильтр товара
+
+    Returns:
+        ProductFacets со счетчиками по значениям фильтров
+    """
+    price_bounds = sorted(settings.PRODUCT_FACET_PRICE_BOUNDS)
+    cache_key = None
+    try:
+        catalog = await get_catalog_version()
+        cache_key = _product_facets_cache_key(
+            version=catalog.version, product_filter=product_filter, price_bounds=price_bounds
+        )
+        cached = await redis.get(cache_key)
+    except RedisError as exc:
+        logger.warning("product_facets_cache_unavailable", exc_info=exc)
+        cached = None
+    if cached is not None:
+        return ProductFacets.model_validate_json(cached)
+
+    query = products_repository.get_product_facets_query(price_bounds=price_bounds)
+    rows = await products_repository.count_product_facets(
+        session=session, products_query=product_filter.filter(query)
+    )
+    facets = _build_product_facets(rows=rows, price_bounds=price_bounds)
+
+    if cache_key is not None:
+        try:
+            await redis.set(
+                cache_key, facets.model_dump_json(), ex=settings.PRODUCT_FACETS_CACHE_TTL
+            )
+        except RedisError as exc:
+            logger.warning("product_facets_cache_unavailable", exc_info=exc)
+    return facets
+
+
 async def get_product(*, session: AsyncSession, product_id: int) -> ProductResponse:
     """
     Возвращает товар из базы данных.
@@ -129,33 +214,59 @@ async def get_product(*, session: AsyncSession, product_id: int) -> ProductRespo
 
 
 async def update_product(
-    *, session: AsyncSession, product_id: int, product_data: ProductUpdate
+    *,
+    session: AsyncSession,
+    redis: Redis,
+    product_id: int,
+    product_data: ProductUpdate,
 ) -> ProductResponse:
     """
     Обновляет данные товара в базе данных.
 
+    Цену товара с автоматической ценой рассчитывает pricing_service, поэтому явная
+    цена вместе с включенной автоматической ценой отклоняется, а транзакция откатывается.
+
     Args:
         session: сессия базы данных
+        redis: клиент Redis
         product_id: идентификатор товара
         product_data: новые данные товара
 
     Returns:
         ProductResponse с данными обновленного товара
+
+    Raises:
+        AutoPricedProductError: если цена задана для товара с автоматической ценой
     """
     product = await products_repository.update_product(
         session=session,
         product_id=product_id,
         product_data=product_data,
     )
+    if product is not None and product.auto_price:
+        if product_data.price is not None:
+            raise AutoPricedProductError(product_id=product_id)
+        report = await pricing_service.reprice_products(
+            session=session, redis=redis, product_ids=[product_id]
+        )
+        if report.changes or report.without_composition:
+            await session.refresh(product, attribute_names=["price", "in_stock"])
+    await product_cards_service.refresh_product_cards(
+        session=session, product_ids=[product_id]
+    )
+    await invalidate_product_summaries(session=session, redis=redis, product_ids=[product_id])
     return ProductResponse.model_validate(product)
 
 
-async def delete_product(*, session: AsyncSession, product_id: int) -> bool:
+async def delete_product(
+    *, session: AsyncSession, redis: Redis, product_id: int
+) -> bool:
     """
     Удаляет товар из базы данных.
 
     Args:
         session: сессия базы данных
+        redis: клиент Redis
         product_id: идентификатор товара
 
     Returns:
@@ -166,6 +277,7 @@ async def delete_product(*, session: AsyncSession, product_id: int) -> bool:
     )
     if not deleted:
         raise ProductNotFoundError(product_id=product_id)
+    await invalidate_product_summaries(session=session, redis=redis, product_ids=[product_id])
     return True
 
 
@@ -201,6 +313,9 @@ async def upload_image(
     product_image = await products_repository.create_product_image(
         session=session, product_id=product_id, url=url, sort_order=sort_order
     )
+    await product_cards_service.refresh_product_cards(
+        session=session, product_ids=[product_id]
+    )
     return ProductImageResponse.model_validate(product_image)
 
 
@@ -231,11 +346,15 @@ async def delete_product_image(*, session: AsyncSession, image_id: int) -> bool:
     Returns:
         bool: изображение удалено или нет
     """
-    url = await products_repository.delete_product_image(
+    deleted = await products_repository.delete_product_image(
         session=session, image_id=image_id
     )
-    if url is None:
+    if deleted is None:
         raise ImageNotFoundError(image_id=image_id)
+    product_id, url = deleted
+    await product_cards_service.refresh_product_cards(
+        session=session, product_ids=[product_id]
+    )
 
     file_path = (settings.ROOT_DIR / url.lstrip("/")).resolve()
     if not str(file_path).startswith(str(settings.PRODUCT_UPLOAD_DIR.resolve())):
@@ -255,7 +374,174 @@ async def get_product_price(*, session: AsyncSession, product_id: int) -> Decima
     return price
 
 
-async def set_all_products_in_stock(*, session: AsyncSession, in_stock: bool) -> int:
-    return await products_repository.set_all_products_in_stock(
+async def set_all_products_in_stock(
+    *, session: AsyncSession, redis: Redis, in_stock: bool
+) -> int:
+    changed = await products_repository.set_all_products_in_stock(
         session=session, in_stock=in_stock
     )
+    if changed:
+        await product_cards_service.refresh_product_cards(
+            session=session, product_ids=changed
+        )
+        await invalidate_product_summaries(session=session, redis=redis, product_ids=changed)
+    return len(changed)
+
+
+async def get_product_summaries(
+    *, session: AsyncSession, redis: Redis, product_ids: Sequence[int]
+) -> dict[int, ProductSummary]:
+    """
+    Возвращает краткие данные товаров, сначала из кэша Redis, затем из базы данных.
+
+    Отсутствующие в кэше товары загружаются одним запросом и сохраняются в кэш.
+    Если Redis недоступен, все товары читаются из базы данных.
+
+    Args:
+        session: сессия базы данных
+        redis: клиент Redis
+        product_ids: идентификаторы товаров
+
+    Returns:
+        Словарь {product_id: ProductSummary}, несуществующие товары в него не попадают
+    """
+    unique_ids = list(dict.fromkeys(product_ids))
+    if not unique_ids:
+        return {}
+
+    try:
+        cached = await redis.hmget(PRODUCT_SUMMARY_CACHE_KEY, [str(pid) for pid in unique_ids])
+    except RedisError as exc:
+        logger.warning("product_summary_cache_unavailable", exc_info=exc)
+        cached = [None] * len(unique_ids)
+
+    summaries: dict[int, ProductSummary] = {}
+    missing_ids: list[int] = []
+    for product_id, raw in zip(unique_ids, cached, strict=True):
+        if raw is None:
+            missing_ids.append(product_id)
+        else:
+            summaries[product_id] = ProductSummary.model_validate_json(raw)
+
+    if missing_ids:
+        loaded = await products_repository.get_product_summaries(
+            session=session, product_ids=missing_ids
+        )
+        if loaded:
+            try:
+                async with redis.pipeline(transaction=False) as pipe:
+                    pipe.hset(
+                        PRODUCT_SUMMARY_CACHE_KEY,
+                        mapping={str(summary.id): summary.model_dump_json() for summary in loaded},
+                    )
+                    pipe.expire(PRODUCT_SUMMARY_CACHE_KEY, settings.PRODUCT_SUMMARY_CACHE_TTL, nx=True)
+                    await pipe.execute()
+            except RedisError as exc:
+                logger.warning("product_summary_cache_unavailable", exc_info=exc)
+        summaries.update({summary.id: summary for summary in loaded})
+
+    return summaries
+
+
+async def get_product_summary(
+    *, session: AsyncSession, redis: Redis, product_id: int
+) -> ProductSummary:
+    """
+    Возвращает краткие данные одного товара.
+
+    Args:
+        session: сессия базы данных
+        redis: клиент Redis
+        product_id: идентификатор товара
+
+    Returns:
+        ProductSummary краткие данные товара
+
+    Raises:
+        ProductNotFoundError: если товар не найден
+    """
+    summaries = await get_product_summaries(
+        session=session, redis=redis, product_ids=[product_id]
+    )
+    summary = summaries.get(product_id)
+    if summary is None:
+        raise ProductNotFoundError(product_id=product_id)
+    return summary
+
+
+async def invalidate_product_summaries(
+    *,
+    redis: Redis,
+    product_ids: Sequence[int] | None = None,
+    session: AsyncSession | None = None,
+) -> None:
+    """
+    Удаляет краткие данные товаров из кэша.
+
+    Внутри транзакции нужно передать ее сессию: ключи удаляются сразу и еще раз после
+    фиксации, иначе параллельный запрос может успеть закэшировать старую строку до COMMIT.
+
+    Args:
+        redis: клиент Redis
+        product_ids: идентификаторы товаров, если None — сбрасывается весь кэш
+        session: сессия незафиксированной транзакции, изменившей товары
+    """
+    await _delete_product_summaries(redis=redis, product_ids=product_ids)
+    if session is not None:
+        call_after_commit(
+            session, partial(_delete_product_summaries, redis=redis, product_ids=product_ids)
+        )
+
+
+async def _delete_product_summaries(
+    *, redis: Redis, product_ids: Sequence[int] | None
+) -> None:
+    if product_ids is None:
+        await redis.delete(PRODUCT_SUMMARY_CACHE_KEY)
+    elif product_ids:
+        await redis.hdel(PRODUCT_SUMMARY_CACHE_KEY, *[str(pid) for pid in product_ids])
+
+
+def _product_facets_cache_key(
+    *, version: int, product_filter: ProductFilter, price_bounds: Sequence[Decimal]
+) -> str:
+    params = product_filter.model_dump(
+        mode="json", exclude_none=True, exclude={"order_by"}
+    )
+    params["price_bounds"] = [str(bound) for bound in price_bounds]
+    digest = hashlib.sha256(
+        json.dumps(params, sort_keys=True).encode()
+    ).hexdigest()[:32]
+    return f"{PRODUCT_FACETS_CACHE_PREFIX}:{version}:{digest}"
+
+
+def _build_product_facets(
+    *, rows: Sequence[Row], price_bounds: Sequence[Decimal]
+) -> ProductFacets:
+    facets = ProductFacets(total=0)
+    for row in rows:
+        if row.by_color == 0:
+            facets.colors.append(ColorFacet(color=row.color, count=row.count))
+        elif row.by_in_stock == 0:
+            facets.in_stock.append(StockFacet(in_stock=row.in_stock, count=row.count))
+            facets.total += row.count
+        elif row.by_price_bucket == 0 and row.price_bucket is not None:
+            # width_bucket: 0 — ниже первой границы, len(price_bounds) — не ниже последней
+            facets.price_buckets.append(
+                PriceBucketFacet(
+                    min_price=price_bounds[row.price_bucket - 1] if row.price_bucket > 0 else None,
+                    max_price=price_bounds[row.price_bucket] if row.price_bucket < len(price_bounds) else None,
+                    count=row.count,
+                )
+            )
+        elif row.by_category == 0 and row.category_id is not None:
+            facets.categories.append(
+                CategoryFacet(category_id=row.category_id, count=row.count)
+            )
+
+    facets.colors.sort(key=lambda facet: facet.count, reverse=True)
+    facets.categories.sort(key=lambda facet: facet.count, reverse=True)
+    facets.price_buckets.sort(
+        key=lambda facet: facet.min_price if facet.min_price is not None else Decimal("-Infinity")
+    )
+    return facets
@@ -0,0 +1,172 @@
+import asyncio
+
+from pydantic import ValidationError
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.db.session import AsyncSessionLocal
+from app.schemas.orders_schema import WebhookPayload, WebhookQueueMetrics
+from app.service import orders_service
+
+logger = get_logger(__name__)
+
+READ_BLOCK_MS = 2000  # меньше REDIS_SOCKET_TIMEOUT
+READ_COUNT = 10
+
+
+async def enqueue_webhook(*, redis: Redis, payload: WebhookPayload) -> str:
+    """
+    Сохраняет уведомление ЮKassa в Redis stream для асинхронной обработки.
+
+    Args:
+        redis: клиент Redis
+        payload: данные уведомления
+
+    Returns:
+        str: идентификатор сообщения в потоке
+    """
+    message_id = await redis.xadd(
+        settings.WEBHOOK_STREAM,
+        {"payload": payload.model_dump_json()},
+        maxlen=settings.WEBHOOK_STREAM_MAXLEN,
+        approximate=True,
+    )
+    logger.info("webhook_enqueued", message_id=message_id, payment_id=payload.object.id, event=payload.event)
+    return message_id
+
+
+async def ensure_consumer_group(*, redis: Redis) -> None:
+    """Создает группу обработчиков и сам поток, если их еще нет."""
+    try:
+        await redis.xgroup_create(settings.WEBHOOK_STREAM, settings.WEBHOOK_CONSUMER_GROUP, id="0", mkstream=True)
+    except ResponseError as exc:
+        if "BUSYGROUP" not in str(exc):
+            raise
+
+
+async def run_consumer(*, redis: Redis, consumer_name: str) -> None:
+    """
+    Обрабатывает уведомления из потока до отмены задачи.
+
+    Перед чтением новых сообщений забирает зависшие у других обработчиков
+    (XAUTOCLAIM), так что упавший процесс не теряет уведомления.
+
+    Args:
+        redis: клиент Redis
+        consumer_name: уникальное имя обработчика в группе
+    """
+    while True:
+        try:
+            _, claimed, _ = await redis.xautoclaim(
+                settings.WEBHOOK_STREAM,
+                settings.WEBHOOK_CONSUMER_GROUP,
+                consumer_name,
+                min_idle_time=settings.WEBHOOK_CLAIM_IDLE_MS,
+                start_id="0-0",
+                count=READ_COUNT,
+            )
+            for message_id, fields in claimed:
+                await _handle_message(redis=redis, message_id=message_id, fields=fields)
+
+            response = await redis.xreadgroup(
+                settings.WEBHOOK_CONSUMER_GROUP,
+                consumer_name,
+                {settings.WEBHOOK_STREAM: ">"},
+                count=READ_COUNT,
+                block=READ_BLOCK_MS,
+            )
+            for _, messages in response:
+                for message_id, fields in messages:
+                    await _handle_message(redis=redis, message_id=message_id, fields=fields)
+        except asyncio.CancelledError:
+            break
+        except Exception as exc:
+            logger.exception("webhook_consumer_failed", consumer=consumer_name, exc_info=exc)
+            await asyncio.sleep(1)
+
+
+async def get_queue_metrics(*, redis: Redis) -> WebhookQueueMetrics:
+    """
+    Возвращает состояние очереди уведомлений.
+
+    Args:
+        redis: клиент Redis
+
+    Returns:
+        WebhookQueueMetrics: длина потока, отставание и ожидающие подтверждения сообщения группы
+    """
+    length = await redis.xlen(settings.WEBHOOK_STREAM)
+    dead_letters = await redis.xlen(settings.WEBHOOK_DEAD_LETTER_STREAM)
+    groups = await redis.xinfo_groups(settings.WEBHOOK_STREAM)
+    group = next((g for g in groups if g["name"] == settings.WEBHOOK_CONSUMER_GROUP), None)
+    return WebhookQueueMetrics(
+        length=length,
+        lag=group.get("lag") if group else None,
+        pending=group["pending"] if group else 0,
+        consumers=group["consumers"] if group else 0,
+        dead_letters=dead_letters,
+    )
+
+
+async def _handle_message(*, redis: Redis, message_id: str, fields: dict[str, str]) -> None:
+    """
+    Обрабатывает одно уведомление: дедупликация, обработка в отдельной транзакции, подтверждение.
+
+    При ошибке сообщение остается неподтвержденным и будет повторно забрано через
+    WEBHOOK_CLAIM_IDLE_MS; после WEBHOOK_MAX_ATTEMPTS попыток оно переносится в dead-letter поток.
+    """
+    try:
+        payload = WebhookPayload.model_validate_json(fields["payload"])
+    except (KeyError, ValidationError) as exc:
+        await _dead_letter(redis=redis, message_id=message_id, fields=fields, error=repr(exc))
+        return
+
+    dedup_key = f"webhook:done:{payload.object.id}:{payload.event}"
+    if await redis.exists(dedup_key):
+        await redis.xack(settings.WEBHOOK_STREAM, settings.WEBHOOK_CONSUMER_GROUP, message_id)
+        return
+
+    try:
+        async with AsyncSessionLocal() as session:
+            order = await orders_service.process_webhook(session=session, redis=redis, payload=payload)
+            await session.commit()
+    except Exception as exc:
+        attempts = await _delivery_count(redis=redis, message_id=message_id)
+        logger.exception(
+            "webhook_processing_failed",
+            message_id=message_id,
+            payment_id=payload.object.id,
+            attempts=attempts,
+            exc_info=exc,
+        )
+        if attempts >= settings.WEBHOOK_MAX_ATTEMPTS:
+            await _dead_letter(redis=redis, message_id=message_id, fields=fields, error=repr(exc))
+        return
+
+    await redis.set(dedup_key, message_id, ex=settings.WEBHOOK_DEDUP_TTL)
+    await redis.xack(settings.WEBHOOK_STREAM, settings.WEBHOOK_CONSUMER_GROUP, message_id)
+    if order is not None:
+        await orders_service.publish_order_status(redis=redis, order_id=order.id, status=order.status)
+    logger.info("webhook_processed", message_id=message_id, payment_id=payload.object.id, event=payload.event)
+
+
+async def _delivery_count(*, redis: Redis, message_id: str) -> int:
+    pending = await redis.xpending_range(
+        settings.WEBHOOK_STREAM, settings.WEBHOOK_CONSUMER_GROUP, min=message_id, max=message_id, count=1
+    )
+    return pending[0]["times_delivered"] if pending else 1
+
+
+async def _dead_letter(*, redis: Redis, message_id: str, fields: dict[str, str], error: str) -> None:
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.xadd(
+            settings.WEBHOOK_DEAD_LETTER_STREAM,
+            {**fields, "source_id": message_id, "error": error},
+            maxlen=settings.WEBHOOK_STREAM_MAXLEN,
+            approximate=True,
+        )
+        pipe.xack(settings.WEBHOOK_STREAM, settings.WEBHOOK_CONSUMER_GROUP, message_id)
+        await pipe.execute()
+    logger.error("webhook_dead_lettered", message_id=message_id, error=error)
@@ -2,7 +2,10 @@ from decimal import Decimal
 
 from fastapi_filter.contrib.sqlalchemy import Filter
 from pydantic import Field
+from sqlalchemy import Select, exists
 
+from app.db.sql import any_of
+from app.models.categories_model import product_category
 from app.models.products_model import Product
 
 
@@ -13,9 +16,26 @@ class ProductFilter(Filter):
     price__lte: Decimal | None = None
     is_active: bool | None = None
     in_stock: bool | None = None
+    category_id__in: list[int] | None = None
     search: str | None = None
     order_by: list[str] | None = Field(default=["sort_order"])
 
     class Constants(Filter.Constants):
         model = Product
         search_model_fields = ["name", "description"]  # noqa: RUF012
+
+    @property
+    def filtering_fields(self):
+        # У Product нет колонки category_id: фильтр по категориям применяется в filter через product_category
+        return [(name, value) for name, value in super().filtering_fields if name != "category_id__in"]
+
+    def filter(self, query: Select) -> Select:
+        query = super().filter(query)
+        if self.category_id__in:
+            query = query.where(
+                exists().where(
+                    product_category.c.product_id == Product.id,
+                    any_of(product_category.c.category_id, self.category_id__in),
+                )
+            )
+        return query
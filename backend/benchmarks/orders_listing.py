@@ -0,0 +1,100 @@
+"""
+Сравнение затрат CPU на сборку OrderResponse: из ORM-объектов и из строк проекционного запроса.
+
+База данных не нужна: ORM-объекты создаются в памяти (стоимость инструментирования
+SQLAlchemy сохраняется), строки проекции повторяют результат
+orders_repository.get_order_rows_query, где товары уже агрегированы json_agg.
+
+Запуск из каталога backend:
+    python -m benchmarks.orders_listing --orders 2000 --items 5
+"""
+
+import argparse
+import timeit
+import uuid
+from datetime import UTC, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+from app.models.orders_model import Delivery, MethodOfReceipt, Order, OrderItem, Status
+from app.schemas.orders_schema import OrderResponse
+from app.service.orders_service import build_order_response
+
+
+def _make_orm_orders(orders: int, items: int) -> list[Order]:
+    result = []
+    for order_id in range(1, orders + 1):
+        order = Order(
+            id=order_id,
+            user_id=order_id % 100,
+            status=Status.PAID,
+            total_price=Decimal("1990.00") * items,
+            method_of_receipt=MethodOfReceipt.DELIVERY,
+            idempotency_key=uuid.uuid4(),
+            expires_at=datetime.now(UTC),
+            order_item=[
+                OrderItem(
+                    id=order_id * items + i,
+                    order_id=order_id,
+                    product_id=i + 1,
+                    quantity=1,
+                    price=Decimal("1990.00"),
+                )
+                for i in range(items)
+            ],
+            delivery=Delivery(address="ул. Ленина, 1", recipient_name="Иван", recipient_phone="+79990000000"),
+        )
+        result.append(order)
+    return result
+
+
+def _make_rows(orders: int, items: int) -> list[SimpleNamespace]:
+    return [
+        SimpleNamespace(
+            _mapping={
+                "id": order_id,
+                "user_id": order_id % 100,
+                "method_of_receipt": MethodOfReceipt.DELIVERY,
+                "pickup_point_id": None,
+                "delivery_address": "ул. Ленина, 1",
+                "delivery_recipient_name": "Иван",
+                "delivery_recipient_phone": "+79990000000",
+                "delivery_comment": None,
+                "order_item": [
+                    {
+                        "id": order_id * items + i,
+                        "order_id": order_id,
+                        "product_id": i + 1,
+                        "quantity": 1,
+                        "price": "1990.00",
+                    }
+                    for i in range(items)
+                ],
+            }
+        )
+        for order_id in range(1, orders + 1)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--items", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    def orm_path() -> None:
+        for order in _make_orm_orders(args.orders, args.items):
+            OrderResponse.model_validate(order)
+
+    def projection_path() -> None:
+        for row in _make_rows(args.orders, args.items):
+            build_order_response(row)
+
+    for name, func in (("orm", orm_path), ("projection", projection_path)):
+        best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(f"{name:<11} {best * 1000:8.1f} ms total  {best / args.orders * 1e6:7.1f} us/order")
+
+
+if __name__ == "__main__":
+    main()
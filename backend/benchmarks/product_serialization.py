@@ -0,0 +1,83 @@
+"""
+Сравнение затрат CPU на сериализацию Page[ProductResponse] в тело ответа.
+
+Пути:
+    fastapi     — как FastAPI по умолчанию: повторная валидация по response_model,
+                  dump в python-объекты режима json и json.dumps (JSONResponse);
+    orjson      — то же, но тело собирает ORJSONResponse;
+    model       — ModelResponse: сериализация готовой модели сразу в байты.
+
+Запуск из каталога backend:
+    python -m benchmarks.product_serialization --items 100 --number 200
+"""
+
+import argparse
+import json
+import timeit
+from decimal import Decimal
+
+from fastapi_pagination import Page
+from pydantic import TypeAdapter
+
+from app.core.responses import ModelResponse, ORJSONResponse
+from app.schemas.products_schema import FlowerInComposition, ProductImageResponse, ProductResponse
+
+
+def _make_page(items: int) -> Page[ProductResponse]:
+    products = [
+        ProductResponse(
+            id=product_id,
+            name=f"Букет №{product_id}",
+            price=Decimal("3490.00"),
+            sort_order=product_id,
+            description="Авторский букет из сезонных цветов в крафтовой упаковке. " * 4,
+            color="розовый",
+            is_active=True,
+            in_stock=True,
+            images=[
+                ProductImageResponse(id=product_id * 10 + i, url=f"/static/products/{product_id}_{i}.webp", sort_order=i)
+                for i in range(3)
+            ],
+            composition=[
+                FlowerInComposition(id=i, name=f"Роза {i}", price=Decimal("149.90")) for i in range(1, 8)
+            ],
+            discounted_price=Decimal("2990.00"),
+            discount_percentage=Decimal("14.33"),
+        )
+        for product_id in range(1, items + 1)
+    ]
+    return Page[ProductResponse](items=products, total=items, page=1, size=items, pages=1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    page = _make_page(args.items)
+    adapter = TypeAdapter(Page[ProductResponse])
+
+    def fastapi_path() -> bytes:
+        value = adapter.validate_python(page, from_attributes=True)
+        content = adapter.dump_python(value, mode="json")
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def orjson_path() -> bytes:
+        value = adapter.validate_python(page, from_attributes=True)
+        return ORJSONResponse(adapter.dump_python(value, mode="json")).body
+
+    def model_path() -> bytes:
+        return ModelResponse(page).body
+
+    if not json.loads(fastapi_path()) == json.loads(orjson_path()) == json.loads(model_path()):
+        raise SystemExit("serialization paths produced different JSON")
+    print(f"Page[ProductResponse], {args.items} items, {len(model_path())} bytes")
+    for name, func in (("fastapi", fastapi_path), ("orjson", orjson_path), ("model", model_path)):
+        best = min(timeit.repeat(func, number=args.number, repeat=args.repeat))
+        print(f"{name:<8} {best / args.number * 1e6:9.1f} us/response")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Сравнение IN (...) и = ANY(:array) для выборки товаров по списку идентификаторов.
+
+Нужна база данных из настроек приложения (таблица product). Каждый вариант выполняет
+одинаковую последовательность запросов со случайной длиной списка на одном соединении.
+Для IN (...) каждая новая длина — новый текст запроса: asyncpg заново готовит его,
+а PostgreSQL заново планирует; для ANY текст один, и подготовленный запрос переиспользуется.
+
+Запуск из каталога backend:
+    python -m benchmarks.statement_shapes --queries 2000 --max-ids 100
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import event, select
+
+from app.core.config import settings
+from app.db.engine import create_engine
+from app.db.sql import any_of
+from app.models.products_model import Product
+
+
+async def _run(variant: str, id_lists: list[list[int]]) -> None:
+    engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+    statements: set[str] = set()
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _collect(_conn, _cursor, statement, _parameters, _context, _executemany) -> None:
+        statements.add(statement)
+
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(select(1))
+            started = time.perf_counter()
+            for ids in id_lists:
+                condition = Product.id.in_(ids) if variant == "in" else any_of(Product.id, ids)
+                await conn.execute(select(Product.id, Product.price).where(condition))
+            elapsed = time.perf_counter() - started
+    finally:
+        await engine.dispose()
+
+    print(
+        f"{variant:<4} {elapsed * 1000:9.1f} ms total  {elapsed / len(id_lists) * 1e6:8.1f} us/query  "
+        f"{len(statements) - 1:5d} distinct statements"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--max-ids", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Воспроизводимые длины списков для сравнения вариантов, не для криптографии
+    rng = random.Random(args.seed)  # noqa: S311
+    id_lists = [
+        rng.sample(range(1, args.max_ids * 10), rng.randint(1, args.max_ids)) for _ in range(args.queries)
+    ]
+    print(
+        f"prepared_statement_cache_size={settings.DB_PREPARED_STATEMENT_CACHE_SIZE} "
+        f"query_cache_size={settings.DB_QUERY_CACHE_SIZE} pgbouncer={settings.DB_PGBOUNCER}"
+    )
+    for variant in ("in", "any"):
+        await _run(variant, id_lists)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())